@@ -333,35 +333,36 @@ def connect(site: str | None = None, db_name: str | None = None, set_admin_as_us
 
 
 def connect_replica() -> bool:
-	from frappe.database import get_db
+	"""Switch `frappe.db` to a read replica, return False if already switched or reads must stay on
+	the primary (no usable replica or session wrote recently)."""
+	from frappe.database.replica import connect_to_replica
 
 	if hasattr(local, "replica_db") and hasattr(local, "primary_db"):
 		return False
 
-	user = local.conf.db_user
-	password = local.conf.db_password
-	port = local.conf.replica_db_port
-
-	if local.conf.different_credentials_for_replica:
-		user = local.conf.replica_db_user or local.conf.replica_db_name
-		password = local.conf.replica_db_password
-
-	local.replica_db = get_db(
-		socket=None,
-		host=local.conf.replica_host,
-		port=port,
-		user=user,
-		password=password,
-		cur_db_name=local.conf.db_name,
-	)
+	replica_db = connect_to_replica()
+	if not replica_db:
+		return False
 
 	# swap db connections
+	local.replica_db = replica_db
 	local.primary_db = local.db
 	local.db = local.replica_db
 
 	return True
 
 
+def disconnect_replica() -> None:
+	"""Close replica connection and switch `frappe.db` back to the primary."""
+	if not hasattr(local, "primary_db"):
+		return
+
+	local.replica_db.close()
+	local.db = local.primary_db
+	del local.replica_db
+	del local.primary_db
+
+
 def get_site_config(sites_path: str | None = None, site_path: str | None = None) -> _dict[str, Any]:
 	"""Return `site_config.json` combined with `sites/common_site_config.json`.
 	`site_config` is a set of site wide settings like database name, password, email etc."""
@@ -951,9 +952,8 @@ def read_only():
 			try:
 				retval = fn(*args, **get_newargs(fn, kwargs))
 			finally:
-				if switched_connection and hasattr(local, "primary_db"):
-					local.db.close()
-					local.db = local.primary_db
+				if switched_connection:
+					disconnect_replica()
 
 			return retval
 
@@ -1252,8 +1252,38 @@ def get_cached_doc(*args: Any, **kwargs: Any) -> "Document":
 	return doc
 
 
+def get_cached_docs(doctype: str, names: Iterable[str]) -> list["Document"]:
+	"""Return documents of `doctype` with given names from cache, in the same order.
+
+	Cached documents are fetched in a single round trip, the missing ones are loaded from
+	the DB in bulk and cached. Names that don't exist are skipped."""
+	return [doc for doc in _get_cached_docs_by_name(doctype, names).values() if doc is not None]
+
+
+def _get_cached_docs_by_name(doctype: str, names: Iterable[str]) -> dict[str, Optional["Document"]]:
+	names = list(dict.fromkeys(names))
+	docs = dict(
+		zip(names, cache.get_values([get_document_cache_key(doctype, n) for n in names]), strict=True)
+	)
+
+	if missing := [name for name, doc in docs.items() if doc is None]:
+		loaded = {doc.name: doc for doc in get_docs(doctype, missing)}
+		# names are case insensitive in MariaDB
+		loaded_casefolded = {name.casefold(): doc for name, doc in loaded.items()}
+
+		to_cache = {}
+		for name in missing:
+			if doc := loaded.get(name) or loaded_casefolded.get(name.casefold()):
+				docs[name] = doc
+				to_cache[get_document_cache_key(doctype, name)] = doc
+
+		cache.set_values(to_cache, index=get_document_cache_index_key(doctype))
+
+	return docs
+
+
 def _set_document_in_cache(key: str, doc: "Document") -> None:
-	cache.set_value(key, doc)
+	cache.set_value(key, doc, index=get_document_cache_index_key(doc.doctype))
 
 
 def can_cache_doc(args) -> str | None:
@@ -1277,12 +1307,18 @@ def get_document_cache_key(doctype: str, name: str):
 	return f"document_cache::{doctype}::{name}"
 
 
+def get_document_cache_index_key(doctype: str):
+	"""Set of all cached document keys of a doctype, see `RedisWrapper.delete_index`."""
+	return f"document_cache_index::{doctype}"
+
+
 def clear_document_cache(doctype: str, name: str | None = None) -> None:
 	def clear_in_redis():
+		index = get_document_cache_index_key(doctype)
 		if name is not None:
-			cache.delete_value(get_document_cache_key(doctype, name))
+			cache.delete_value(get_document_cache_key(doctype, name), index=index)
 		else:
-			cache.delete_keys(get_document_cache_key(doctype, ""))
+			cache.delete_index(index, prefix=get_document_cache_key(doctype, ""))
 
 	clear_in_redis()
 	if hasattr(db, "after_commit"):
@@ -1316,6 +1352,32 @@ def get_cached_value(
 	return values
 
 
+def get_cached_values(
+	doctype: str, names: Iterable[str], fieldname: str | Iterable[str] = "name", as_dict: bool = False
+) -> dict[str, Any]:
+	"""Batch version of `get_cached_value`, return a dict of name and value(s).
+
+	Value is `None` for names that don't exist."""
+	docs = _get_cached_docs_by_name(doctype, names)
+
+	if isinstance(fieldname, str):
+		if as_dict:
+			throw("Cannot make dict for single fieldname")
+		return {name: doc.get(fieldname) if doc else None for name, doc in docs.items()}
+
+	fieldname = list(fieldname)
+	out = {}
+	for name, doc in docs.items():
+		if doc is None:
+			out[name] = None
+			continue
+
+		values = [doc.get(f) for f in fieldname]
+		out[name] = _dict(zip(fieldname, values, strict=False)) if as_dict else values
+
+	return out
+
+
 _SingleDocument: TypeAlias = "Document"
 _NewDocument: TypeAlias = "Document"
 
@@ -1378,6 +1440,21 @@ def get_doc(*args: Any, **kwargs: Any) -> "Document":
 	return doc
 
 
+def get_docs(doctype: str, names: Iterable[str], *, for_update: bool = False) -> list["Document"]:
+	"""Return `frappe.model.document.Document` objects of given doctype and names.
+
+	Loads all documents with one query for parents and one per child table, instead of
+	`frappe.get_doc` in a loop. Names that don't exist are skipped.
+
+	:param doctype: DocType of the documents.
+	:param names: Document names, returned documents are in the same order.
+	:param for_update: Lock the rows, same as `frappe.get_doc(..., for_update=True)`.
+	"""
+	import frappe.model.document
+
+	return frappe.model.document.get_docs(doctype, names, for_update=for_update)
+
+
 def get_last_doc(doctype, filters=None, order_by="creation desc", *, for_update=False):
 	"""Get last created document of this type."""
 	d = get_all(doctype, filters=filters, limit_page_length=1, order_by=order_by, pluck="name")
@@ -2062,6 +2139,8 @@ def get_list(doctype, *args, **kwargs):
 	:param order_by: Order By e.g. `creation desc`.
 	:param limit_start: Start results at record #. Default 0.
 	:param limit_page_length: No of records in the page. Default 20.
+	:param as_iterator: Return an iterator over rows instead of a list. Use inside
+	        `frappe.db.unbuffered_cursor()` to read large results with constant memory.
 
 	Example usage:
 
@@ -2339,6 +2418,37 @@ def enqueue(*args, **kwargs):
 	return frappe.utils.background_jobs.enqueue(*args, **kwargs)
 
 
+def enqueue_many(*args, **kwargs):
+	"""
+	Enqueue method once for each of the keyword arguments, in a single round trip to redis
+
+	:param method: method string or method object
+	:param kwargs_list: keyword arguments of each call of the method
+	:param chunk_size: (optional) if set, each job calls the method for these many keyword arguments
+	:param queue: (optional) should be either long, default or short
+	:param timeout: (optional) should be set according to the functions
+	:param now: (optional) if now=True, the method is called immediately for each of the keyword arguments
+	"""
+	import frappe.utils.background_jobs
+
+	return frappe.utils.background_jobs.enqueue_many(*args, **kwargs)
+
+
+def parallel_map(*args, **kwargs):
+	"""
+	Call method with each of the items in background workers, return id of the group gathering
+	results, see `frappe.utils.background_jobs.get_parallel_map`
+
+	:param method: method string or method object
+	:param items: arguments of each call of the method
+	:param chunk_size: (optional) number of items per job
+	:param title: (optional) title of progress published for the group id as task id
+	"""
+	import frappe.utils.background_jobs
+
+	return frappe.utils.background_jobs.parallel_map(*args, **kwargs)
+
+
 def task(**task_kwargs):
 	def decorator_task(f):
 		f.enqueue = lambda **fun_kwargs: enqueue(f, **task_kwargs, **fun_kwargs)
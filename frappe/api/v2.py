@@ -7,22 +7,32 @@ Note:
 	- None of the functions present here should be called from python code, their location and
 	  internal implementation can change without treating it as "breaking change".
 """
+import inspect
 import json
+from time import perf_counter
 from typing import Any
+from urllib.parse import parse_qsl, urlsplit
 
+from werkzeug.exceptions import MethodNotAllowed, NotFound
 from werkzeug.routing import Rule
+from werkzeug.wrappers import Response
 
 import frappe
 import frappe.client
 from frappe import _, get_newargs, is_whitelisted
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.replica import is_replica_eligible
 from frappe.handler import is_valid_http_method, run_server_script, upload_file
+from frappe.rate_limiter import apply_rules_to_call
+from frappe.utils import sbool
 
 PERMISSION_MAP = {
 	"GET": "read",
 	"POST": "write",
 }
 
+DEFAULT_BATCH_SIZE_LIMIT = 100
+
 
 def handle_rpc_call(method: str, doctype: str | None = None):
 	from frappe.modules.utils import load_doctype_module
@@ -50,7 +60,17 @@ def handle_rpc_call(method: str, doctype: str | None = None):
 	is_whitelisted(method)
 	is_valid_http_method(method)
 
-	return frappe.call(method, **frappe.form_dict)
+	if is_replica_eligible(method):
+		method = frappe.read_only()(method)
+
+	response = frappe.call(method, **frappe.form_dict)
+	if inspect.isawaitable(response):
+		# `async def` methods, see `frappe.asgi`
+		from frappe.asgi import run_coroutine
+
+		response = run_coroutine(response)
+
+	return response
 
 
 def login():
@@ -168,6 +188,139 @@ def run_doc_method(method: str, document: dict[str, Any] | str, kwargs=None):
 	return response
 
 
+def batch():
+	"""Run multiple API calls in a single HTTP request.
+
+	Body has a list of `requests`, each with `method` (GET by default), `path` relative to `/api/v2`
+	(e.g. `/document/ToDo/abc`, can include a query string) and optional `body` with the arguments:
+
+		{"requests": [{"method": "POST", "path": "/document/ToDo", "body": {"description": "..."}}]}
+
+	All calls share one request context and run in a single transaction which is committed at the
+	end. Every call is made in a savepoint, so a failing call only undoes its own writes. Per-client
+	rate limits (`rate_limits` in site config) apply to every call. If `atomic` is set, the whole
+	transaction is rolled back on the first failure and the remaining calls are skipped.
+
+	Returns a result for each request with `status`, `data` (or `errors`) and `time` taken in ms.
+	"""
+	requests = frappe.form_dict.requests
+	atomic = sbool(frappe.form_dict.atomic)
+
+	if not isinstance(requests, list) or not all(isinstance(r, dict) for r in requests):
+		frappe.throw(_("Batch requests must be a list of objects"))
+
+	limit = frappe.conf.api_batch_size_limit or DEFAULT_BATCH_SIZE_LIMIT
+	if len(requests) > limit:
+		frappe.throw(_("A batch can have at most {0} requests, got {1}").format(limit, len(requests)))
+
+	results = []
+	for request in requests:
+		result = _run_batch_request(request)
+		results.append(result)
+
+		if atomic and result["status"] >= 400:
+			frappe.db.rollback()
+			for executed in results[:-1]:
+				executed["rolled_back"] = True
+			results.extend(
+				{
+					"status": 424,
+					"errors": [{"type": "FailedDependency", "message": _("Previous request failed")}],
+				}
+				for _skipped in requests[len(results) :]
+			)
+			break
+
+	return results
+
+
+def _run_batch_request(request: dict) -> dict:
+	from frappe.api import API_URL_MAP
+	from frappe.utils.response import get_error_log
+
+	method = (request.get("method") or "GET").upper()
+	path = urlsplit(request.get("path") or "")
+
+	# Each call gets its own arguments, response and messages. HTTP method is used for permission
+	# checks, so it is switched to the method of the call.
+	local = frappe.local
+	original = local.form_dict, local.response, local.message_log, local.request.method
+	local.form_dict = frappe._dict(parse_qsl(path.query))
+	local.response = frappe._dict({"docs": []})
+	local.message_log = []
+	local.request.method = method
+
+	status = 200
+	savepoint = None
+	transaction_ended = False
+	start = perf_counter()
+	try:
+		body = request.get("body") or {}
+		local.form_dict.update(frappe.parse_json(body) if isinstance(body, str) else body)
+
+		try:
+			adapter = API_URL_MAP.bind_to_environ(local.request.environ)
+			endpoint, arguments = adapter.match(f"/api/v2{path.path}", method=method)
+		except (NotFound, MethodNotAllowed):
+			raise frappe.DoesNotExistError(_("No API found for {0} {1}").format(method, path.path))
+
+		if endpoint is batch:
+			frappe.throw(_("Batch requests can not be nested"))
+
+		# counted like separate requests, batching doesn't bypass limits of methods
+		whitelisted_method = None
+		if path.path.startswith("/method/"):
+			whitelisted_method = path.path.removeprefix("/method/").strip("/")
+		apply_rules_to_call(whitelisted_method)
+
+		# also for reads, a failed query aborts the whole transaction on postgres
+		savepoint = "batch_" + frappe.generate_hash(length=10)
+		frappe.db.savepoint(savepoint)
+
+		def end_transaction():
+			# calls committing or rolling back the transaction also end the savepoint
+			nonlocal savepoint, transaction_ended
+			savepoint, transaction_ended = None, True
+
+		frappe.db.before_commit.add(end_transaction)
+		frappe.db.before_rollback.add(end_transaction)
+
+		data = endpoint(**arguments)
+		if isinstance(data, Response) or local.response.get("type"):
+			frappe.throw(_("{0} can not be called in a batch").format(path.path))
+
+		if savepoint:
+			frappe.db.release_savepoint(savepoint)
+
+		response = local.response
+		if data is not None:
+			response["data"] = data
+		status = response.pop("http_status_code", None) or status
+
+	except Exception as e:
+		if savepoint:
+			frappe.db.rollback(save_point=savepoint)
+		elif transaction_ended:
+			# only writes of this call made after it ended the transaction are pending
+			frappe.db.rollback()
+
+		status = getattr(e, "http_status_code", 500)
+		response = frappe._dict(errors=[get_error_log(status)])
+		if status >= 500:
+			frappe.log_error(f"Batch API request failed: {method} {path.path}")
+
+	finally:
+		messages = local.message_log
+		local.form_dict, local.response, local.message_log, local.request.method = original
+
+	if not response.get("docs"):
+		response.pop("docs", None)
+	if messages:
+		response["messages"] = messages
+
+	return {"status": status, **response, "time": round((perf_counter() - start) * 1000, 3)}
+
+
 url_rules = [
 	# RPC calls
 	Rule("/method/login", endpoint=login),
@@ -195,4 +348,6 @@ url_rules = [
 	# Collection level APIs
 	Rule("/doctype/<doctype>/meta", methods=["GET"], endpoint=get_meta),
 	Rule("/doctype/<doctype>/count", methods=["GET"], endpoint=count),
+	# Multiple calls in one request
+	Rule("/batch", methods=["POST"], endpoint=batch),
 ]
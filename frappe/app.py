@@ -22,6 +22,7 @@ import frappe.monitor
 import frappe.rate_limiter
 import frappe.recorder
 import frappe.utils.response
+import frappe.website.page_cache
 from frappe import _
 from frappe.auth import SAFE_HTTP_METHODS, UNSAFE_HTTP_METHODS, HTTPRequest, validate_auth
 from frappe.middlewares import StaticDataMiddleware
@@ -96,38 +97,11 @@ def application(request: Request):
 	try:
 		rollback = True
 
-		init_request(request)
-
-		validate_auth()
-
-		if request.method == "OPTIONS":
-			response = Response()
-
-		elif frappe.form_dict.cmd:
-			from frappe.deprecation_dumpster import deprecation_warning
-
-			deprecation_warning(
-				"unknown",
-				"v17",
-				f"{frappe.form_dict.cmd}: Sending `cmd` for RPC calls is deprecated, call REST API instead `/api/method/cmd`",
-			)
-			frappe.handler.handle()
-			response = frappe.utils.response.build_response("json")
-
-		elif request.path.startswith("/api/"):
-			response = frappe.api.handle(request)
-
-		elif request.path.startswith("/backups"):
-			response = frappe.utils.response.download_backup(request.path)
-
-		elif request.path.startswith("/private/files/"):
-			response = frappe.utils.response.download_private_file(request.path)
-
-		elif request.method in ("GET", "HEAD", "POST"):
-			response = get_response()
-
-		else:
-			raise NotFound
+		# pages served from the page cache skip session, auth and rendering
+		if not (response := init_request(request)):
+			validate_auth()
+			frappe.rate_limiter.apply_rules()
+			response = dispatch(request)
 
 	except HTTPException as e:
 		return e
@@ -152,6 +126,7 @@ def application(request: Request):
 			# We can not handle exceptions safely here.
 			frappe.logger().error("Failed to run after request hook", exc_info=True)
 
+	frappe.website.page_cache.store(response)
 	log_request(request, response)
 	# return 304 if unmodified
 	if not response.direct_passthrough:
@@ -163,6 +138,36 @@ def application(request: Request):
 	return response
 
 
+def dispatch(request: Request) -> Response:
+	if request.method == "OPTIONS":
+		return Response()
+
+	if frappe.form_dict.cmd:
+		from frappe.deprecation_dumpster import deprecation_warning
+
+		deprecation_warning(
+			"unknown",
+			"v17",
+			f"{frappe.form_dict.cmd}: Sending `cmd` for RPC calls is deprecated, call REST API instead `/api/method/cmd`",
+		)
+		frappe.handler.handle()
+		return frappe.utils.response.build_response("json")
+
+	if request.path.startswith("/api/"):
+		return frappe.api.handle(request)
+
+	if request.path.startswith("/backups"):
+		return frappe.utils.response.download_backup(request.path)
+
+	if request.path.startswith("/private/files/"):
+		return frappe.utils.response.download_private_file(request.path)
+
+	if request.method in ("GET", "HEAD", "POST"):
+		return get_response()
+
+	raise NotFound
+
+
 def run_after_request_hooks(request, response):
 	if not getattr(frappe.local, "initialised", False):
 		return
@@ -171,7 +176,8 @@ def run_after_request_hooks(request, response):
 		frappe.call(after_request_task, response=response, request=request)
 
 
-def init_request(request):
+def init_request(request) -> Response | None:
+	"""Set up site and session for the request, return the page if it can be served from page cache."""
 	frappe.local.request = request
 	frappe.local.request.after_response = CallbackManager()
 
@@ -200,6 +206,9 @@ def init_request(request):
 		request.max_content_length = cint(frappe.local.conf.get("max_file_size")) or 25 * 1024 * 1024
 	make_form_dict(request)
 
+	if response := frappe.website.page_cache.get_cached_response(request):
+		return response
+
 	if request.method != "OPTIONS":
 		frappe.local.http_request = HTTPRequest()
 
@@ -219,9 +228,7 @@ def setup_read_only_mode():
 	frappe.flags.read_only = True
 
 	# If replica is available then just connect replica, else setup read only transaction.
-	if frappe.conf.read_from_replica:
-		frappe.connect_replica()
-	else:
+	if not (frappe.conf.read_from_replica and frappe.connect_replica()):
 		frappe.db.begin(read_only=True)
 
 
@@ -253,8 +260,17 @@ def process_response(response):
 			{
 				# default: 5m (proxy), 5m (client), 3h (allow stale resources for this long if upstream is down)
 				"Cache-Control": "public,s-maxage=300,max-age=300,stale-while-revalidate=10800",
-				# for revalidation of a stale resource
-				"ETag": quote_etag(generate_etag(response.data)),
+			}
+		)
+		# for revalidation of a stale resource, streamed responses can't be read in advance
+		if not response.direct_passthrough:
+			response.headers["ETag"] = quote_etag(generate_etag(response.data))
+	elif etag := getattr(frappe.local, "response_etag", None):
+		response.headers.extend(
+			{
+				# private, but can be revalidated by the client, see `frappe.utils.response.is_not_modified`
+				"Cache-Control": "private,no-cache",
+				"ETag": quote_etag(etag),
 			}
 		)
 	else:
@@ -269,8 +285,7 @@ def process_response(response):
 		frappe.local.cookie_manager.flush_cookies(response=response)
 
 	# rate limiter headers
-	if hasattr(frappe.local, "rate_limiter"):
-		response.headers.extend(frappe.local.rate_limiter.headers())
+	response.headers.extend(frappe.rate_limiter.headers())
 
 	if trace_id := frappe.monitor.get_trace_id():
 		response.headers.extend({"X-Frappe-Request-Id": trace_id})
@@ -433,6 +448,12 @@ def sync_database(rollback: bool) -> bool:
 	if frappe.db and (frappe.local.flags.commit or frappe.local.request.method in UNSAFE_HTTP_METHODS):
 		frappe.db.commit()
 		rollback = False
+
+		# read your own writes: keep reads of this session on the primary till replicas catch up
+		if frappe.db.committed_writes and frappe.conf.read_from_replica:
+			from frappe.database.replica import mark_sticky
+
+			mark_sticky()
 	elif frappe.db:
 		frappe.db.rollback()
 		rollback = False
@@ -0,0 +1,250 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+ASGI entry point, an alternative to the WSGI `frappe.app.application` for I/O-bound workloads:
+
+	gunicorn -k uvicorn.workers.UvicornWorker frappe.asgi:application
+
+(needs `uvicorn`, which isn't installed by default).
+
+Requests go through the same pipeline as WSGI, run in a thread pool of `asgi_threads` threads
+(32 by default). At most `asgi_max_concurrency` requests of a site (8 by default) run at once,
+so that a busy site can't take up every thread.
+
+Whitelisted methods defined using `async def` run on the event loop: once such a method is called,
+the request stops counting towards the site's concurrency while its thread waits for it. Since
+the loop is shared by all requests, blocking calls (e.g. database queries) made by these methods
+should be wrapped in `asyncio.to_thread`.
+"""
+
+import asyncio
+import contextvars
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tempfile import SpooledTemporaryFile
+
+import frappe
+import frappe.app
+from frappe.utils import get_site_name
+
+DEFAULT_THREADS = 32
+DEFAULT_MAX_CONCURRENCY = 8
+
+# request bodies larger than this are spooled to disk
+MAX_IN_MEMORY_BODY = 1024 * 1024
+
+# key in WSGI environ of the function running coroutines on the event loop
+RUN_COROUTINE_KEY = "frappe.run_coroutine"
+
+
+class ASGIApplication:
+	def __init__(self, wsgi_application):
+		self.wsgi_application = wsgi_application
+		self.executor = None
+		self.limiters = None
+		self.max_concurrency = DEFAULT_MAX_CONCURRENCY
+
+	def setup(self):
+		conf = frappe.get_site_config(sites_path=frappe.app._sites_path)
+		self.max_concurrency = conf.asgi_max_concurrency or DEFAULT_MAX_CONCURRENCY
+		self.executor = ThreadPoolExecutor(
+			max_workers=conf.asgi_threads or DEFAULT_THREADS, thread_name_prefix="frappe-asgi"
+		)
+		self.limiters = defaultdict(lambda: asyncio.Semaphore(self.max_concurrency))
+
+	async def __call__(self, scope, receive, send):
+		if scope["type"] == "lifespan":
+			return await self.lifespan(receive, send)
+
+		if scope["type"] != "http":
+			# websockets are served by the socket.io server
+			return await send({"type": "websocket.close"})
+
+		if not self.executor:
+			self.setup()
+
+		body = await read_body(receive)
+		environ = build_environ(scope, body)
+		loop = asyncio.get_running_loop()
+		slot = ConcurrencySlot(self.limiters[get_site(environ)])
+		environ[RUN_COROUTINE_KEY] = partial(run_coroutine_threadsafe, loop=loop, slot=slot)
+
+		await slot.acquire()
+		try:
+			# every request runs in a new context, isolating `frappe.local`
+			await loop.run_in_executor(
+				self.executor,
+				contextvars.Context().run,
+				partial(self.call_wsgi, environ, partial(send_threadsafe, send, loop)),
+			)
+		finally:
+			slot.release()
+
+	def call_wsgi(self, environ, send):
+		"""Run WSGI application, streaming the response using `send`."""
+		status_and_headers = []
+
+		def start_response(status, headers, exc_info=None):
+			status_and_headers[:] = [int(status.split(" ", 1)[0]), headers]
+
+		def send_start():
+			status, headers = status_and_headers
+			send(
+				{
+					"type": "http.response.start",
+					"status": status,
+					"headers": [(k.encode("latin1"), v.encode("latin1")) for k, v in headers],
+				}
+			)
+
+		iterable = self.wsgi_application(environ, start_response)
+		try:
+			started = False
+			for chunk in iterable:
+				if not chunk:
+					continue
+
+				if not started:
+					send_start()
+					started = True
+
+				send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+			if not started:
+				send_start()
+
+			send({"type": "http.response.body", "body": b""})
+		finally:
+			if hasattr(iterable, "close"):
+				iterable.close()
+
+	async def lifespan(self, receive, send):
+		while True:
+			message = await receive()
+			if message["type"] == "lifespan.startup":
+				self.setup()
+				await send({"type": "lifespan.startup.complete"})
+			elif message["type"] == "lifespan.shutdown":
+				if self.executor:
+					self.executor.shutdown(wait=True)
+				await send({"type": "lifespan.shutdown.complete"})
+				return
+
+
+async def read_body(receive):
+	body = SpooledTemporaryFile(max_size=MAX_IN_MEMORY_BODY)
+	while True:
+		message = await receive()
+		if message["type"] == "http.disconnect":
+			break
+
+		body.write(message.get("body", b""))
+		if not message.get("more_body"):
+			break
+
+	body.seek(0)
+	return body
+
+
+def build_environ(scope, body) -> dict:
+	"""Return WSGI environ for a HTTP request of ASGI, see PEP 3333."""
+	server = scope.get("server") or ("localhost", 80)
+	client = scope.get("client") or ("", 0)
+
+	environ = {
+		"REQUEST_METHOD": scope["method"],
+		"SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+		"PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+		"QUERY_STRING": scope["query_string"].decode("latin1"),
+		"SERVER_NAME": server[0],
+		"SERVER_PORT": str(server[1] or 80),
+		"SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+		"REMOTE_ADDR": client[0],
+		"REMOTE_PORT": str(client[1]),
+		"wsgi.version": (1, 0),
+		"wsgi.url_scheme": scope.get("scheme", "http"),
+		"wsgi.input": body,
+		# body is read completely, also when the request has no content length
+		"wsgi.input_terminated": True,
+		"wsgi.errors": sys.stderr,
+		"wsgi.multithread": True,
+		"wsgi.multiprocess": True,
+		"wsgi.run_once": False,
+	}
+
+	for name, value in scope["headers"]:
+		name = name.decode("latin1")
+		if name == "content-type":
+			key = "CONTENT_TYPE"
+		elif name == "content-length":
+			key = "CONTENT_LENGTH"
+		else:
+			key = "HTTP_" + name.upper().replace("-", "_")
+
+		value = value.decode("latin1")
+		if key in environ:
+			value = environ[key] + "," + value
+		environ[key] = value
+
+	return environ
+
+
+def get_site(environ) -> str:
+	return (
+		frappe.app._site
+		or environ.get("HTTP_X_FRAPPE_SITE_NAME")
+		or get_site_name(environ.get("HTTP_HOST") or environ["SERVER_NAME"])
+	)
+
+
+def send_threadsafe(send, loop, message):
+	asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+
+class ConcurrencySlot:
+	"""Slot of a request among the concurrent requests of its site, released at most once.
+
+	Methods of this class must be called on the event loop."""
+
+	def __init__(self, limiter: asyncio.Semaphore):
+		self.limiter = limiter
+		self.held = False
+
+	async def acquire(self):
+		await self.limiter.acquire()
+		self.held = True
+
+	def release(self):
+		if self.held:
+			self.held = False
+			self.limiter.release()
+
+
+def run_coroutine_threadsafe(coro, loop, slot):
+	"""Run coroutine on the event loop, waiting for it from the request's thread.
+
+	The coroutine runs in a copy of the request's context, so `frappe.local` is available to it.
+	The request's slot is given up for the rest of the request rather than acquired again
+	afterwards, as waiting for it while holding a thread could exhaust the thread pool."""
+
+	async def run_outside_limit():
+		slot.release()
+		return await coro
+
+	return asyncio.run_coroutine_threadsafe(run_outside_limit(), loop).result()
+
+
+def run_coroutine(coro):
+	"""Return result of coroutine returned by an `async def` whitelisted method.
+
+	Outside of ASGI, it runs in a new event loop."""
+	request = getattr(frappe.local, "request", None)
+	if request and (run := request.environ.get(RUN_COROUTINE_KEY)):
+		return run(coro)
+
+	return asyncio.run(coro)
+
+
+application = ASGIApplication(frappe.app.application)
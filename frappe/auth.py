@@ -695,6 +695,8 @@ def validate_api_key_secret(api_key, api_secret, frappe_authorization_source=Non
 		if frappe.local.login_manager.user in ("", "Guest"):
 			frappe.set_user(user)
 		frappe.local.form_dict = form_dict
+		# used to rate limit requests per API key
+		frappe.local.api_key = api_key
 	else:
 		raise frappe.AuthenticationError
 
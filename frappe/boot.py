@@ -4,6 +4,7 @@
 bootstrap client session
 """
 
+import copy
 import os
 
 import frappe
@@ -32,7 +33,13 @@ from frappe.website.doctype.web_page_view.web_page_view import is_tracking_enabl
 
 def get_bootinfo():
 	"""build and return boot info"""
-	from frappe.translate import get_lang_dict, get_translated_doctypes
+	return add_shared_sections(get_user_bootinfo())
+
+
+def get_user_bootinfo():
+	"""Build and return the part of boot info that depends on the session user, shared sections
+	are added by `add_shared_sections`."""
+	from frappe.translate import get_lang_dict
 
 	frappe.set_user_lang(frappe.session.user)
 	bootinfo = frappe._dict()
@@ -55,21 +62,11 @@ def get_bootinfo():
 	load_desktop_data(bootinfo)
 	bootinfo.letter_heads = get_letter_heads()
 	bootinfo.active_domains = frappe.get_active_domains()
-	bootinfo.all_domains = [d.get("name") for d in frappe.get_all("Domain")]
-	add_layouts(bootinfo)
 
-	bootinfo.module_app = frappe.local.module_app
-	bootinfo.single_types = [d.name for d in frappe.get_all("DocType", {"issingle": 1})]
-	bootinfo.nested_set_doctypes = [
-		d.parent for d in frappe.get_all("DocField", {"fieldname": "lft"}, ["parent"])
-	]
 	add_home_page(bootinfo, doclist)
 	bootinfo.page_info = get_allowed_pages()
-	load_translations(bootinfo)
-	add_timezone_info(bootinfo)
+	bootinfo["lang"] = frappe.lang
 	load_conf_settings(bootinfo)
-	load_print(bootinfo, doclist)
-	doclist.extend(get_meta_bundle("Page"))
 	bootinfo.home_folder = frappe.db.get_value("File", {"is_home_folder": 1})
 	bootinfo.navbar_settings = get_navbar_settings()
 	bootinfo.notification_settings = get_notification_settings()
@@ -80,34 +77,30 @@ def get_bootinfo():
 	if frappe.session.data.get("ipinfo"):
 		bootinfo.ipinfo = frappe.session["data"]["ipinfo"]
 
-	# add docs
-	bootinfo.docs = doclist
-	load_country_doc(bootinfo)
-	load_currency_docs(bootinfo)
+	# boot_session hooks get complete boot info, shared sections are taken out again afterwards as
+	# they are cached separately, see `add_shared_sections`
+	shared_values, shared_docs = get_shared_sections()
+	for key, value in shared_values.items():
+		bootinfo.setdefault(key, copy.deepcopy(value))
+	bootinfo.docs = shared_docs + doclist
 
 	for method in hooks.boot_session or []:
 		frappe.get_attr(method)(bootinfo)
 
+	remove_shared_sections(bootinfo, shared_values, shared_docs)
+
 	if bootinfo.lang:
 		bootinfo.lang = str(bootinfo.lang)
-	bootinfo.versions = {k: v["version"] for k, v in get_versions().items()}
 
 	bootinfo.error_report_email = frappe.conf.error_report_email
-	bootinfo.calendars = sorted(frappe.get_hooks("calendars"))
-	bootinfo.treeviews = frappe.get_hooks("treeviews") or []
 	bootinfo.lang_dict = get_lang_dict()
-	bootinfo.success_action = get_success_action()
 	bootinfo.update(get_email_accounts(user=frappe.session.user))
 	bootinfo.energy_points_enabled = is_energy_point_enabled()
 	bootinfo.website_tracking_enabled = is_tracking_enabled()
 	bootinfo.points = get_energy_points(frappe.session.user)
 	bootinfo.frequently_visited_links = frequently_visited_links()
-	bootinfo.link_preview_doctypes = get_link_preview_doctypes()
-	bootinfo.additional_filters_config = get_additional_filters_from_hooks()
 	bootinfo.desk_settings = get_desk_settings()
 	bootinfo.app_logo_url = get_app_logo()
-	bootinfo.link_title_doctypes = get_link_title_doctypes()
-	bootinfo.translated_doctypes = get_translated_doctypes()
 	bootinfo.subscription_conf = add_subscription_conf()
 	bootinfo.marketplace_apps = get_marketplace_apps()
 	bootinfo.changelog_feed = get_changelog_feed_items()
@@ -360,7 +353,7 @@ def add_home_page(bootinfo, docs):
 
 
 def add_timezone_info(bootinfo):
-	system = bootinfo.sysdefaults.get("time_zone")
+	system = get_system_timezone()
 	import frappe.utils.momentjs
 
 	bootinfo.timezone_info = {"zones": {}, "rules": {}, "links": {}}
@@ -533,3 +526,155 @@ def get_sentry_dsn():
 		return
 
 	return os.getenv("FRAPPE_SENTRY_DSN")
+
+
+# Sections of boot info that are the same for all users. They are built and cached once per site
+# (and language, for translations) instead of being a part of each user's cached boot info, and are
+# invalidated individually.
+BOOT_SECTIONS_KEY = "bootinfo_sections"
+PER_LANGUAGE_BOOT_SECTIONS = ("translations",)
+
+# Doctypes whose changes invalidate shared sections, see `clear_boot_sections_for`
+BOOT_SECTION_DOCTYPES = {
+	"Country": ("currency",),
+	"Currency": ("currency",),
+	"Print Settings": ("print",),
+	"Print Style": ("print",),
+	"System Settings": ("currency", "timezone"),
+	"Translation": ("translations",),
+	"Domain": ("doctypes",),
+	"DocType Layout": ("doctypes",),
+	"Success Action": ("doctypes",),
+}
+
+
+def get_translations_section():
+	from frappe.translate import get_messages_for_boot
+
+	return {"__messages": get_messages_for_boot()}
+
+
+def get_print_section():
+	bootinfo, doclist = frappe._dict(), []
+	load_print(bootinfo, doclist)
+	return {"print_css": bootinfo.print_css, "docs": doclist}
+
+
+def get_currency_section():
+	bootinfo = frappe._dict(docs=[])
+	load_country_doc(bootinfo)
+	load_currency_docs(bootinfo)
+	return bootinfo
+
+
+def get_timezone_section():
+	bootinfo = frappe._dict()
+	add_timezone_info(bootinfo)
+	return bootinfo
+
+
+def get_doctypes_section():
+	from frappe.translate import get_translated_doctypes
+
+	bootinfo = frappe._dict()
+	bootinfo.all_domains = [d.get("name") for d in frappe.get_all("Domain")]
+	add_layouts(bootinfo)
+	bootinfo.module_app = frappe.local.module_app
+	bootinfo.single_types = [d.name for d in frappe.get_all("DocType", {"issingle": 1})]
+	bootinfo.nested_set_doctypes = [
+		d.parent for d in frappe.get_all("DocField", {"fieldname": "lft"}, ["parent"])
+	]
+	bootinfo.versions = {k: v["version"] for k, v in get_versions().items()}
+	bootinfo.calendars = sorted(frappe.get_hooks("calendars"))
+	bootinfo.treeviews = frappe.get_hooks("treeviews") or []
+	bootinfo.success_action = get_success_action()
+	bootinfo.link_preview_doctypes = get_link_preview_doctypes()
+	bootinfo.additional_filters_config = get_additional_filters_from_hooks()
+	bootinfo.link_title_doctypes = get_link_title_doctypes()
+	bootinfo.translated_doctypes = get_translated_doctypes()
+	bootinfo.docs = get_meta_bundle("Page")
+	return bootinfo
+
+
+SHARED_BOOT_SECTIONS = {
+	"translations": get_translations_section,
+	"print": get_print_section,
+	"currency": get_currency_section,
+	"timezone": get_timezone_section,
+	"doctypes": get_doctypes_section,
+}
+
+
+def add_shared_sections(bootinfo):
+	"""Return boot info with shared sections added to user's boot info."""
+	shared_values, shared_docs = get_shared_sections()
+
+	bootinfo = frappe._dict(bootinfo)
+	for key, value in shared_values.items():
+		# values changed by boot_session hooks take precedence
+		bootinfo.setdefault(key, value)
+
+	bootinfo.docs = shared_docs + (bootinfo.docs or [])
+	return bootinfo
+
+
+def remove_shared_sections(bootinfo, shared_values: dict, shared_docs: list):
+	"""Remove values and docs of shared sections from user's boot info, unless boot_session hooks
+	changed them."""
+	shared_doc_ids = {id(doc) for doc in shared_docs}
+	bootinfo.docs = [doc for doc in bootinfo.docs or [] if id(doc) not in shared_doc_ids]
+
+	for key, value in shared_values.items():
+		if key in bootinfo and bootinfo[key] == value:
+			del bootinfo[key]
+
+
+def get_shared_sections() -> tuple[dict, list]:
+	"""Return values and docs of all shared sections of boot info."""
+	frappe.set_user_lang(frappe.session.user)
+
+	values, docs = {}, []
+	for section in SHARED_BOOT_SECTIONS:
+		data = get_boot_section(section)
+		docs.extend(data.get("docs", []))
+		values.update((key, value) for key, value in data.items() if key != "docs")
+
+	return values, docs
+
+
+def get_boot_section(section: str) -> dict:
+	"""Return data of a shared section of boot info."""
+	if frappe.conf.disable_session_cache:
+		return SHARED_BOOT_SECTIONS[section]()
+
+	return frappe.cache.hget(
+		BOOT_SECTIONS_KEY, get_boot_section_field(section), generator=SHARED_BOOT_SECTIONS[section]
+	)
+
+
+def get_boot_section_field(section: str, lang: str | None = None) -> str:
+	if section in PER_LANGUAGE_BOOT_SECTIONS:
+		return f"{section}:{lang or frappe.local.lang}"
+
+	return section
+
+
+def clear_boot_sections(sections: tuple | list | None = None):
+	"""Clear cached shared sections of boot info, all of them if `sections` isn't specified."""
+	if sections is None:
+		frappe.cache.delete_value(BOOT_SECTIONS_KEY)
+		return
+
+	fields = [
+		field
+		for field in (frappe.safe_decode(f) for f in frappe.cache.hkeys(BOOT_SECTIONS_KEY))
+		if field.split(":", 1)[0] in sections
+	]
+	if fields:
+		frappe.cache.hdel(BOOT_SECTIONS_KEY, fields)
+
+
+def clear_boot_sections_for(doc, method=None):
+	"""Clear shared sections of boot info that are built from `doc`'s doctype (doc event)."""
+	if sections := BOOT_SECTION_DOCTYPES.get(doc.doctype):
+		clear_boot_sections(sections)
@@ -127,7 +127,8 @@ def clear_doctype_cache(doctype=None):
 def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	from frappe.desk.notifications import delete_notification_count_for
 
-	to_del = ["is_table", "doctype_modules"]
+	# form meta version invalidates ETags of `frappe.desk.form.load.getdoctype`
+	to_del = ["is_table", "doctype_modules", "compiled_query_version", "form_meta_version"]
 
 	if doctype:
 
@@ -156,9 +157,11 @@ def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	else:
 		# clear all
 		to_del += doctype_cache_keys
-		to_del += frappe.cache.get_keys("document_cache::")
+		frappe.cache.delete_keys("document_cache")
 
 	frappe.cache.delete_value(to_del)
+	# doctype lists of boot info, see `frappe.boot.get_doctypes_section`
+	frappe.cache.hdel("bootinfo_sections", "doctypes")
 
 
 def clear_controller_cache(doctype=None):
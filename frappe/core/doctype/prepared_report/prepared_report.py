@@ -110,7 +110,9 @@ def generate_report(prepared_report):
 				if data:
 					report.custom_columns = data["columns"]
 
-		result = generate_report_result(report=report, filters=instance.filters, user=instance.owner)
+		result = frappe.read_only()(generate_report_result)(
+			report=report, filters=instance.filters, user=instance.owner
+		)
 		create_json_gz_file(result, instance.doctype, instance.name, instance.report_name)
 
 		instance.status = "Completed"
@@ -19,7 +19,7 @@ from frappe.utils import (
 	create_batch,
 	make_filter_dict,
 )
-from frappe.utils.background_jobs import get_queues, get_redis_conn
+from frappe.utils.background_jobs import get_queue_type, get_queues, get_redis_conn
 
 QUEUES = ["default", "long", "short"]
 JOB_STATUSES = ["queued", "started", "failed", "finished", "deferred", "scheduled", "canceled"]
@@ -94,7 +94,7 @@ class RQJob(Document):
 
 		matched_job_ids = []
 		for queue in get_queues():
-			if not queue.name.endswith(tuple(queues)):
+			if get_queue_type(queue.name) not in queues:
 				continue
 			for status in statuses:
 				matched_job_ids.extend(fetch_job_ids(queue, status))
@@ -152,7 +152,7 @@ def serialize_job(job: Job) -> frappe._dict:
 	return frappe._dict(
 		name=job.id,
 		job_id=job.id,
-		queue=job.origin.rsplit(":", 1)[1],
+		queue=get_queue_type(job.origin),
 		job_name=job_name,
 		status=job.get_status(),
 		started_at=convert_utc_to_system_timezone(job.started_at) if job.started_at else "",
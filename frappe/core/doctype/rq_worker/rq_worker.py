@@ -10,7 +10,7 @@ from rq import Worker
 import frappe
 from frappe.model.document import Document
 from frappe.utils import cint, convert_utc_to_system_timezone
-from frappe.utils.background_jobs import get_workers
+from frappe.utils.background_jobs import get_queue_type, get_workers
 
 
 class RQWorker(Document):
@@ -75,7 +75,7 @@ def serialize_worker(worker: Worker) -> frappe._dict:
 	queue_names = worker.queue_names()
 
 	queue = ", ".join(queue_names)
-	queue_types = ",".join(q.rsplit(":", 1)[1] for q in queue_names)
+	queue_types = ",".join(dict.fromkeys(get_queue_type(q) for q in queue_names))
 
 	current_job = worker.get_current_job_id()
 	if current_job and not current_job.startswith(frappe.local.site):
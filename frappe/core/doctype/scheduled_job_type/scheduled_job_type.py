@@ -64,6 +64,11 @@ class ScheduledJobType(Document):
 					title=_("Bad Cron Expression"),
 				)
 
+	def on_update(self):
+		from frappe.utils.scheduler import reindex_scheduled_jobs
+
+		frappe.db.after_commit.add(reindex_scheduled_jobs)
+
 	def enqueue(self, force=False) -> bool:
 		# enqueue event if last execution is done
 		if self.is_event_due() or force:
@@ -178,7 +183,10 @@ class ScheduledJobType(Document):
 		return "long" if ("Long" in self.frequency) else "default"
 
 	def on_trash(self):
+		from frappe.utils.scheduler import reindex_scheduled_jobs
+
 		frappe.db.delete("Scheduled Job Log", {"scheduled_job_type": self.name})
+		frappe.db.after_commit.add(reindex_scheduled_jobs)
 
 
 @frappe.whitelist()
@@ -18,6 +18,7 @@ from pypika.dialects import MySQLQueryBuilder, PostgreSQLQueryBuilder
 import frappe
 import frappe.defaults
 from frappe import _
+from frappe.database import query_cache
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -70,6 +71,7 @@ class Database:
 	DEFAULT_COLUMNS = ("name", "creation", "modified", "modified_by", "owner", "docstatus", "idx")
 	CHILD_TABLE_COLUMNS = ("parent", "parenttype", "parentfield")
 	MAX_WRITES_PER_TRANSACTION = 200_000
+	MAX_STATEMENT_SIZE = 16 * 1024 * 1024
 
 	class InvalidColumnName(frappe.ValidationError):
 		pass
@@ -93,6 +95,9 @@ class Database:
 		self._conn = None
 
 		self.transaction_writes = 0
+		self.committed_writes = 0
+		# tables written in current transaction, tracked only if query cache is enabled
+		self.written_tables = set()
 		self.auto_commit_on_many_writes = 0
 
 		self.value_cache = {}
@@ -431,6 +436,9 @@ class Database:
 		if query and is_query_type(query, ("commit", "rollback")):
 			self.transaction_writes = 0
 
+		if query and query_cache.is_enabled() and is_query_type(query, query_cache.WRITE_QUERY_TYPES):
+			self.written_tables.update(query_cache.get_tables(query))
+
 		if query.lstrip()[:6].lower() in ("update", "insert", "delete"):
 			self.transaction_writes += 1
 			if self.transaction_writes > self.MAX_WRITES_PER_TRANSACTION:
@@ -1007,9 +1015,14 @@ class Database:
 
 		self.before_commit.run()
 
+		self.committed_writes += self.transaction_writes
 		self.sql("commit")
 		self.begin()  # explicitly start a new transaction
 
+		if self.written_tables:
+			query_cache.bump_table_versions(self.written_tables)
+			self.written_tables = set()
+
 		self.after_commit.run()
 
 	def rollback(self, *, save_point=None):
@@ -1022,6 +1035,7 @@ class Database:
 
 			self.before_rollback.run()
 
+			self.written_tables = set()
 			self.sql("rollback")
 			self.begin()
 
@@ -1042,6 +1056,10 @@ class Database:
 	def release_savepoint(self, save_point):
 		self.sql(f"release savepoint {save_point}")
 
+	def get_max_statement_size(self) -> int:
+		"""Return maximum size of a single statement in bytes."""
+		return self.MAX_STATEMENT_SIZE
+
 	def field_exists(self, dt, fn):
 		"""Return true of field exists."""
 		return self.exists("DocField", {"fieldname": fn, "parent": dt})
@@ -1192,6 +1210,19 @@ class Database:
 			self._cursor = None
 			self._conn = None
 
+	def detach_connection(self):
+		"""Return open connection, if any, without closing it. It is no longer used by this object."""
+		conn = self._conn
+		self._cursor = None
+		self._conn = None
+		return conn
+
+	def attach_connection(self, conn) -> None:
+		"""Use an open connection, e.g. one detached from another object for the same database."""
+		self.close()
+		self._conn = conn
+		self._cursor = conn.cursor()
+
 	@staticmethod
 	def escape(s, percent=True):
 		"""Escape quotes and percent in given string."""
@@ -8,7 +8,7 @@ from pymysql.converters import conversions, escape_string
 import frappe
 from frappe.database.database import Database
 from frappe.database.mariadb.schema import MariaDBTable
-from frappe.utils import UnicodeWithAttrs, cstr, get_datetime, get_table_name
+from frappe.utils import UnicodeWithAttrs, cint, cstr, get_datetime, get_table_name
 
 _PARAM_COMP = re.compile(r"%\([\w]*\)s")
 
@@ -200,6 +200,22 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 			"JSON": ("json", ""),
 		}
 
+	def get_max_statement_size(self) -> int:
+		"""Return `max_allowed_packet` of the server, cached for the connection."""
+		if not getattr(self, "_max_allowed_packet", None):
+			self._max_allowed_packet = cint(self.sql("SELECT @@max_allowed_packet")[0][0])
+
+		return self._max_allowed_packet or self.MAX_STATEMENT_SIZE
+
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this server is behind its primary, None if replication is not running."""
+		status = self.sql("SHOW SLAVE STATUS", as_dict=True)
+		if not status:
+			# not a replica
+			return 0
+
+		return status[0].get("Seconds_Behind_Master")
+
 	def get_database_size(self):
 		"""Return database size in MB."""
 		db_size = self.sql(
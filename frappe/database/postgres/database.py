@@ -218,6 +218,16 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 
 		return str(psycopg2.extensions.QuotedString(s))
 
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this server is behind its primary, None if nothing has been replayed yet."""
+		return self.sql(
+			"""SELECT CASE
+				WHEN NOT pg_is_in_recovery() THEN 0
+				WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+				ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+			END"""
+		)[0][0]
+
 	def get_database_size(self):
 		"""Return database size in MB"""
 		db_size = self.sql(
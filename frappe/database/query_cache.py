@@ -0,0 +1,94 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Cache for results of SELECT queries.
+
+Enabled by setting `enable_query_cache` in site config, queries then opt in using `cache=True`
+(or TTL in seconds) with `frappe.get_list`, `frappe.get_all` or `query.run()` of query builder.
+
+Each table has a version counter in Redis that is incremented after a transaction that wrote to
+it commits. Results are cached against SQL, values, roles of the user and versions of all tables
+the query reads, so a write makes all cached results of queries reading that table unreachable
+and they simply expire. Queries reading tables written by the current (uncommitted) transaction
+always hit the database.
+
+Note: a transaction that took its snapshot before a write was committed can still cache results
+against the new version, such entries are stale until they expire (`query_cache_ttl`, 60 seconds
+by default).
+"""
+
+import hashlib
+import json
+import re
+from contextlib import suppress
+
+import redis
+
+import frappe
+
+DEFAULT_TTL = 60  # seconds
+
+# `tabXxx Xxx`, "tabXxx Xxx" or tabXxx where a table is expected (not columns like tabbed)
+TABLE_PATTERN = re.compile(r'[`"]tab([^`"]+)[`"]|\b(?i:from|join|update|into|table)\s+tab(\w+)')
+WRITE_QUERY_TYPES = ("insert", "update", "delete", "replace", "alter", "drop", "truncate", "rename")
+
+
+def is_enabled() -> bool:
+	return bool(frappe.conf.enable_query_cache)
+
+
+def get_tables(query: str) -> set[str]:
+	"""Return names of tables referenced in query, without the `tab` prefix."""
+	return {quoted or unquoted for quoted, unquoted in TABLE_PATTERN.findall(query)}
+
+
+def get_version_keys(tables) -> list[str]:
+	return [frappe.cache.make_key(f"table_version::{table}") for table in tables]
+
+
+def get_table_versions(tables: list[str]) -> list[int]:
+	return [int(version or 0) for version in frappe.cache.mget(get_version_keys(tables))]
+
+
+def bump_table_versions(tables: set[str]) -> None:
+	"""Invalidate cached results of queries reading these tables."""
+	with suppress(redis.exceptions.ConnectionError):
+		pipeline = frappe.cache.pipeline()
+		for key in get_version_keys(tables):
+			pipeline.incr(key)
+		pipeline.execute()
+
+
+def get_permission_fingerprint() -> str:
+	# Permission conditions are part of the SQL, roles cover anything else that can affect the result
+	return ",".join(sorted(frappe.get_roles()))
+
+
+def sql(query: str, values=None, cache: bool | int = True, **kwargs):
+	"""Run SELECT query using `frappe.db.sql`, returning cached result if tables haven't changed.
+
+	:param cache: TTL of cached result in seconds, `True` for default TTL.
+	"""
+	tables = sorted(get_tables(query))
+	if not tables or frappe.db.written_tables.intersection(tables):
+		return frappe.db.sql(query, values, **kwargs)
+
+	try:
+		versions = get_table_versions(tables)
+	except redis.exceptions.ConnectionError:
+		return frappe.db.sql(query, values, **kwargs)
+
+	key = json.dumps(
+		[query, values, kwargs, get_permission_fingerprint(), versions],
+		default=str,
+		sort_keys=True,
+	)
+	key = "query_cache::" + hashlib.sha256(key.encode()).hexdigest()
+
+	result = frappe.cache.get_value(key, expires=True)
+	if result is None:
+		result = frappe.db.sql(query, values, **kwargs)
+		ttl = cache if type(cache) is int else frappe.conf.query_cache_ttl or DEFAULT_TTL
+		frappe.cache.set_value(key, result, expires_in_sec=ttl)
+
+	return result
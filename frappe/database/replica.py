@@ -0,0 +1,167 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Routing of read-only traffic to read replicas.
+
+Replicas are configured in site_config.json, either as a single replica using `replica_host`,
+`replica_db_port` (and `replica_db_user`, `replica_db_password` with
+`different_credentials_for_replica`) or as a list of replicas:
+
+	"replicas": [
+		{"host": "10.0.0.2", "weight": 2},
+		{"host": "10.0.0.3", "port": 3307, "user": "reader", "password": "..."}
+	]
+
+A replica is picked at random in proportion to its weight, skipping replicas whose measured
+replication lag exceeds `replica_max_lag` seconds. When none is usable, reads stay on the primary.
+
+After a session commits writes, its reads are kept on the primary for
+`replica_stickiness_period` seconds so that users can read their own writes.
+"""
+
+import random
+from time import monotonic
+
+import frappe
+
+DEFAULT_MAX_LAG = 10  # seconds
+LAG_CHECK_INTERVAL = 5  # seconds
+
+
+def get_replicas() -> list[frappe._dict]:
+	"""Return replicas configured for current site."""
+	conf = frappe.local.conf
+	if replicas := conf.replicas:
+		return [frappe._dict(replica) for replica in replicas]
+
+	if not conf.replica_host:
+		return []
+
+	replica = frappe._dict(host=conf.replica_host, port=conf.replica_db_port, weight=1)
+	if conf.different_credentials_for_replica:
+		replica.user = conf.replica_db_user or conf.replica_db_name
+		replica.password = conf.replica_db_password
+
+	return [replica]
+
+
+def get_max_lag() -> float:
+	return frappe.local.conf.replica_max_lag or DEFAULT_MAX_LAG
+
+
+def connect_to_replica():
+	"""Return connection to a replica that can serve reads, or None if reads should use the primary."""
+	# reads must see uncommitted writes of the current transaction
+	if is_sticky() or (frappe.db and frappe.db.transaction_writes):
+		return None
+
+	max_lag = get_max_lag()
+	candidates = [replica for replica in get_replicas() if (get_cached_lag(replica) or 0) <= max_lag]
+
+	while candidates:
+		replica = random.choices(candidates, weights=[get_weight(r) for r in candidates])[0]
+		candidates.remove(replica)
+
+		db = get_replica_db(replica)
+		try:
+			db.connect()
+		except Exception:
+			frappe.logger("database").warning(f"Replica {replica.host} is unreachable", exc_info=True)
+			set_cached_lag(replica, float("inf"))
+			continue
+
+		lag = get_cached_lag(replica)
+		if lag is None:
+			lag = measure_lag(db)
+			set_cached_lag(replica, lag)
+
+		if lag <= max_lag:
+			return db
+
+		db.close()
+
+	return None
+
+
+def get_replica_db(replica: frappe._dict):
+	from frappe.database import get_db
+
+	conf = frappe.local.conf
+	return get_db(
+		socket=None,
+		host=replica.host,
+		port=replica.port,
+		user=replica.user or conf.db_user,
+		password=replica.password or conf.db_password,
+		cur_db_name=conf.db_name,
+	)
+
+
+def measure_lag(db) -> float:
+	"""Return replication lag of connected replica in seconds, infinite if replication is broken.
+
+	If lag can't be measured (e.g. user lacks the privilege to read replication status), the
+	replica is assumed to be lagging and reads stay on the primary."""
+	try:
+		lag = db.get_replication_lag()
+	except Exception:
+		frappe.logger("database").warning("Failed to measure replication lag", exc_info=True)
+		return float("inf")
+
+	return float("inf") if lag is None else float(lag)
+
+
+def get_cached_lag(replica: frappe._dict) -> float | None:
+	return frappe.cache.get_value(get_lag_key(replica), expires=True, shared=True)
+
+
+def set_cached_lag(replica: frappe._dict, lag: float) -> None:
+	frappe.cache.set_value(get_lag_key(replica), lag, expires_in_sec=LAG_CHECK_INTERVAL, shared=True)
+
+
+def get_lag_key(replica: frappe._dict) -> str:
+	return f"replica_lag::{replica.host}:{replica.port or ''}"
+
+
+def get_weight(replica: frappe._dict) -> float:
+	weight = replica.weight
+	return 1 if weight is None else max(float(weight), 0) or 1e-9
+
+
+def get_stickiness_period() -> int:
+	return frappe.local.conf.replica_stickiness_period or int(get_max_lag()) + LAG_CHECK_INTERVAL
+
+
+def get_sticky_key() -> str | None:
+	session = getattr(frappe.local, "session", None)
+	if not session or not session.sid or session.user == "Guest":
+		return None
+
+	return f"replica_sticky::{session.sid}"
+
+
+def is_sticky() -> bool:
+	"""Return True if current session has recently written to the primary."""
+	if (until := getattr(frappe.local, "replica_sticky_until", None)) and until > monotonic():
+		return True
+
+	key = get_sticky_key()
+	return bool(key and frappe.cache.get_value(key, expires=True))
+
+
+def mark_sticky() -> None:
+	"""Keep reads of current session on the primary for a while."""
+	period = get_stickiness_period()
+	frappe.local.replica_sticky_until = monotonic() + period
+
+	if key := get_sticky_key():
+		frappe.cache.set_value(key, 1, expires_in_sec=period)
+
+
+def is_replica_eligible(method) -> bool:
+	"""Return True if whitelisted method can only be called using GET and may be served by a replica."""
+	conf = frappe.local.conf
+	if not (conf.read_from_replica and conf.route_get_requests_to_replica):
+		return False
+
+	return frappe.allowed_http_methods_for_whitelisted_func.get(method) == ["GET"]
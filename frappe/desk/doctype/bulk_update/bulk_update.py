@@ -76,6 +76,8 @@ def _bulk_action(doctype, docnames, action, data, task_id=None):
 	num_documents = len(docnames)
 
 	for idx, docname in enumerate(docnames, 1):
+		# not loaded in bulk, actions on earlier documents can change later ones
+		# (e.g. tree positions or updates cascading to linked documents)
 		doc = frappe.get_doc(doctype, docname)
 		try:
 			message = ""
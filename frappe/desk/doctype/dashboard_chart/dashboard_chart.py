@@ -207,6 +207,7 @@ def get_chart_config(chart, filters, timespan, timegrain, from_date, to_date):
 		order_by=datefield,
 		as_list=True,
 		parent_doctype=chart.parent_document_type,
+		cache=True,
 	)
 
 	result = get_result(data, timegrain, from_date, to_date, chart.chart_type)
@@ -277,6 +278,7 @@ def get_group_by_chart_config(chart, filters) -> dict | None:
 		group_by=group_by_field,
 		order_by="count desc",
 		ignore_ifnull=True,
+		cache=True,
 	)
 
 	group_by_field_field = frappe.get_meta(doctype).get_field(
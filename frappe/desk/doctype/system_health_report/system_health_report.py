@@ -24,7 +24,7 @@ from contextlib import contextmanager
 import frappe
 from frappe.core.doctype.scheduled_job_type.scheduled_job_type import ScheduledJobType
 from frappe.model.document import Document
-from frappe.utils.background_jobs import get_queue, get_queue_list, get_redis_conn
+from frappe.utils.background_jobs import get_pending_jobs_by_site, get_queue_list, get_redis_conn
 from frappe.utils.caching import redis_cache
 from frappe.utils.data import add_to_date
 from frappe.utils.scheduler import get_scheduler_status, get_scheduler_tick
@@ -171,12 +171,13 @@ class SystemHealthReport(Document):
 			)
 
 		for queue in get_queue_list():
-			q = get_queue(queue)
+			pending_jobs = get_pending_jobs_by_site(queue)
 			self.append(
 				"queue_status",
 				{
 					"queue": queue,
-					"pending_jobs": q.count,
+					"pending_jobs": sum(pending_jobs.values()),
+					"site_pending_jobs": pending_jobs.get(frappe.local.site, 0),
 				},
 			)
 
@@ -19,6 +19,7 @@ class SystemHealthReportQueue(Document):
 		parenttype: DF.Data
 		pending_jobs: DF.Int
 		queue: DF.Data | None
+		site_pending_jobs: DF.Int
 	# end: auto-generated types
 
 	def db_insert(self, *args, **kwargs):
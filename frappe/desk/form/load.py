@@ -1,10 +1,15 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import hashlib
 import json
 import typing
+from collections import defaultdict
+from contextlib import suppress
 from urllib.parse import quote_plus
 
+import redis
+
 import frappe
 import frappe.defaults
 import frappe.desk.form.meta
@@ -14,10 +19,34 @@ from frappe.desk.form.document_follow import is_document_followed
 from frappe.model.utils.user_settings import get_user_settings
 from frappe.permissions import get_doc_permissions, has_permission
 from frappe.utils.data import cstr
+from frappe.utils.response import is_not_modified
 
 if typing.TYPE_CHECKING:
 	from frappe.model.document import Document
 
+FORM_META_VERSION_KEY = "form_meta_version"
+FORM_LOAD_STATS_KEY = "form_load_stats"
+
+# doctypes shown in docinfo of the document they reference, with their reference fields
+DOCINFO_REFERENCES = {
+	"Comment": ("reference_doctype", "reference_name"),
+	"Communication": ("reference_doctype", "reference_name"),
+	"DocShare": ("share_doctype", "share_name"),
+	"Document Follow": ("ref_doctype", "ref_docname"),
+	"Energy Point Log": ("reference_doctype", "reference_name"),
+	"Error Log": ("reference_doctype", "reference_name"),
+	"File": ("attached_to_doctype", "attached_to_name"),
+	"Milestone": ("reference_type", "reference_name"),
+	"Tag Link": ("document_type", "document_name"),
+	"ToDo": ("reference_type", "reference_name"),
+	"Version": ("ref_doctype", "docname"),
+	"View Log": ("reference_doctype", "reference_name"),
+	"Webhook Request Log": ("reference_doctype", "reference_document"),
+}
+
+# columns of documents that are updated without changing `modified`
+UNVERSIONED_COLUMNS = ("_user_tags", "_comments", "_assign", "_liked_by", "_seen")
+
 
 @frappe.whitelist()
 def getdoc(doctype, name, user=None):
@@ -44,13 +73,19 @@ def getdoc(doctype, name, user=None):
 
 	run_onload(doc)
 	doc.apply_fieldlevel_read_permissions()
+	link_titles = get_link_titles([doc, *_get_table_and_multiselect_rows(doc)])
+
+	if is_form_not_modified("getdoc", get_doc_etag(doc, link_titles)):
+		doc.add_viewed()
+		doc.add_seen()
+		return
 
 	# add file list
 	doc.add_viewed()
 	get_docinfo(doc)
 
 	doc.add_seen()
-	set_link_titles(doc)
+	send_link_titles(link_titles)
 	if frappe.response.docs is None:
 		frappe.local.response = _dict({"docs": []})
 	frappe.response.docs.append(doc)
@@ -60,18 +95,20 @@ def getdoc(doctype, name, user=None):
 def getdoctype(doctype, with_parent=False, cached_timestamp=None):
 	"""load doctype"""
 
-	docs = []
-	parent_dt = None
-
 	# with parent (called from report builder)
-	if with_parent and (parent_dt := frappe.model.meta.get_parent_dt(doctype)):
+	parent_dt = with_parent and frappe.model.meta.get_parent_dt(doctype)
+	user_settings = get_user_settings(parent_dt or doctype)
+
+	if is_form_not_modified("getdoctype", get_meta_etag(parent_dt or doctype, user_settings)):
+		return
+
+	if parent_dt:
 		docs = get_meta_bundle(parent_dt)
 		frappe.response["parent_dt"] = parent_dt
-
-	if not docs:
+	else:
 		docs = get_meta_bundle(doctype)
 
-	frappe.response["user_settings"] = get_user_settings(parent_dt or doctype)
+	frappe.response["user_settings"] = user_settings
 
 	if cached_timestamp and docs[0].modified == cached_timestamp:
 		return "use_cache"
@@ -98,6 +135,9 @@ def get_docinfo(doc=None, doctype=None, name=None):
 		if not doc.has_permission("read"):
 			raise frappe.PermissionError
 
+		if is_form_not_modified("get_docinfo", get_docinfo_etag(doc)):
+			return
+
 	all_communications = _get_communications(doc.doctype, doc.name, limit=21)
 	automated_messages = [
 		msg for msg in all_communications if msg["communication_type"] == "Automated Message"
@@ -138,6 +178,123 @@ def get_docinfo(doc=None, doctype=None, name=None):
 	frappe.response["docinfo"] = docinfo
 
 
+def get_doc_etag(doc: "Document", link_titles: dict) -> str | None:
+	"""Return ETag of document loaded in form with its docinfo and titles of linked documents,
+	None if it can't be revalidated."""
+	doc_events = frappe.get_hooks("doc_events", {})
+	if hasattr(doc, "onload") or any(doc_events.get(dt, {}).get("onload") for dt in ("*", doc.doctype)):
+		# data added by onload can change without the document changing
+		return None
+
+	if not (docinfo_etag := get_docinfo_etag(doc)):
+		return None
+
+	return get_form_etag(docinfo_etag, link_titles, *(doc.get(column) for column in UNVERSIONED_COLUMNS))
+
+
+def get_docinfo_etag(doc: "Document") -> str | None:
+	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+
+	hooks = frappe.get_hooks("additional_timeline_content", {})
+	if hooks.get("*") or hooks.get(doc.doctype):
+		return None
+
+	if not (version := get_version(get_docinfo_version_key(doc.doctype, doc.name))):
+		return None
+
+	# permissions in docinfo also depend on permission rules of the doctype (e.g. Custom DocPerm,
+	# which clear the meta version) and user permissions of the user
+	if not (meta_version := get_version(FORM_META_VERSION_KEY)):
+		return None
+
+	return get_form_etag(doc.doctype, doc.name, doc.modified, version, meta_version, get_user_permissions())
+
+
+def get_meta_etag(doctype: str, user_settings) -> str | None:
+	"""Return ETag of meta bundle of doctype loaded in form, None if it can't be revalidated."""
+	# assets aren't cached in developer mode, they may be edited
+	if frappe.conf.developer_mode or not (version := get_version(FORM_META_VERSION_KEY)):
+		return None
+
+	return get_form_etag(doctype, user_settings, version)
+
+
+def get_form_etag(*parts) -> str:
+	"""Return ETag of form data made from `parts` for current user."""
+	parts = (frappe.session.user, frappe.local.lang, frappe.get_roles(), *parts)
+	return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def is_form_not_modified(method: str, etag: str | None) -> bool:
+	"""Return True if the client already has this version of form data, counting hits and misses."""
+	if not etag:
+		return False
+
+	not_modified = is_not_modified(etag)
+	with suppress(redis.exceptions.ConnectionError):
+		frappe.cache.incr(get_stats_key(method, not_modified))
+
+	return not_modified
+
+
+def get_stats_key(method: str, hit: bool) -> str:
+	return frappe.cache.make_key(f"{FORM_LOAD_STATS_KEY}::{method}::{'hits' if hit else 'misses'}")
+
+
+@frappe.whitelist()
+def get_form_load_stats() -> dict[str, dict]:
+	"""Return counts of form loads revalidated (hits) or sent again (misses) and their hit rates."""
+	frappe.only_for("System Manager")
+
+	methods = ("getdoc", "get_docinfo", "getdoctype")
+	keys = [get_stats_key(method, hit) for method in methods for hit in (True, False)]
+	counts = iter(int(count or 0) for count in frappe.cache.mget(keys))
+
+	stats = {}
+	for method in methods:
+		hits, misses = next(counts), next(counts)
+		stats[method] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses or 1)}
+
+	return stats
+
+
+def get_version(key: str) -> str | None:
+	"""Return version of data stored in cache, a new one if there is none (e.g. after eviction).
+
+	Versions are invalidated by deleting them, as any other cached value."""
+	key = frappe.cache.make_key(key)
+	try:
+		if version := frappe.cache.get(key):
+			return frappe.safe_decode(version)
+
+		frappe.cache.set(key, frappe.generate_hash(length=10), nx=True)
+		return frappe.safe_decode(frappe.cache.get(key))
+	except redis.exceptions.ConnectionError:
+		return None
+
+
+def get_docinfo_version_key(doctype: str, name: str) -> str:
+	return f"docinfo_version::{doctype}::{name}"
+
+
+def clear_docinfo_version(doc, method=None):
+	"""Invalidate ETags of docinfo of the document referenced by `doc` (doc event)."""
+	if not (fields := DOCINFO_REFERENCES.get(doc.doctype)):
+		return
+
+	references = [(doc.get(fields[0]), doc.get(fields[1]))]
+	if doc.doctype == "Communication":
+		references.extend((link.link_doctype, link.link_name) for link in doc.timeline_links)
+
+	keys = [get_docinfo_version_key(doctype, name) for doctype, name in references if doctype and name]
+	if not keys:
+		return
+
+	frappe.cache.delete_value(keys)
+	# also after commit, so that requests made before it don't save stale data as latest version
+	frappe.db.after_commit.add(lambda: frappe.cache.delete_value(keys))
+
+
 def add_comments(doc, docinfo):
 	# divide comments into separate lists
 	docinfo.comments = []
@@ -422,49 +579,53 @@ def get_additional_timeline_content(doctype, docname):
 
 
 def set_link_titles(doc):
-	link_titles = {}
-	link_titles.update(get_title_values_for_link_and_dynamic_link_fields(doc))
-	link_titles.update(get_title_values_for_table_and_multiselect_fields(doc))
-
-	send_link_titles(link_titles)
+	send_link_titles(get_link_titles([doc, *_get_table_and_multiselect_rows(doc)]))
 
 
 def get_title_values_for_link_and_dynamic_link_fields(doc, link_fields=None):
-	link_titles = {}
+	return get_link_titles([doc], link_fields)
 
-	if not link_fields:
-		meta = frappe.get_meta(doc.doctype)
-		link_fields = meta.get_link_fields() + meta.get_dynamic_link_fields()
 
-	for field in link_fields:
-		if not (doc_fieldvalue := getattr(doc, field.fieldname, None)):
-			continue
+def get_title_values_for_table_and_multiselect_fields(doc, table_fields=None):
+	return get_link_titles(_get_table_and_multiselect_rows(doc, table_fields))
 
-		doctype = field.options if field.fieldtype == "Link" else doc.get(field.options)
 
-		meta = frappe.get_meta(doctype)
-		if not meta or not meta.title_field or not meta.show_title_field_in_link:
-			continue
+def _get_table_and_multiselect_rows(doc, table_fields=None):
+	if not table_fields:
+		table_fields = frappe.get_meta(doc.doctype).get_table_fields()
 
-		link_title = frappe.db.get_value(doctype, doc_fieldvalue, meta.title_field, cache=True, order_by=None)
-		link_titles.update({doctype + "::" + doc_fieldvalue: link_title or doc_fieldvalue})
+	return [row for field in table_fields for row in doc.get(field.fieldname) or []]
 
-	return link_titles
 
+def get_link_titles(docs, link_fields=None):
+	"""Return titles of documents linked from `docs`, fetched in one batch per linked doctype."""
+	to_fetch = defaultdict(set)
 
-def get_title_values_for_table_and_multiselect_fields(doc, table_fields=None):
-	link_titles = {}
+	for doc in docs:
+		fields = link_fields
+		if not fields:
+			meta = frappe.get_meta(doc.doctype)
+			fields = meta.get_link_fields() + meta.get_dynamic_link_fields()
 
-	if not table_fields:
-		meta = frappe.get_meta(doc.doctype)
-		table_fields = meta.get_table_fields()
+		for field in fields:
+			if not (doc_fieldvalue := getattr(doc, field.fieldname, None)):
+				continue
+
+			doctype = field.options if field.fieldtype == "Link" else doc.get(field.options)
 
-	for field in table_fields:
-		if not doc.get(field.fieldname):
-			continue
+			meta = frappe.get_meta(doctype)
+			if not meta or not meta.title_field or not meta.show_title_field_in_link:
+				continue
 
-		for value in doc.get(field.fieldname):
-			link_titles.update(get_title_values_for_link_and_dynamic_link_fields(value))
+			to_fetch[doctype].add(doc_fieldvalue)
+
+	link_titles = {}
+	for doctype, names in to_fetch.items():
+		title_field = frappe.get_meta(doctype).title_field
+		for name, title in frappe.get_all(
+			doctype, filters={"name": ("in", list(names))}, fields=["name", title_field], as_list=True
+		):
+			link_titles[f"{doctype}::{name}"] = title or name
 
 	return link_titles
 
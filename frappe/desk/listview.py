@@ -57,7 +57,7 @@ def get_group_by_count(doctype: str, current_filters: str, field: str) -> list[d
 			.groupby(ToDo.allocated_to)
 			.orderby(count, order=Order.desc)
 			.limit(50)
-			.run(as_dict=True)
+			.run(as_dict=True, cache=True)
 		)
 
 	meta = frappe.get_meta(doctype)
@@ -72,6 +72,7 @@ def get_group_by_count(doctype: str, current_filters: str, field: str) -> list[d
 		fields=["count(*) as count", f"`{field}` as name"],
 		order_by="count desc",
 		limit=50,
+		cache=True,
 	)
 
 	# Add in title if it's a link field and `show_title_field_in_link` is set
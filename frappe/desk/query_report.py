@@ -2,8 +2,10 @@
 # License: MIT. See LICENSE
 
 import datetime
+import io
 import json
 import os
+import tempfile
 from datetime import timedelta
 
 import frappe
@@ -308,7 +310,7 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 @frappe.whitelist()
 def export_query():
 	"""export from query reports"""
-	from frappe.desk.utils import get_csv_bytes, pop_csv_params, provide_binary_file
+	from frappe.desk.utils import pop_csv_params, provide_binary_file, write_csv
 
 	form_params = frappe._dict(frappe.local.form_dict)
 	csv_params = pop_csv_params(form_params)
@@ -342,19 +344,22 @@ def export_query():
 		return
 
 	format_duration_fields(data)
-	xlsx_data, column_widths = build_xlsx_data(
-		data, visible_idx, include_indentation, include_filters=include_filters
-	)
+	rows = iter_xlsx_data(data, visible_idx, include_indentation, include_filters=include_filters)
 
+	# rows are written to a temporary file as they are built instead of keeping the whole file in memory
+	content = tempfile.TemporaryFile()
 	if file_format_type == "CSV":
-		content = get_csv_bytes(xlsx_data, csv_params)
+		file = io.TextIOWrapper(content, encoding="utf-8", newline="")
+		write_csv(file, rows, csv_params)
+		file.detach()
 		file_extension = "csv"
 	elif file_format_type == "Excel":
 		from frappe.utils.xlsxutils import make_xlsx
 
 		file_extension = "xlsx"
-		content = make_xlsx(xlsx_data, "Query Report", column_widths=column_widths).getvalue()
+		make_xlsx(rows, "Query Report", column_widths=get_xlsx_column_widths(data.columns), file=content)
 
+	content.seek(0)
 	provide_binary_file(report_name, file_extension, content)
 
 
@@ -370,6 +375,25 @@ def format_duration_fields(data: frappe._dict) -> None:
 
 
 def build_xlsx_data(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	result = list(
+		iter_xlsx_data(
+			data,
+			visible_idx,
+			include_indentation,
+			include_filters=include_filters,
+			ignore_visible_idx=ignore_visible_idx,
+		)
+	)
+	return result, get_xlsx_column_widths(data.columns)
+
+
+def get_xlsx_column_widths(columns) -> list[float]:
+	# to convert into scale accepted by openpyxl
+	return [cint(column.get("width", 0)) / 10 for column in columns if not column.get("hidden")]
+
+
+def iter_xlsx_data(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	"""Yield rows of the export one by one, see `build_xlsx_data`."""
 	EXCEL_TYPES = (
 		str,
 		bool,
@@ -389,11 +413,7 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 		# Note: converted for faster lookups
 		visible_idx = set(visible_idx)
 
-	result = []
-	column_widths = []
-
 	if cint(include_filters):
-		filter_data = []
 		filters = data.filters
 		for filter_name, filter_value in filters.items():
 			if not filter_value:
@@ -403,20 +423,10 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 				if isinstance(filter_value, list)
 				else cstr(filter_value)
 			)
-			filter_data.append([cstr(filter_name), filter_value])
-		filter_data.append([])
-		result += filter_data
+			yield [cstr(filter_name), filter_value]
+		yield []
 
-	column_data = []
-	for column in data.columns:
-		if column.get("hidden"):
-			continue
-		column_data.append(_(column.get("label")))
-		column_width = cint(column.get("width", 0))
-		# to convert into scale accepted by openpyxl
-		column_width /= 10
-		column_widths.append(column_width)
-	result.append(column_data)
+	yield [_(column.get("label")) for column in data.columns if not column.get("hidden")]
 
 	# build table from result
 	for row_idx, row in enumerate(data.result):
@@ -439,9 +449,7 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 			elif row:
 				row_data = row
 
-			result.append(row_data)
-
-	return result, column_widths
+			yield row_data
 
 
 def add_total_row(result, columns, meta=None, is_tree=False, parent_field=None):
@@ -3,7 +3,10 @@
 
 """build query for doclistview and return results"""
 
+import io
 import json
+import tempfile
+from contextlib import nullcontext
 from functools import lru_cache
 
 from sql_metadata import Parser
@@ -16,6 +19,7 @@ from frappe.model import child_table_fields, default_fields, get_permitted_field
 from frappe.model.base_document import get_controller
 from frappe.model.db_query import DatabaseQuery
 from frappe.model.utils import is_virtual_doctype
+from frappe.translate import get_all_translations
 from frappe.utils import add_user_info, cint, format_duration
 from frappe.utils.data import sbool
 
@@ -351,7 +355,7 @@ def delete_report(name):
 @frappe.read_only()
 def export_query():
 	"""export from report builder"""
-	from frappe.desk.utils import get_csv_bytes, pop_csv_params, provide_binary_file
+	from frappe.desk.utils import pop_csv_params, provide_binary_file, write_csv
 
 	form_params = get_form_params()
 	form_params["limit_page_length"] = None
@@ -376,59 +380,92 @@ def export_query():
 	)
 
 	db_query = DatabaseQuery(doctype)
-	ret = db_query.execute(**form_params)
-
-	if add_totals_row:
-		ret = append_totals_row(ret)
-
+	query = db_query.execute(**form_params, run=False)
 	fields_info = get_field_info(db_query.fields, doctype)
 
-	labels = [info["label"] for info in fields_info]
-	data = [[_("Sr"), *labels]]
-	processed_data = []
-
-	if frappe.local.lang == "en" or not translate_values:
-		data.extend([i + 1, *list(row)] for i, row in enumerate(ret))
-	elif translate_values:
+	header = [_("Sr")] + [info["label"] for info in fields_info]
+	translatable_fields = None
+	if translate_values and frappe.local.lang != "en":
 		translatable_fields = [field["translatable"] for field in fields_info]
-		processed_data = []
-		for i, row in enumerate(ret):
-			processed_row = [i + 1] + [
-				_(value) if translatable_fields[idx] else value for idx, value in enumerate(row)
-			]
-			processed_data.append(processed_row)
-			data.extend(processed_data)
-
-	data = handle_duration_fieldtype_values(doctype, data, db_query.fields)
-
-	if file_format_type == "CSV":
-		from frappe.utils.xlsxutils import handle_html
-
-		file_extension = "csv"
-		content = get_csv_bytes(
-			[[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r] for r in data],
-			csv_params,
-		)
-	elif file_format_type == "Excel":
-		from frappe.utils.xlsxutils import make_xlsx
+		# loaded (and cached for the request) before reading rows, loading them can query the database
+		get_all_translations(frappe.local.lang)
+	duration_fields = get_duration_fields(doctype, db_query.fields)
+
+	def get_rows(result):
+		yield header
+
+		idx, totals = 0, None
+		for idx, row in enumerate(result, 1):
+			if add_totals_row:
+				totals = add_to_totals(totals, row)
+			yield process_row(idx, row)
+
+		if totals:
+			if not isinstance(totals[0], int | float):
+				totals[0] = "Total"
+			yield process_row(idx + 1, totals)
+
+	def process_row(idx, row):
+		if translatable_fields:
+			row = [_(value) if translatable_fields[col] else value for col, value in enumerate(row)]
+		row = [idx, *row]
+		for index, hide_days in duration_fields.items():
+			if row[index]:
+				row[index] = format_duration(row[index], hide_days)
+		return row
+
+	# Rows are read from the database and written to a temporary file as they arrive, so that memory
+	# usage doesn't grow with the size of the export. No other query may run while reading rows from
+	# an unbuffered cursor, everything else is computed before.
+	content = tempfile.TemporaryFile()
+	cursor = frappe.db.unbuffered_cursor() if frappe.db.db_type == "mariadb" else nullcontext()
+	with cursor:
+		# virtual doctypes (and queries without any permitted column) return the result directly
+		result = frappe.db.sql(query, as_list=True, as_iterator=True) if isinstance(query, str) else query
+
+		if file_format_type == "CSV":
+			from frappe.utils.xlsxutils import handle_html
+
+			file_extension = "csv"
+			file = io.TextIOWrapper(content, encoding="utf-8", newline="")
+			write_csv(
+				file,
+				(
+					[handle_html(frappe.as_unicode(v)) if isinstance(v, str) else v for v in r]
+					for r in get_rows(result)
+				),
+				csv_params,
+			)
+			file.detach()
+		elif file_format_type == "Excel":
+			from frappe.utils.xlsxutils import make_xlsx
 
-		file_extension = "xlsx"
-		content = make_xlsx(data, doctype).getvalue()
+			file_extension = "xlsx"
+			make_xlsx(get_rows(result), doctype, file=content)
 
+	content.seek(0)
 	provide_binary_file(title, file_extension, content)
 
 
+def add_to_totals(totals, row):
+	"""Add numeric values of `row` to running `totals`, return updated totals."""
+	if totals is None:
+		totals = [""] * len(row)
+
+	for i, value in enumerate(row):
+		if isinstance(value, float | int):
+			totals[i] = (totals[i] or 0) + value
+
+	return totals
+
+
 def append_totals_row(data):
 	if not data:
 		return data
 	data = list(data)
-	totals = []
-	totals.extend([""] * len(data[0]))
-
+	totals = None
 	for row in data:
-		for i in range(len(row)):
-			if isinstance(row[i], float | int):
-				totals[i] = (totals[i] or 0) + row[i]
+		totals = add_to_totals(totals, row)
 
 	if not isinstance(totals[0], int | float):
 		totals[0] = "Total"
@@ -490,7 +527,19 @@ def get_field_info(fields, doctype):
 
 
 def handle_duration_fieldtype_values(doctype, data, fields):
-	for field in fields:
+	for index, hide_days in get_duration_fields(doctype, fields).items():
+		for i in range(1, len(data)):
+			val_in_seconds = data[i][index]
+			if val_in_seconds:
+				duration_val = format_duration(val_in_seconds, hide_days)
+				data[i][index] = duration_val
+	return data
+
+
+def get_duration_fields(doctype, fields) -> dict[int, bool]:
+	"""Return `{column index: hide_days}` of Duration fields, counting the "Sr" column."""
+	duration_fields = {}
+	for index, field in enumerate(fields):
 		try:
 			parenttype, fieldname = parse_field(field)
 		except ValueError:
@@ -500,13 +549,8 @@ def handle_duration_fieldtype_values(doctype, data, fields):
 		df = frappe.get_meta(parenttype).get_field(fieldname)
 
 		if df and df.fieldtype == "Duration":
-			index = fields.index(field) + 1
-			for i in range(1, len(data)):
-				val_in_seconds = data[i][index]
-				if val_in_seconds:
-					duration_val = format_duration(val_in_seconds, df.hide_days)
-					data[i][index] = duration_val
-	return data
+			duration_fields[index + 1] = df.hide_days
+	return duration_fields
 
 
 def parse_field(field: str) -> tuple[str | None, str]:
@@ -620,6 +664,7 @@ def get_stats(stats, doctype, filters=None):
 				group_by=column,
 				as_list=True,
 				distinct=1,
+				cache=True,
 			)
 
 			if column == "_user_tags":
@@ -631,6 +676,7 @@ def get_stats(stats, doctype, filters=None):
 					as_list=True,
 					group_by=column,
 					order_by=column,
+					cache=True,
 				)
 
 				no_tag_count = no_tag_count[0][1] if no_tag_count else 0
@@ -1,6 +1,9 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+from collections.abc import Iterable
+from typing import BinaryIO, TextIO
+
 import frappe
 
 
@@ -42,20 +45,25 @@ def pop_csv_params(form_dict):
 
 def get_csv_bytes(data: list[list], csv_params: dict) -> bytes:
 	"""Convert data to csv bytes."""
-	from csv import writer
 	from io import StringIO
 
-	decimal_sep = csv_params.pop("decimal_sep", None)
+	file = StringIO()
+	write_csv(file, data, csv_params)
 
-	_data = data.copy()
-	if decimal_sep:
-		_data = apply_csv_decimal_sep(data, decimal_sep)
+	return file.getvalue().encode("utf-8")
 
-	file = StringIO()
+
+def write_csv(file: TextIO, rows: Iterable[list], csv_params: dict) -> None:
+	"""Write rows to a text file as csv, one row at a time."""
+	from csv import writer
+
+	decimal_sep = csv_params.pop("decimal_sep", None)
 	csv_writer = writer(file, **csv_params)
-	csv_writer.writerows(_data)
 
-	return file.getvalue().encode("utf-8")
+	for row in rows:
+		if decimal_sep and decimal_sep != ".":
+			row = apply_csv_decimal_sep((row,), decimal_sep)[0]
+		csv_writer.writerow(row)
 
 
 def apply_csv_decimal_sep(data: list[list], decimal_sep: str) -> list[list]:
@@ -69,8 +77,10 @@ def apply_csv_decimal_sep(data: list[list], decimal_sep: str) -> list[list]:
 	]
 
 
-def provide_binary_file(filename: str, extension: str, content: bytes) -> None:
-	"""Provide a binary file to the client."""
+def provide_binary_file(filename: str, extension: str, content: bytes | BinaryIO) -> None:
+	"""Provide a binary file to the client.
+
+	`content` can also be a file object, which is streamed to the client and closed afterwards."""
 	from frappe import _
 
 	frappe.response["type"] = "binary"
@@ -83,6 +83,7 @@ class EmailAccount(Document):
 		email_id: DF.Data
 		email_server: DF.Data | None
 		email_sync_option: DF.Literal["ALL", "UNSEEN"]
+		emails_per_minute: DF.Int
 		enable_auto_reply: DF.Check
 		enable_automatic_linking: DF.Check
 		enable_incoming: DF.Check
@@ -105,6 +106,7 @@ class EmailAccount(Document):
 			"", "Frappe Mail", "GMail", "Sendgrid", "SparkPost", "Yahoo Mail", "Outlook.com", "Yandex.Mail"
 		]
 		signature: DF.TextEditor | None
+		smtp_connections: DF.Int
 		smtp_port: DF.Data | None
 		smtp_server: DF.Data | None
 		track_email_status: DF.Check
@@ -483,6 +485,8 @@ class EmailAccount(Document):
 				"conf_names": ("disable_mail_smtp_authentication",),
 				"default": 0,
 			},
+			"smtp_connections": {"conf_names": ("mail_smtp_connections",), "default": 1},
+			"emails_per_minute": {"conf_names": ("mail_emails_per_minute",), "default": 0},
 		}
 
 		account_details = {}
@@ -16,7 +16,7 @@ from frappe.email.doctype.email_account.email_account import EmailAccount
 from frappe.email.email_body import add_attachment, get_email, get_formatted_html
 from frappe.email.frappemail import FrappeMail
 from frappe.email.queue import get_unsubcribed_url, get_unsubscribe_message
-from frappe.email.smtp import SMTPServer
+from frappe.email.smtp import SMTPConnectionPool, SMTPServer
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Now
@@ -257,21 +257,24 @@ class SendMailContext:
 
 	def __exit__(self, exc_type, exc_val, exc_tb):
 		if exc_type:
-			update_fields = {"error": frappe.get_traceback()}
-			if self.queue_doc.retry < get_email_retry_limit():
-				update_fields.update(
-					{
-						"status": "Partially Sent" if self.sent_to_atleast_one_recipient else "Not Sent",
-						"retry": self.queue_doc.retry + 1,
-					}
-				)
-			else:
-				update_fields.update({"status": "Error"})
-				self.notify_failed_email()
+			self.update_status_to_failed(frappe.get_traceback())
+		else:
+			self.queue_doc.update_status(status="Sent", commit=True)
+
+	def update_status_to_failed(self, error: str, commit=True):
+		update_fields = {"error": error}
+		if self.queue_doc.retry < get_email_retry_limit():
+			update_fields.update(
+				{
+					"status": "Partially Sent" if self.sent_to_atleast_one_recipient else "Not Sent",
+					"retry": self.queue_doc.retry + 1,
+				}
+			)
 		else:
-			update_fields = {"status": "Sent"}
+			update_fields.update({"status": "Error"})
+			self.notify_failed_email()
 
-		self.queue_doc.update_status(**update_fields, commit=True)
+		self.queue_doc.update_status(**update_fields, commit=commit)
 
 	@savepoint(catch=Exception)
 	def notify_failed_email(self):
@@ -426,6 +429,91 @@ class SendMailContext:
 		file.insert()
 
 
+def can_send_in_bulk(email_account: EmailAccount | None) -> bool:
+	"""Return True if emails of the account can be sent using `send_in_bulk`, i.e. over SMTP."""
+	return bool(
+		email_account
+		and email_account.service != "Frappe Mail"
+		and (not frappe.flags.in_test or frappe.flags.testing_email)
+		and not get_hook_method("override_email_send")
+	)
+
+
+def send_in_bulk(queues: list[EmailQueue], email_account: EmailAccount, pool: SMTPConnectionPool):
+	"""Send emails of an account over the pooled SMTP sessions, yield names of queues that failed.
+
+	Same as calling `EmailQueue.send` for every queue, except that statuses of sent emails and
+	recipients are updated together."""
+	queues = [queue for queue in queues if queue.can_send_now()]
+	if not queues:
+		return
+
+	contexts, messages, pending, not_built = {}, [], [], []
+	for queue in queues:
+		ctx = SendMailContext(queue)
+		ctx.email_account_doc = email_account
+		try:
+			queue_messages = [
+				(recipient, ctx.build_message(recipient.recipient))
+				for recipient in queue.recipients
+				if not recipient.is_mail_sent()
+			]
+		except Exception:
+			error = frappe.get_traceback()
+			ctx.update_status_to_failed(error, commit=False)
+			queue.log_error(message=error)
+			not_built.append(queue.name)
+			continue
+
+		contexts[queue.name] = ctx
+		for recipient, message in queue_messages:
+			messages.append((queue.sender, recipient.recipient, message))
+			pending.append((ctx, recipient, message))
+
+	if contexts:
+		frappe.db.set_value("Email Queue", {"name": ("in", list(contexts))}, "status", "Sending")
+	frappe.db.commit()
+
+	try:
+		errors = pool.send_many(messages)
+	except Exception as e:
+		# sessions couldn't be opened
+		errors = [e] * len(messages)
+
+	sent_recipients, failed, last_messages = [], {}, {}
+	for (ctx, recipient, message), error in zip(pending, errors, strict=True):
+		if error:
+			failed.setdefault(ctx.queue_doc.name, error)
+		else:
+			ctx.sent_to_atleast_one_recipient = True
+			sent_recipients.append(recipient.name)
+			last_messages[ctx.queue_doc.name] = message
+
+	if sent_recipients:
+		frappe.db.set_value("Email Queue Recipient", {"name": ("in", sent_recipients)}, "status", "Sent")
+
+	sent = [name for name in contexts if name not in failed]
+	if sent:
+		frappe.db.set_value("Email Queue", {"name": ("in", sent)}, "status", "Sent")
+
+	for name, ctx in contexts.items():
+		if name in failed:
+			error = "".join(traceback.format_exception(failed[name]))
+			ctx.update_status_to_failed(error, commit=False)
+			ctx.queue_doc.log_error(message=error)
+		elif ctx.queue_doc.communication:
+			frappe.get_doc("Communication", ctx.queue_doc.communication).set_delivery_status()
+
+	frappe.db.commit()
+
+	if email_account.append_emails_to_sent_folder:
+		for message in last_messages.values():
+			email_account.append_email_to_sent_folder(message)
+
+	yield from not_built
+	yield from failed
+
+
 @frappe.whitelist()
 def retry_sending(queues: str | list[str]):
 	if not frappe.has_permission("Email Queue", throw=True):
@@ -3,7 +3,7 @@
 
 import frappe
 from frappe import _, msgprint
-from frappe.utils import cint, cstr, get_url, now_datetime
+from frappe.utils import cint, create_batch, cstr, get_url, now_datetime
 from frappe.utils.data import getdate
 from frappe.utils.verified_command import get_signed_params, verify_request
 
@@ -12,6 +12,9 @@ from frappe.utils.verified_command import get_signed_params, verify_request
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT = 0.33
 EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT = 10
 
+# Emails sent over pooled SMTP sessions, before their statuses are updated and committed.
+EMAIL_QUEUE_BULK_SEND_BATCH_SIZE = 100
+
 
 def get_emails_sent_this_month(email_account=None):
 	"""Get count of emails sent from a specific email account.
@@ -130,7 +133,7 @@ def flush():
 
 	This should not be called outside of background jobs.
 	"""
-	from frappe.email.doctype.email_queue.email_queue import EmailQueue
+	from frappe.email.doctype.email_queue.email_queue import EmailQueue, can_send_in_bulk
 
 	# To avoid running jobs inside unit tests
 	if frappe.are_emails_muted():
@@ -144,20 +147,49 @@ def flush():
 		return
 
 	failed_email_queues = []
+
+	def on_failure(name):
+		failed_email_queues.append(name)
+		if (
+			len(failed_email_queues) / len(email_queue_batch) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
+			and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
+		):
+			frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+
+	# emails of SMTP accounts are sent over a pool of sessions of the account
+	bulk_queues: dict[str, tuple] = {}
 	for row in email_queue_batch:
 		try:
 			email_queue: EmailQueue = frappe.get_doc("Email Queue", row.name)
-			email_queue.send()
+			email_account = email_queue.get_email_account()
+			if can_send_in_bulk(email_account):
+				bulk_queues.setdefault(email_account.name, (email_account, []))[1].append(email_queue)
+			else:
+				email_queue.send()
 		except Exception:
 			frappe.get_doc("Email Queue", row.name).log_error()
-			failed_email_queues.append(row.name)
-
-			if (
-				len(failed_email_queues) / len(email_queue_batch)
-				> EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
-				and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
-			):
-				frappe.throw(_("Email Queue flushing aborted due to too many failures."))
+			on_failure(row.name)
+
+	for email_account, queues in bulk_queues.values():
+		send_queues_in_bulk(email_account, queues, on_failure)
+
+
+def send_queues_in_bulk(email_account, queues, on_failure):
+	"""Send emails of the account in batches, using up to `smtp_connections` sessions at once."""
+	from frappe.email.doctype.email_queue.email_queue import send_in_bulk
+	from frappe.email.smtp import SMTPConnectionPool
+
+	pool = SMTPConnectionPool(
+		email_account.sendmail_config(),
+		size=email_account.smtp_connections,
+		rate=email_account.emails_per_minute,
+	)
+	try:
+		for batch in create_batch(queues, EMAIL_QUEUE_BULK_SEND_BATCH_SIZE):
+			for name in send_in_bulk(batch, email_account, pool):
+				on_failure(name)
+	finally:
+		pool.close()
 
 
 def get_queue():
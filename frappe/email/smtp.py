@@ -2,7 +2,11 @@
 # License: MIT. See LICENSE
 
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from queue import SimpleQueue
 
 import frappe
 from frappe import _
@@ -135,3 +139,129 @@ class SMTPServer:
 			title=_("Invalid Credentials"),
 			exc=InvalidEmailCredentials,
 		)
+
+
+class SMTPConnectionPool:
+	"""Long-lived SMTP sessions of an email account, used to send emails from `size` threads at once.
+
+	Sessions are opened (and reopened after a failure) by `send_many` in the calling thread, since
+	login can need the database, e.g. for OAuth tokens. Threads only use opened sessions. At most
+	`rate` emails are sent per minute, if set."""
+
+	def __init__(self, smtp_config: dict, size: int = 1, rate: int = 0):
+		self.smtp_config = smtp_config
+		self.size = max(cint(size), 1)
+		self.interval = 60 / rate if rate else 0
+		self.servers: list[SMTPServer] = []
+		self.idle: SimpleQueue[SMTPServer] = SimpleQueue()
+		self.executor = None
+		self.lock = threading.Lock()
+		self.next_send_at = 0.0
+
+	def send_many(self, messages: list[tuple[str, str, bytes]]) -> list[Exception | None]:
+		"""Send (sender, recipient, message) tuples, return exception for each message that wasn't sent."""
+		if not messages:
+			return []
+
+		self.connect(min(self.size, len(messages)))
+		if not self.executor:
+			self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="smtp")
+
+		return list(self.executor.map(lambda args: self.send(*args), messages))
+
+	def connect(self, count: int) -> None:
+		"""Open sessions till `count` are usable, dropping the ones which were closed."""
+		self.servers = [server for server in self.servers if server.is_session_active()]
+		while len(self.servers) < count:
+			server = SMTPServer(**self.smtp_config)
+			server.session  # opens the session
+			self.servers.append(server)
+
+		self.idle = SimpleQueue()
+		for server in self.servers:
+			self.idle.put(server)
+
+	def send(self, sender: str, recipient: str, message: bytes) -> Exception | None:
+		server = self.idle.get()
+		try:
+			if not server._session:
+				raise smtplib.SMTPServerDisconnected("Connection lost while sending earlier email")
+
+			self.wait_for_turn()
+			sendmail_pipelined(server._session, sender, recipient, message)
+		except smtplib.SMTPServerDisconnected as e:
+			# reopened by next `connect`
+			server._session = None
+			return e
+		except smtplib.SMTPException as e:
+			# refused by the server, session can still be used
+			return e
+		except OSError as e:
+			server._session = None
+			return e
+		except Exception as e:
+			return e
+		finally:
+			self.idle.put(server)
+
+	def wait_for_turn(self) -> None:
+		if not self.interval:
+			return
+
+		with self.lock:
+			now = time.monotonic()
+			send_at = max(self.next_send_at, now)
+			self.next_send_at = send_at + self.interval
+
+		time.sleep(send_at - now)
+
+	def close(self) -> None:
+		if self.executor:
+			self.executor.shutdown()
+			self.executor = None
+
+		for server in self.servers:
+			server.quit()
+
+		self.servers = []
+
+
+def sendmail_pipelined(session: smtplib.SMTP, sender: str, recipient: str, message: bytes | str) -> None:
+	"""Send message like `smtplib.SMTP.sendmail`, with MAIL, RCPT and DATA commands sent together if
+	the server supports pipelining (RFC 2920), saving two round trips per email."""
+	session.ehlo_or_helo_if_needed()
+	if not (session.has_extn("pipelining") and sender.isascii() and recipient.isascii()):
+		session.sendmail(sender, recipient, message)
+		return
+
+	session.send(
+		f"MAIL FROM:{smtplib.quoteaddr(sender)}\r\nRCPT TO:{smtplib.quoteaddr(recipient)}\r\nDATA\r\n"
+	)
+	mail_reply, rcpt_reply, data_reply = session.getreply(), session.getreply(), session.getreply()
+
+	if data_reply[0] == 354:
+		if mail_reply[0] != 250 or rcpt_reply[0] not in (250, 251):
+			# send an empty message to end the transaction
+			session.send(b".\r\n")
+			session.getreply()
+		else:
+			# same as `smtplib.SMTP.data`, after the DATA command
+			if isinstance(message, str):
+				message = smtplib._fix_eols(message).encode("ascii")
+			message = smtplib._quote_periods(message)
+			if not message.endswith(b"\r\n"):
+				message += b"\r\n"
+
+			session.send(message + b".\r\n")
+			code, response = session.getreply()
+			if code != 250:
+				session._rset()
+				raise smtplib.SMTPDataError(code, response)
+			return
+
+	session._rset()
+	if mail_reply[0] != 250:
+		raise smtplib.SMTPSenderRefused(*mail_reply, sender)
+	if rcpt_reply[0] not in (250, 251):
+		raise smtplib.SMTPRecipientsRefused({recipient: rcpt_reply})
+	raise smtplib.SMTPDataError(*data_reply)
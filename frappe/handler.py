@@ -1,6 +1,7 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import inspect
 import os
 from mimetypes import guess_type
 from typing import TYPE_CHECKING
@@ -12,6 +13,7 @@ import frappe.sessions
 import frappe.utils
 from frappe import _, is_whitelisted, ping
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.replica import is_replica_eligible
 from frappe.monitor import add_data_to_monitor
 from frappe.utils import cint
 from frappe.utils.csvutils import build_csv_response
@@ -82,7 +84,17 @@ def execute_cmd(cmd, from_async=False):
 		is_whitelisted(method)
 		is_valid_http_method(method)
 
-	return frappe.call(method, **frappe.form_dict)
+	if is_replica_eligible(method):
+		method = frappe.read_only()(method)
+
+	response = frappe.call(method, **frappe.form_dict)
+	if inspect.isawaitable(response):
+		# `async def` methods, see `frappe.asgi`
+		from frappe.asgi import run_coroutine
+
+		response = run_coroutine(response)
+
+	return response
 
 
 def run_server_script(server_script):
@@ -158,6 +158,7 @@ doc_events = {
 			"frappe.automation.doctype.assignment_rule.assignment_rule.update_due_date",
 			"frappe.core.doctype.user_type.user_type.apply_permissions_for_non_standard_user_type",
 			"frappe.core.doctype.permission_log.permission_log.make_perm_log",
+			"frappe.boot.clear_boot_sections_for",
 		],
 		"after_rename": "frappe.desk.notifications.clear_doctype_notifications",
 		"on_cancel": [
@@ -168,6 +169,8 @@ doc_events = {
 		"on_trash": [
 			"frappe.desk.notifications.clear_doctype_notifications",
 			"frappe.workflow.doctype.workflow_action.workflow_action.process_workflow_actions",
+			"frappe.boot.clear_boot_sections_for",
+			"frappe.desk.form.load.clear_docinfo_version",
 		],
 		"on_update_after_submit": [
 			"frappe.workflow.doctype.workflow_action.workflow_action.process_workflow_actions",
@@ -178,6 +181,7 @@ doc_events = {
 		"on_change": [
 			"frappe.social.doctype.energy_point_rule.energy_point_rule.process_energy_points",
 			"frappe.automation.doctype.milestone_tracker.milestone_tracker.evaluate_milestone",
+			"frappe.desk.form.load.clear_docinfo_version",
 		],
 		"after_delete": ["frappe.core.doctype.permission_log.permission_log.make_perm_log"],
 	},
@@ -229,6 +233,7 @@ scheduler_events = {
 	"all": [
 		"frappe.email.queue.flush",
 		"frappe.monitor.flush",
+		"frappe.sessions.flush_session_updates",
 		"frappe.automation.doctype.reminder.reminder.send_reminders",
 	],
 	"hourly": [
@@ -3,6 +3,8 @@
 import datetime
 import json
 import weakref
+from collections import defaultdict
+from collections.abc import Iterable
 from functools import cached_property
 from typing import TYPE_CHECKING, TypeVar
 
@@ -41,6 +43,9 @@ if TYPE_CHECKING:
 D = TypeVar("D", bound="Document")
 
 
+# upper bound on rows in a single multi-row INSERT statement
+INSERT_BATCH_SIZE = 500
+
 max_positive_value = {"smallint": 2**15 - 1, "int": 2**31 - 1, "bigint": 2**63 - 1}
 
 DOCTYPE_TABLE_FIELDS = [
@@ -562,27 +567,13 @@ class BaseDocument:
 		                                        at database level (postgres)
 		                                        in python (mariadb)
 		"""
-		if not self.name:
-			# name will be set by document class in most cases
-			set_new_name(self)
-
 		conflict_handler = ""
 		# On postgres we can't implcitly ignore PK collision
 		# So instruct pg to ignore `name` field conflicts
 		if ignore_if_duplicate and frappe.db.db_type == "postgres":
 			conflict_handler = "on conflict (name) do nothing"
 
-		if not self.creation:
-			self.creation = self.modified = now()
-			self.owner = self.modified_by = frappe.session.user
-
-		# if doctype is "DocType", don't insert null values as we don't know who is valid yet
-		d = self.get_valid_dict(
-			convert_dates_to_str=True,
-			ignore_nulls=self.doctype in DOCTYPES_FOR_DOCTYPE,
-			ignore_virtual=True,
-		)
-
+		d = self._get_insert_dict()
 		columns = list(d)
 		try:
 			frappe.db.sql(
@@ -623,6 +614,23 @@ class BaseDocument:
 
 		self.set("__islocal", False)
 
+	def _get_insert_dict(self) -> dict:
+		"""Set name and standard fields if not set, return values to be inserted."""
+		if not self.name:
+			# name will be set by document class in most cases
+			set_new_name(self)
+
+		if not self.creation:
+			self.creation = self.modified = now()
+			self.owner = self.modified_by = frappe.session.user
+
+		# if doctype is "DocType", don't insert null values as we don't know who is valid yet
+		return self.get_valid_dict(
+			convert_dates_to_str=True,
+			ignore_nulls=self.doctype in DOCTYPES_FOR_DOCTYPE,
+			ignore_virtual=True,
+		)
+
 	def db_update(self):
 		if self.get("__islocal") or not self.name:
 			self.db_insert()
@@ -1324,6 +1332,76 @@ class BaseDocument:
 				extract_images_from_doc(self, df.fieldname)
 
 
+def db_insert_many(docs: Iterable[BaseDocument]) -> None:
+	"""INSERT documents using one multi-row statement per doctype and set of columns.
+
+	Documents whose controller overrides `db_insert` are inserted individually. If a statement
+	fails due to a duplicate, its rows are inserted one by one so that `db_insert` can retry
+	hash collisions and raise the usual errors.
+	"""
+	groups = defaultdict(list)
+	for doc in docs:
+		if type(doc).db_insert is not BaseDocument.db_insert:
+			doc.db_insert()
+			continue
+
+		d = doc._get_insert_dict()
+		groups[(doc.doctype, tuple(d))].append((doc, tuple(d.values())))
+
+	# leave headroom for escaping and multi-byte characters
+	max_size = frappe.db.get_max_statement_size() // 4
+
+	for (doctype, columns), rows in groups.items():
+		chunk, size = [], 0
+		for row in rows:
+			row_size = sum(len(cstr(value)) + 4 for value in row[1])
+			if chunk and (len(chunk) >= INSERT_BATCH_SIZE or size + row_size > max_size):
+				_insert_rows(doctype, columns, chunk)
+				chunk, size = [], 0
+
+			chunk.append(row)
+			size += row_size
+
+		_insert_rows(doctype, columns, chunk)
+
+
+def _insert_rows(doctype: str, columns: tuple[str, ...], rows: list[tuple[BaseDocument, tuple]]) -> None:
+	if len(rows) == 1:
+		rows[0][0].db_insert()
+		return
+
+	placeholders = "({})".format(", ".join(["%s"] * len(columns)))
+	query = "INSERT INTO `tab{doctype}` ({columns}) VALUES {values}".format(
+		doctype=doctype,
+		columns=", ".join("`" + c + "`" for c in columns),
+		values=", ".join([placeholders] * len(rows)),
+	)
+
+	# a failed statement aborts the whole transaction on postgres
+	save_point = "db_insert_many" if frappe.db.db_type == "postgres" else None
+	if save_point:
+		frappe.db.savepoint(save_point)
+
+	try:
+		frappe.db.sql(query, [value for _, values in rows for value in values])
+	except Exception as e:
+		if not (frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)):
+			raise
+
+		if save_point:
+			frappe.db.rollback(save_point=save_point)
+
+		for doc, _ in rows:
+			doc.db_insert()
+		return
+
+	if save_point:
+		frappe.db.release_savepoint(save_point)
+
+	for doc, _ in rows:
+		doc.set("__islocal", False)
+
+
 def _filter(data, filters, limit=None):
 	"""pass filters as:
 	{"key": "val", "key": ["!=", "val"],
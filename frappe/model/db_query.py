@@ -6,7 +6,7 @@ import copy
 import datetime
 import json
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 from collections.abc import Sequence
 
 import frappe
@@ -15,6 +15,7 @@ import frappe.permissions
 import frappe.share
 from frappe import _
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database import query_cache
 from frappe.database.utils import DefaultOrderBy, FallBackDateTimeStr, NestedSetHierarchy
 from frappe.model import get_permitted_fields, optional_fields
 from frappe.model.meta import get_table_columns
@@ -47,6 +48,12 @@ STRICT_UNION_PATTERN = re.compile(r".*\s(union).*\s")
 ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 
+# Compiled queries of each site in this process, see `DatabaseQuery.prepare_args`
+_COMPILED_QUERIES: dict[str, tuple[str, OrderedDict]] = {}
+COMPILED_QUERY_CACHE_SIZE = 1024
+# variants of tables, order by and group by kept for each compiled query
+COMPILED_SELECT_CACHE_SIZE = 16
+
 
 class DatabaseQuery:
 	def __init__(self, doctype, user=None):
@@ -109,6 +116,8 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		cache=False,
+		as_iterator=False,
 	) -> list:
 		if not ignore_permissions:
 			self.check_read_permission(self.doctype, parent_doctype=parent_doctype)
@@ -158,6 +167,8 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.cache = cache
+		self.as_iterator = as_iterator
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -192,6 +203,13 @@ class DatabaseQuery:
 
 		result = self.build_and_run()
 
+		if as_iterator:
+			if save_user_settings:
+				self.save_user_settings_fields = save_user_settings_fields
+				self.update_user_settings()
+
+			return (d[pluck] for d in result) if pluck else result
+
 		if sbool(with_comment_count) and not as_list and self.doctype:
 			self.add_comment_count(result)
 
@@ -231,9 +249,21 @@ class DatabaseQuery:
 			{order_by}
 			{limit}""".format(**args)
 
+		if self.cache and self.run and not self.as_iterator and query_cache.is_enabled():
+			return query_cache.sql(
+				query,
+				cache=self.cache,
+				as_dict=not self.as_list,
+				debug=self.debug,
+				update=self.update,
+				ignore_ddl=self.ignore_ddl,
+			)
+
 		return frappe.db.sql(
 			query,
 			as_dict=not self.as_list,
+			as_list=self.as_iterator and self.as_list,
+			as_iterator=self.as_iterator,
 			debug=self.debug,
 			update=self.update,
 			ignore_ddl=self.ignore_ddl,
@@ -241,19 +271,39 @@ class DatabaseQuery:
 		)
 
 	def prepare_args(self):
-		self.parse_args()
-		self.sanitize_fields()
-		self.extract_tables()
+		# Parsing fields, order by and group by doesn't depend on filter values, so the result is
+		# reused for queries with same fields, tables and permissions. See `get_compiled_queries`.
+		compiled = None
+		if key := self.get_compiled_query_key():
+			queries = get_compiled_queries()
+			compiled = queries.get(key)
+
+		if compiled:
+			queries.move_to_end(key)
+			self.load_compiled_query(compiled)
+			self.parse_filters()
+		else:
+			self.parse_args()
+			self.sanitize_fields()
+			self.extract_tables()
+			if key:
+				compiled = queries[key] = self.compile_query()
+				if len(queries) > COMPILED_QUERY_CACHE_SIZE:
+					queries.popitem(last=False)
+
 		self.set_optional_columns()
 		self.build_conditions()
-		self.apply_fieldlevel_read_permissions()
 
 		args = frappe._dict()
 
-		if self.with_childnames:
-			for t in self.tables:
-				if t != f"`tab{self.doctype}`":
-					self.fields.append(f"{t}.name as '{t[4:-1]}:name'")
+		select_key = (tuple(self.tables), self.order_by, self.group_by)
+		if compiled and (select := compiled.select.get(select_key)):
+			fields, args.fields, args.order_by, args.group_by = select
+			self.fields = list(fields)
+		else:
+			self.build_select(args)
+			if compiled and len(compiled.select) < COMPILED_SELECT_CACHE_SIZE:
+				compiled.select[select_key] = (tuple(self.fields), args.fields, args.order_by, args.group_by)
 
 		# query dict
 		args.tables = self.tables[0]
@@ -275,6 +325,17 @@ class DatabaseQuery:
 		if self.or_conditions:
 			args.conditions += (" or " if args.conditions else "") + " or ".join(self.or_conditions)
 
+		return args
+
+	def build_select(self, args):
+		"""Set fields, order by and group by clauses in args."""
+		self.apply_fieldlevel_read_permissions()
+
+		if self.with_childnames:
+			for t in self.tables:
+				if t != f"`tab{self.doctype}`":
+					self.fields.append(f"{t}.name as '{t[4:-1]}:name'")
+
 		self.set_field_tables()
 		self.cast_name_fields()
 
@@ -311,7 +372,48 @@ class DatabaseQuery:
 		self.validate_order_by_and_group_by(self.group_by)
 		args.group_by = self.group_by and (" group by " + self.group_by) or ""
 
-		return args
+	def get_compiled_query_key(self) -> tuple | None:
+		if isinstance(self.fields, str):
+			fields = self.fields
+		elif all(isinstance(field, str) for field in self.fields):
+			fields = tuple(self.fields)
+		else:
+			return None
+
+		ignore_permissions = bool(self.flags.ignore_permissions)
+		return (
+			self.doctype,
+			fields,
+			self.as_list,
+			self.strict,
+			self.with_childnames,
+			self.parent_doctype,
+			ignore_permissions,
+			None if ignore_permissions else tuple(sorted(frappe.get_roles(self.user))),
+		)
+
+	def compile_query(self) -> frappe._dict:
+		"""Return parsed fields and the tables they need, to be reused by `load_compiled_query`."""
+		return frappe._dict(
+			fields=tuple(self.fields),
+			tables=tuple(self.tables),
+			link_tables=tuple(self.link_tables),
+			linked_table_aliases=dict(self.linked_table_aliases),
+			linked_table_counter=Counter(self.linked_table_counter),
+			doctypes=tuple(self.permission_map),
+			select={},
+		)
+
+	def load_compiled_query(self, compiled: frappe._dict):
+		self.fields = list(compiled.fields)
+		self.tables = list(compiled.tables)
+		self.link_tables = [frappe._dict(table) for table in compiled.link_tables]
+		self.linked_table_aliases = dict(compiled.linked_table_aliases)
+		self.linked_table_counter = Counter(compiled.linked_table_counter)
+
+		# permissions are checked on every call, only the result of parsing is reused
+		for doctype in compiled.doctypes:
+			self.check_read_permission(doctype)
 
 	def prepare_select_args(self, args):
 		order_field = ORDER_BY_PATTERN.sub("", args.order_by)
@@ -328,6 +430,10 @@ class DatabaseQuery:
 
 	def parse_args(self):
 		"""Convert fields and filters from strings to list, dicts."""
+		self.parse_fields()
+		self.parse_filters()
+
+	def parse_fields(self):
 		if isinstance(self.fields, str):
 			if self.fields == "*":
 				self.fields = ["*"]
@@ -362,6 +468,7 @@ class DatabaseQuery:
 					field = f"{field} as {alias}"
 				self.fields[self.fields.index(original_field)] = field
 
+	def parse_filters(self):
 		for filter_name in ["filters", "or_filters"]:
 			filters = getattr(self, filter_name)
 			if isinstance(filters, str):
@@ -1167,6 +1274,21 @@ class DatabaseQuery:
 		update_user_settings(self.doctype, user_settings)
 
 
+def get_compiled_queries() -> OrderedDict:
+	"""Return compiled queries of current site.
+
+	Compiled queries depend on meta of doctypes, they are dropped when doctype cache is cleared."""
+	version = frappe.cache.get_value(
+		"compiled_query_version", generator=lambda: frappe.generate_hash(length=10)
+	)
+	site_version, queries = _COMPILED_QUERIES.get(frappe.local.site, (None, None))
+	if site_version != version:
+		queries = OrderedDict()
+		_COMPILED_QUERIES[frappe.local.site] = (version, queries)
+
+	return queries
+
+
 def cast_name(column: str) -> str:
 	"""Casts name field to varchar for postgres
 
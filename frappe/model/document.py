@@ -18,13 +18,13 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import BaseDocument, db_insert_many, get_controller
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype, simple_singledispatch
 from frappe.model.workflow import set_workflow_state_on_action, validate_workflow
 from frappe.types import DF, DocRef
-from frappe.utils import compare, cstr, date_diff, file_lock, flt, now
+from frappe.utils import compare, create_batch, cstr, date_diff, file_lock, flt, now
 from frappe.utils.data import get_absolute_url, get_datetime, get_timedelta, getdate
 from frappe.utils.global_search import update_global_search
 
@@ -36,6 +36,7 @@ if TYPE_CHECKING:
 
 DOCUMENT_LOCK_EXPIRTY = 12 * 60 * 60  # All locks expire in 12 hours automatically
 DOCUMENT_LOCK_SOFT_EXPIRY = 60 * 60  # Let users force-unlock after 60 minutes
+DOCS_BATCH_SIZE = 1000  # Max names per IN query when loading documents in bulk
 
 
 @simple_singledispatch
@@ -107,6 +108,86 @@ def get_doc_from_dict(data: dict[str, Any], **kwargs) -> "Document":
 	raise ImportError(data["doctype"])
 
 
+def get_docs(doctype: str, names: Iterable[str], *, for_update: bool = False) -> list["Document"]:
+	"""Load multiple documents of `doctype`, in the same order as `names`.
+
+	Parents are fetched with one query and each child table with one query for all parents
+	(per batch of `DOCS_BATCH_SIZE` names). Names that don't exist are skipped. Singles,
+	virtual doctypes and controllers that override initialization or loading are loaded one
+	by one using `get_doc`."""
+	names = list(dict.fromkeys(names))
+	if not names:
+		return []
+
+	controller = get_controller(doctype)
+	meta = frappe.get_meta(doctype)
+	if (
+		meta.issingle
+		or meta.is_virtual
+		or controller.__init__ is not Document.__init__
+		or controller.load_from_db is not Document.load_from_db
+		or controller.load_children_from_db is not Document.load_children_from_db
+	):
+		return [
+			get_doc(doctype, name, for_update=for_update) for name in names if frappe.db.exists(doctype, name)
+		]
+
+	docs = {}
+	for batch in create_batch(names, DOCS_BATCH_SIZE):
+		docs.update((doc.name, doc) for doc in _load_docs_from_db(controller, meta, batch, for_update))
+
+	# names are case insensitive in MariaDB
+	docs_casefolded = {name.casefold(): doc for name, doc in docs.items()}
+	return [doc for name in names if (doc := docs.get(name) or docs_casefolded.get(name.casefold()))]
+
+
+def _load_docs_from_db(controller, meta, names, for_update):
+	doctype = meta.name
+	rows = frappe.db.get_values(
+		doctype, {"name": ("in", names)}, "*", as_dict=True, order_by=None, for_update=for_update
+	)
+	if not rows:
+		return []
+
+	table_fields = meta.get_table_fields()
+	parents = [row.name for row in rows]
+	children = {}
+	for df in table_fields:
+		# see `load_children_from_db` for why documents having `module` are excluded
+		if "module" not in rows[0] and is_virtual_doctype(df.options):
+			continue
+
+		for child in frappe.db.get_values(
+			df.options,
+			{"parent": ("in", parents), "parenttype": doctype, "parentfield": df.fieldname},
+			"*",
+			as_dict=True,
+			order_by="idx asc",
+			for_update=for_update,
+		):
+			children.setdefault((child.parent, df.fieldname), []).append(child)
+
+	docs = []
+	for row in rows:
+		# same as `Document.__init__` followed by `load_from_db`, but using already fetched values
+		doc = controller.__new__(controller)
+		doc.doctype = doctype
+		doc.name = row.name
+		doc.flags = frappe._dict(for_update=for_update, ignore_children=True)
+		BaseDocument.__init__(doc, row)
+		doc.flags.pop("ignore_children", None)
+
+		for df in table_fields:
+			doc.set(df.fieldname, children.get((doc.name, df.fieldname), []))
+
+		if hasattr(doc, "__setup__"):
+			doc.__setup__()
+
+		docs.append(doc)
+
+	return docs
+
+
 @contextmanager
 def read_only_document(context=None):
 	# Store original methods
@@ -396,8 +477,7 @@ class Document(BaseDocument, DocRef):
 
 		# children
 		if not getattr(self.meta, "is_virtual", False):
-			for d in self.get_all_children():
-				d.db_insert()
+			db_insert_many(self.get_all_children())
 
 		self.run_method("after_insert")
 		self.flags.in_insert = True
@@ -544,10 +624,16 @@ class Document(BaseDocument, DocRef):
 
 			qry.run()
 
-		# update / insert
+		# update existing rows, insert new ones in bulk
+		new_rows = []
 		for d in all_rows:
 			d: Document
-			d.db_update()
+			if (d.get("__islocal") or not d.name) and type(d).db_update is BaseDocument.db_update:
+				new_rows.append(d)
+			else:
+				d.db_update()
+
+		db_insert_many(new_rows)
 
 	def get_doc_before_save(self) -> "Self":
 		return getattr(self, "_doc_before_save", None)
@@ -83,6 +83,10 @@ class Monitor:
 			self.data.job.method = kwargs["job_type"]
 			self.data.job.scheduled = True
 
+		if job_context := getattr(frappe.local, "job", None):
+			self.data.job.setup = job_context.get("setup", 0)
+			self.data.job.reused_context = job_context.get("reused_context", False)
+
 		if job := rq.get_current_job():
 			self.data.uuid = job.id
 			waitdiff = self.data.timestamp - job.enqueued_at.replace(tzinfo=pytz.UTC)
@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+	"""Documents cached before the per-doctype index existed aren't cleared with their doctype."""
+	frappe.cache.delete_keys("document_cache::")
@@ -261,6 +261,7 @@ frappe.ui.form.Sidebar = class {
 	reload_docinfo(callback) {
 		frappe.call({
 			method: "frappe.desk.form.load.get_docinfo",
+			type: "GET",
 			args: {
 				doctype: this.frm.doctype,
 				name: this.frm.docname,
@@ -78,10 +78,16 @@ def patch_query_execute():
 	executing the query object
 	"""
 
-	def execute_query(query, *args, **kwargs):
+	def execute_query(query, *args, cache=False, **kwargs):
+		from frappe.database import query_cache
+		from frappe.database.utils import is_query_type
+
 		child_queries = query._child_queries if isinstance(query._child_queries, list) else []
 		query, params = prepare_query(query)
-		result = frappe.db.sql(query, params, *args, **kwargs)  # nosemgrep
+		if cache and not args and query_cache.is_enabled() and is_query_type(query, "select"):
+			result = query_cache.sql(query, params, cache, **kwargs)
+		else:
+			result = frappe.db.sql(query, params, *args, **kwargs)  # nosemgrep
 		execute_child_queries(child_queries, result)
 		return result
 
@@ -1,7 +1,37 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+"""
+Rate limiting of requests.
+
+`RateLimiter` limits the time spent on all requests of a site within a fixed window, configured
+using `rate_limit` in site config: `{"limit": <seconds>, "window": <seconds>}`.
+
+`KeyedRateLimiter` limits requests per client, configured using `rate_limits` in site config:
+
+	"rate_limits": [
+		{"key": "ip", "limit": 600, "window": 60},
+		{"key": ["user", "method"], "limit": 50, "window": 10, "methods": ["frappe.client.get_list"]},
+		{"key": "api_key", "limit": 100, "window": 60, "algorithm": "token_bucket"},
+		{"key": "user", "limit": 1000, "window": 3600, "cost": "app.utils.get_request_cost"}
+	]
+
+- `key`: one or more of "ip", "user", "api_key" and "method" (the whitelisted method being
+  called). A rule is skipped for requests where any of these is unknown (e.g. api_key for
+  requests authenticated using session cookie).
+- `limit`: requests (or cost) allowed in `window` seconds.
+- `algorithm`: "sliding_window" (default) or "token_bucket", which allows bursts of `limit`
+  requests and refills at `limit / window` per second.
+- `methods`: whitelisted methods the rule applies to, all by default.
+- `cost`: cost of a request, a number or dotted path to a function that gets the rule and
+  returns the cost. Defaults to 1.
+
+All rules are checked and updated with a single Lua script, so a request costs one round trip to
+Redis. Rejected requests don't consume anything.
+"""
 
 import datetime
+import math
+import time
 from collections.abc import Callable
 from functools import wraps
 
@@ -20,14 +50,43 @@ def apply():
 		frappe.local.rate_limiter.apply()
 
 
+def apply_rules():
+	"""Apply per-client rate limits, after the request is authenticated."""
+	if rules := frappe.conf.rate_limits:
+		frappe.local.keyed_rate_limiter = KeyedRateLimiter(rules)
+		frappe.local.keyed_rate_limiter.apply()
+
+
+def apply_rules_to_call(method: str | None):
+	"""Apply per-client rate limits to a call made within the request, e.g. a call of a batch."""
+	if rules := frappe.conf.rate_limits:
+		KeyedRateLimiter(rules, method=method).apply()
+
+
 def update():
 	if hasattr(frappe.local, "rate_limiter"):
 		frappe.local.rate_limiter.update()
 
 
 def respond():
-	if hasattr(frappe.local, "rate_limiter"):
-		return frappe.local.rate_limiter.respond()
+	for limiter in get_limiters():
+		if response := limiter.respond():
+			return response
+
+
+def headers() -> dict:
+	headers = {}
+	for limiter in get_limiters():
+		headers.update(limiter.headers())
+	return headers
+
+
+def get_limiters() -> list:
+	return [
+		limiter
+		for attr in ("rate_limiter", "keyed_rate_limiter")
+		if (limiter := getattr(frappe.local, attr, None))
+	]
 
 
 class RateLimiter:
@@ -88,6 +147,183 @@ class RateLimiter:
 			return Response(_("Too Many Requests"), status=429)
 
 
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+
+# KEYS: one bucket per rule. ARGV: current time, then algorithm, limit, window and cost of each rule.
+# Returns whether the request is allowed, followed by remaining limit and seconds till reset of each
+# rule. Numbers are returned as strings as Redis truncates Lua numbers to integers.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local allowed = 1
+local result = {}
+local updates = {}
+
+for i, key in ipairs(KEYS) do
+	local offset = 2 + (i - 1) * 4
+	local algorithm = ARGV[offset]
+	local limit = tonumber(ARGV[offset + 1])
+	local window = tonumber(ARGV[offset + 2])
+	local cost = tonumber(ARGV[offset + 3])
+	local remaining, reset
+
+	if algorithm == "token_bucket" then
+		local bucket = redis.call("HMGET", key, "tokens", "ts")
+		local rate = limit / window
+		local tokens = tonumber(bucket[1]) or limit
+		local ts = tonumber(bucket[2]) or now
+		tokens = math.min(limit, tokens + math.max(now - ts, 0) * rate)
+		remaining = tokens - cost
+		reset = (limit - math.max(remaining, 0)) / rate
+		updates[i] = {{"tokens", remaining, "ts", now}, math.ceil(window)}
+	else
+		-- approximate sliding window: count of previous window weighted by its overlap with the
+		-- sliding window, plus count of current window
+		local current = math.floor(now / window)
+		local bucket = redis.call("HMGET", key, "window", "count", "previous")
+		local count = tonumber(bucket[2]) or 0
+		local previous = tonumber(bucket[3]) or 0
+		if tonumber(bucket[1]) ~= current then
+			previous = (tonumber(bucket[1]) == current - 1) and count or 0
+			count = 0
+		end
+		local elapsed = now / window - current
+		remaining = limit - previous * (1 - elapsed) - count - cost
+		reset = (current + 1) * window - now
+		updates[i] = {{"window", current, "count", count + cost, "previous", previous}, math.ceil(window * 2)}
+	end
+
+	if remaining < 0 then
+		allowed = 0
+	end
+	table.insert(result, tostring(remaining))
+	table.insert(result, tostring(reset))
+end
+
+if allowed == 1 then
+	for i, key in ipairs(KEYS) do
+		redis.call("HSET", key, unpack(updates[i][1]))
+		redis.call("EXPIRE", key, updates[i][2])
+	end
+end
+
+table.insert(result, 1, allowed)
+return result
+"""
+
+_rate_limit_script = None
+
+
+def consume(buckets: list[tuple[str, frappe._dict, float]]) -> tuple[bool, list[tuple[float, float]]]:
+	"""Consume `cost` from each bucket if all of them have enough limit left.
+
+	:param buckets: List of (key, rule, cost), rule has `limit`, `window` and `algorithm`.
+	Return whether the request is allowed and (remaining limit, seconds till reset) of each bucket.
+	"""
+	global _rate_limit_script
+
+	if _rate_limit_script is None or _rate_limit_script.registered_client is not frappe.cache:
+		_rate_limit_script = frappe.cache.register_script(RATE_LIMIT_SCRIPT)
+
+	args = [time.time()]
+	for _key, rule, cost in buckets:
+		args.extend((rule.algorithm or SLIDING_WINDOW, rule.limit, rule.window, cost))
+
+	allowed, *result = _rate_limit_script(keys=[frappe.cache.make_key(key) for key, *_ in buckets], args=args)
+	stats = [(float(result[i]), float(result[i + 1])) for i in range(0, len(result), 2)]
+	return bool(allowed), stats
+
+
+class KeyedRateLimiter:
+	"""Rate limits per user, API key, IP and whitelisted method, see module docstring."""
+
+	def __init__(self, rules: list[dict], method: str | None = None):
+		self.rules = [frappe._dict(rule) for rule in rules]
+		# whitelisted method being called, of the request by default
+		self.method = method
+		self.rejected = False
+		self.stats = []
+
+	def apply(self):
+		buckets = []
+		for i, rule in enumerate(self.rules):
+			identity = self.get_identity(rule)
+			if identity is None:
+				continue
+
+			buckets.append((f"rl:rule:{i}:{identity}", rule, self.get_cost(rule)))
+
+		if not buckets:
+			return
+
+		allowed, stats = consume(buckets)
+		self.stats = [(rule, *stat) for (_key, rule, _cost), stat in zip(buckets, stats, strict=True)]
+		if not allowed:
+			self.rejected = True
+			self.reject()
+
+	def get_identity(self, rule: frappe._dict) -> str | None:
+		method = self.method or get_whitelisted_method()
+		if rule.methods and method not in rule.methods:
+			return None
+
+		values = {
+			"ip": getattr(frappe.local, "request_ip", None),
+			"user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+			"api_key": getattr(frappe.local, "api_key", None),
+			"method": method,
+		}
+
+		keys = [rule.key] if isinstance(rule.key, str) else rule.key or ["ip"]
+		identity = []
+		for key in keys:
+			if not (value := values[key]):
+				return None
+			identity.append(f"{key}={value}")
+
+		return ":".join(identity)
+
+	def get_cost(self, rule: frappe._dict) -> float:
+		if isinstance(rule.cost, str):
+			return float(frappe.get_attr(rule.cost)(rule))
+
+		return 1 if rule.cost is None else float(rule.cost)
+
+	def reject(self):
+		raise frappe.TooManyRequestsError
+
+	def headers(self):
+		if not self.stats:
+			return {}
+
+		# report the rule closest to its limit
+		rule, remaining, reset = min(self.stats, key=lambda stat: stat[1] / stat[0].limit)
+		headers = {
+			"X-RateLimit-Reset": math.ceil(reset),
+			"X-RateLimit-Limit": rule.limit,
+			"X-RateLimit-Remaining": max(math.floor(remaining), 0),
+		}
+		if self.rejected:
+			headers["Retry-After"] = math.ceil(reset)
+
+		return headers
+
+	def respond(self):
+		if self.rejected:
+			return Response(_("Too Many Requests"), status=429)
+
+
+def get_whitelisted_method() -> str | None:
+	"""Return whitelisted method being called by current request."""
+	if cmd := frappe.form_dict.cmd:
+		return cmd
+
+	path = frappe.request.path if frappe.request else ""
+	for prefix in ("/api/method/", "/api/v1/method/", "/api/v2/method/"):
+		if path.startswith(prefix):
+			return path.removeprefix(prefix).strip("/")
+
+
 def rate_limit(
 	key: str | None = None,
 	limit: int | Callable = 5,
@@ -138,14 +374,9 @@ def rate_limit(
 			if not identity:
 				frappe.throw(_("Either key or IP flag is required."))
 
-			cache_key = frappe.cache.make_key(f"rl:{frappe.form_dict.cmd}:{identity}")
-
-			value = frappe.cache.get(cache_key)
-			if not value:
-				frappe.cache.setex(cache_key, seconds, 0)
-
-			value = frappe.cache.incrby(cache_key, 1)
-			if value > _limit:
+			rule = frappe._dict(limit=_limit, window=seconds, algorithm=SLIDING_WINDOW)
+			allowed, _stats = consume([(get_rate_limit_key(fn, identity), rule, 1)])
+			if not allowed:
 				frappe.throw(
 					_("You hit the rate limit because of too many requests. Please try after sometime."),
 					frappe.RateLimitExceededError,
@@ -156,3 +387,12 @@ def rate_limit(
 		return wrapper
 
 	return ratelimit_decorator
+
+
+def get_rate_limit_key(fn: Callable, identity: str) -> str:
+	return f"rl:{fn.__module__}.{fn.__qualname__}:{identity}"
+
+
+def clear_rate_limit(fn: Callable) -> None:
+	"""Reset limits of a function decorated with `rate_limit` for all identities."""
+	frappe.cache.delete_keys(get_rate_limit_key(fn, ""))
@@ -2,12 +2,18 @@
 # License: MIT. See LICENSE
 
 from contextlib import suppress
+from time import monotonic
 
 import redis
 
 import frappe
 from frappe.utils.data import cstr
 
+# only the latest of these events is sent for a document in a transaction
+COALESCED_EVENTS = ("doc_update", "list_update")
+DEFAULT_PROGRESS_RATE = 5  # progress events per second for a task
+MAX_BATCH_SIZE = 500  # events per published message
+
 
 def publish_progress(percent, title=None, doctype=None, docname=None, description=None, task_id=None):
 	publish_realtime(
@@ -70,23 +76,68 @@ def publish_realtime(
 			# This will be broadcasted to all Desk users
 			room = get_site_room()
 
+	if event == "progress" and not should_emit_progress(task_id or room, message):
+		return
+
 	if after_commit:
 		if not hasattr(frappe.local, "_realtime_log"):
-			frappe.local._realtime_log = []
+			frappe.local._realtime_log = {}
 			frappe.db.after_commit.add(flush_realtime_log)
 			frappe.db.after_rollback.add(clear_realtime_log)
 
-		params = [event, message, room]
-		if params not in frappe.local._realtime_log:
-			frappe.local._realtime_log.append(params)
+		# a repeated event replaces the earlier one and is sent in its place
+		key = get_coalescing_key(event, message, room)
+		frappe.local._realtime_log.pop(key, None)
+		frappe.local._realtime_log[key] = (event, message, room)
 	else:
 		emit_via_redis(event, message, room)
 
 
-def flush_realtime_log():
-	for args in frappe.local._realtime_log:
-		frappe.realtime.emit_via_redis(*args)
+def get_coalescing_key(event, message, room) -> tuple:
+	"""Return key of an event, events with the same key are sent only once per transaction."""
+	if event in COALESCED_EVENTS and isinstance(message, dict):
+		return (event, room, cstr(message.get("name")))
+
+	return (event, room, frappe.as_json(message, indent=None))
+
+
+def should_emit_progress(key, message) -> bool:
+	"""Throttle progress events of a task to `realtime_progress_rate` per second.
+
+	The first and the final progress events are always sent."""
+	if not hasattr(frappe.local, "_realtime_progress"):
+		frappe.local._realtime_progress = {}
+
+	last_emitted = frappe.local._realtime_progress
+	if is_progress_complete(message):
+		last_emitted.pop(key, None)
+		return True
+
+	now = monotonic()
+	rate = frappe.conf.realtime_progress_rate or DEFAULT_PROGRESS_RATE
+	if key in last_emitted and now - last_emitted[key] < 1 / rate:
+		return False
+
+	last_emitted[key] = now
+	return True
+
+
+def is_progress_complete(message) -> bool:
+	if not isinstance(message, dict):
+		return True
+
+	with suppress(TypeError, ValueError, IndexError):
+		if (percent := message.get("percent")) is not None:
+			return float(percent) >= 100
 
+		if progress := message.get("progress"):
+			return float(progress[0]) >= float(progress[1])
+
+	return True
+
+
+def flush_realtime_log():
+	emit_batch_via_redis(list(frappe.local._realtime_log.values()))
 	clear_realtime_log()
 
 
@@ -101,16 +152,35 @@ def emit_via_redis(event, message, room):
 	:param event: Event name, like `task_progress` etc.
 	:param message: JSON message object. For async must contain `task_id`
 	:param room: name of the room"""
+	publish_to_redis({"event": event, "message": message, "room": room, "namespace": frappe.local.site})
+
+
+def emit_batch_via_redis(events):
+	"""Publish multiple real-time updates via redis, up to `MAX_BATCH_SIZE` in one message
+
+	:param events: list of (event, message, room)"""
+	from frappe.utils import create_batch
+
+	if len(events) == 1:
+		return emit_via_redis(*events[0])
+
+	for batch in create_batch(events, MAX_BATCH_SIZE):
+		publish_to_redis(
+			{
+				"events": [
+					{"event": event, "message": message, "room": room} for event, message, room in batch
+				],
+				"namespace": frappe.local.site,
+			}
+		)
+
+
+def publish_to_redis(payload: dict):
 	from frappe.utils.background_jobs import get_redis_connection_without_auth
 
 	with suppress(redis.exceptions.ConnectionError):
 		r = get_redis_connection_without_auth()
-		r.publish(
-			"events",
-			frappe.as_json(
-				{"event": event, "message": message, "room": room, "namespace": frappe.local.site}
-			),
-		)
+		r.publish("events", frappe.as_json(payload))
 
 
 @frappe.whitelist(allow_guest=True)
@@ -19,11 +19,17 @@ import frappe.utils
 from frappe import _
 from frappe.apps import get_apps, get_default_path, is_desk_apps
 from frappe.cache_manager import clear_user_cache
-from frappe.query_builder import Order
+from frappe.query_builder import Case, Order
+from frappe.query_builder.functions import Cast_
 from frappe.utils import cint, cstr, get_assets_json
 from frappe.utils.change_log import has_app_update_notifications
 from frappe.utils.data import add_to_date
 
+# Session touches waiting to be written to `tabSessions`, used when `session_write_behind` is set in
+# site config. Keyed by sid, flushed in bulk by `flush_session_updates`.
+PENDING_SESSION_UPDATES = "pending_session_updates"
+SESSION_FLUSH_BATCH_SIZE = 500
+
 
 @frappe.whitelist()
 def clear():
@@ -98,6 +104,7 @@ def delete_session(sid=None, user=None, reason="Session Expired"):
 
 	frappe.cache.hdel("session", sid)
 	frappe.cache.hdel("last_db_session_update", sid)
+	frappe.cache.hdel(PENDING_SESSION_UPDATES, sid)
 
 
 def clear_all_sessions(reason=None):
@@ -120,13 +127,78 @@ def get_expired_sessions():
 
 def clear_expired_sessions():
 	"""This function is meant to be called from scheduler"""
+	# sessions touched recently may not have reached the database yet
+	flush_session_updates()
+
 	for sid in get_expired_sessions():
 		delete_session(sid, reason="Session Expired")
 
 
+def is_write_behind_enabled() -> bool:
+	return bool(frappe.conf.session_write_behind)
+
+
+def flush_session_updates():
+	"""Write session touches accumulated in cache to the database. Called from scheduler."""
+	key = frappe.cache.make_key(PENDING_SESSION_UPDATES)
+	try:
+		pipeline = frappe.cache.pipeline()
+		pipeline.hgetall(key)
+		pipeline.delete(key)
+		pending, _ = pipeline.execute()
+	except redis.exceptions.ConnectionError:
+		return
+
+	frappe.local.cache.pop(key, None)
+	if not pending:
+		return
+
+	updates = [frappe.cache.codec.loads(value) for value in pending.values()]
+	for start in range(0, len(updates), SESSION_FLUSH_BATCH_SIZE):
+		update_sessions_in_db(updates[start : start + SESSION_FLUSH_BATCH_SIZE])
+
+
+def update_sessions_in_db(updates: list[dict]):
+	"""Update `tabSessions` and last active time of users with one UPDATE query each."""
+	Sessions = frappe.qb.DocType("Sessions")
+	User = frappe.qb.DocType("User")
+
+	lastupdate, sessiondata = Case(), Case()
+	last_active = {}
+	for update in updates:
+		lastupdate = lastupdate.when(Sessions.sid == update["sid"], update["lastupdate"])
+		sessiondata = sessiondata.when(
+			Sessions.sid == update["sid"],
+			frappe.as_json(update["sessiondata"], indent=None, separators=(",", ":")),
+		)
+		last_active[update["user"]] = max(update["lastupdate"], last_active.get(update["user"], ""))
+
+	user_last_active = Case()
+	for user, timestamp in last_active.items():
+		user_last_active = user_last_active.when(User.name == user, timestamp)
+
+	if frappe.db.db_type == "postgres":
+		# CASE of string literals evaluates to text on postgres
+		lastupdate = Cast_(lastupdate, "timestamp")
+		user_last_active = Cast_(user_last_active, "timestamp")
+
+	(
+		frappe.qb.update(Sessions)
+		.set(Sessions.lastupdate, lastupdate)
+		.set(Sessions.sessiondata, sessiondata)
+		.where(Sessions.sid.isin([update["sid"] for update in updates]))
+	).run()
+
+	(
+		frappe.qb.update(User)
+		.set(User.last_active, user_last_active)
+		.where(User.name.isin(list(last_active)))
+	).run()
+
+
 def get():
 	"""get session boot info"""
-	from frappe.boot import get_bootinfo, get_unseen_notes
+	from frappe.boot import add_shared_sections, get_unseen_notes, get_user_bootinfo
 	from frappe.utils.change_log import get_change_log
 
 	bootinfo = None
@@ -139,7 +211,7 @@ def get():
 
 	if not bootinfo:
 		# if not create it
-		bootinfo = get_bootinfo()
+		bootinfo = get_user_bootinfo()
 		frappe.cache.hset("bootinfo", frappe.session.user, bootinfo)
 		try:
 			frappe.cache.ping()
@@ -154,6 +226,9 @@ def get():
 		if frappe.local.request:
 			bootinfo["change_log"] = get_change_log()
 
+	# sections that are the same for all users are cached separately
+	bootinfo = add_shared_sections(bootinfo)
+
 	bootinfo["metadata_version"] = frappe.cache.get_value("metadata_version")
 	if not bootinfo["metadata_version"]:
 		bootinfo["metadata_version"] = frappe.reset_metadata_version()
@@ -353,6 +428,9 @@ class Session:
 		return data and data.data
 
 	def get_session_data_from_db(self):
+		if is_write_behind_enabled() and (data := self.get_pending_session_data()):
+			return data
+
 		sessions = frappe.qb.DocType("Sessions")
 
 		record = (
@@ -371,6 +449,16 @@ class Session:
 
 		return data
 
+	def get_pending_session_data(self):
+		"""Return session data that hasn't been flushed to the database yet."""
+		pending = frappe.cache.hget(PENDING_SESSION_UPDATES, self.sid)
+		if not pending or cstr(pending["lastupdate"]) <= get_expired_threshold():
+			return None
+
+		data = frappe._dict(pending["sessiondata"])
+		data.user = pending["user"]
+		return data
+
 	def _delete_session(self):
 		delete_session(self.sid, reason="Session Expired")
 
@@ -398,21 +486,37 @@ class Session:
 		if (force or (time_diff is None) or (time_diff > 600)) and not frappe.flags.read_only:
 			self.data.data.last_updated = now
 			self.data.data.lang = str(frappe.lang)
-			# update sessions table
-			(
-				frappe.qb.update(Sessions)
-				.where(Sessions.sid == self.data["sid"])
-				.set(
-					Sessions.sessiondata,
-					frappe.as_json(self.data["data"], indent=None, separators=(",", ":")),
-				)
-				.set(Sessions.lastupdate, now)
-			).run()
-
-			frappe.db.set_value("User", frappe.session.user, "last_active", now, update_modified=False)
 
-			frappe.db.commit()
-			updated_in_db = True
+			if not force and is_write_behind_enabled():
+				# written to the database in bulk by `flush_session_updates`
+				frappe.cache.hset(
+					PENDING_SESSION_UPDATES,
+					self.sid,
+					{
+						"sid": self.sid,
+						"user": self.data.user,
+						"lastupdate": now,
+						"sessiondata": self.data["data"],
+					},
+				)
+			else:
+				# update sessions table
+				(
+					frappe.qb.update(Sessions)
+					.where(Sessions.sid == self.data["sid"])
+					.set(
+						Sessions.sessiondata,
+						frappe.as_json(self.data["data"], indent=None, separators=(",", ":")),
+					)
+					.set(Sessions.lastupdate, now)
+				).run()
+
+				frappe.db.set_value("User", frappe.session.user, "last_active", now, update_modified=False)
+
+				frappe.db.commit()
+				# older pending copy would overwrite this when flushed
+				frappe.cache.hdel(PENDING_SESSION_UPDATES, self.sid)
+				updated_in_db = True
 
 			frappe.cache.hset("last_db_session_update", self.sid, now)
 			frappe.cache.hset("session", self.sid, self.data)
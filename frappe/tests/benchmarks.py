@@ -0,0 +1,107 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Throughput benchmarks, not run as part of the test suite. Run them against a site using:
+
+	bench --site test_site execute frappe.tests.benchmarks.compare_asgi_throughput --kwargs "{'requests': 200}"
+	bench --site test_site execute frappe.tests.benchmarks.compare_smtp_throughput --kwargs "{'emails': 500}"
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.test import Client
+
+import frappe
+import frappe.app
+from frappe.asgi import ASGIApplication
+from frappe.email.smtp import SMTPConnectionPool, SMTPServer
+
+SMTP_MESSAGE = b"Subject: Benchmark\r\n\r\nHello\r\n"
+
+
+def compare_asgi_throughput(requests: int = 50, seconds: float = 0.1, workers: int = 1, clients: int = 32):
+	"""Print throughput of WSGI and ASGI for I/O-bound sync and async endpoints."""
+	from frappe.tests.test_asgi import get_path
+
+	results = {
+		"wsgi": run_wsgi_load(get_path("wait", seconds), requests, workers),
+		"asgi": run_asgi_load(get_path("wait", seconds), requests, clients),
+		"asgi (async def)": run_asgi_load(get_path("wait_async", seconds), requests, clients),
+	}
+
+	print_results(results, requests, "requests")
+	return results
+
+
+def run_wsgi_load(path: str, requests: int, workers: int = 1) -> float:
+	"""Return seconds taken to serve requests using `workers` sync workers."""
+
+	def request(_):
+		response = Client(frappe.app.application).get(path, headers={"X-Frappe-Site-Name": site})
+		assert response.status_code == 200, response.text
+
+	site = frappe.local.site
+	start = time.monotonic()
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		list(executor.map(request, range(requests)))
+
+	return time.monotonic() - start
+
+
+def run_asgi_load(path: str, requests: int, clients: int = 32) -> float:
+	"""Return seconds taken to serve requests from `clients` concurrent clients using ASGI."""
+	from frappe.tests.test_asgi import asgi_request
+
+	app = ASGIApplication(frappe.app.application)
+	site = frappe.local.site
+
+	async def request(limiter):
+		async with limiter:
+			messages = await asgi_request(app, path, site)
+
+		assert messages[0]["status"] == 200, messages
+
+	async def run():
+		limiter = asyncio.Semaphore(clients)
+		await asyncio.gather(*(request(limiter) for _ in range(requests)))
+
+	start = time.monotonic()
+	asyncio.run(run())
+	return time.monotonic() - start
+
+
+def compare_smtp_throughput(emails: int = 200, latency: float = 0.005, connections: int = 8):
+	"""Print emails sent per second to a local SMTP stub server, one by one and over pooled sessions."""
+	from frappe.tests.test_smtp_pool import SMTPStubServer
+
+	def send_one_by_one(config):
+		server = SMTPServer(**config)
+		for i in range(emails):
+			server.session.sendmail("sender@example.com", f"user{i}@example.com", SMTP_MESSAGE)
+		server.quit()
+
+	def send_pooled(config):
+		pool = SMTPConnectionPool(config, size=connections)
+		try:
+			pool.send_many(
+				[("sender@example.com", f"user{i}@example.com", SMTP_MESSAGE) for i in range(emails)]
+			)
+		finally:
+			pool.close()
+
+	results = {}
+	with SMTPStubServer(latency) as server:
+		for mode, send in (("one by one", send_one_by_one), (f"pooled ({connections})", send_pooled)):
+			start = time.monotonic()
+			send(server.config)
+			results[mode] = time.monotonic() - start
+
+	print_results(results, emails, "emails")
+	return results
+
+
+def print_results(results: dict[str, float], count: int, unit: str):
+	for mode, duration in results.items():
+		print(f"{mode:<20} {count / duration:8.1f} {unit}/s")
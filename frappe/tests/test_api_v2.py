@@ -255,6 +255,100 @@ class TestDocTypeAPIV2(FrappeAPITestCase):
 		self.assertIsInstance(response.json["data"], int)
 
 
+class TestBatchAPIV2(FrappeAPITestCase):
+	version = "v2"
+
+	def batch(self, requests, **kwargs):
+		return self.post(self.get_path("batch"), {"sid": self.sid, "requests": requests, **kwargs})
+
+	def test_batch(self):
+		description = frappe.mock("paragraph")
+		with suppress_stdout():
+			response = self.batch(
+				[
+					{"method": "POST", "path": "/document/ToDo", "body": {"description": description}},
+					{"path": '/document/ToDo?limit=1&fields=["description"]'},
+					{"path": "/document/ToDo/non-existent-todo"},
+					{"path": "/method/ping"},
+				]
+			)
+		self.assertEqual(response.status_code, 200)
+
+		created, listed, missing, ping = response.json["data"]
+		self.assertEqual(created["status"], 200)
+		self.assertEqual(created["data"]["description"], description)
+		self.assertIn("time", created)
+		self.assertTrue(frappe.db.exists("ToDo", created["data"]["name"]))
+
+		self.assertEqual(len(listed["data"]), 1)
+		self.assertEqual(missing["status"], 404)
+		self.assertEqual(missing["errors"][0]["type"], "DoesNotExistError")
+		self.assertEqual(ping["data"], "pong")
+
+	def test_atomic_batch(self):
+		description = frappe.generate_hash()
+		with suppress_stdout():
+			response = self.batch(
+				[
+					{"method": "POST", "path": "/document/ToDo", "body": {"description": description}},
+					{"method": "DELETE", "path": "/document/ToDo/non-existent-todo"},
+					{"path": "/method/ping"},
+				],
+				atomic=True,
+			)
+
+		created, failed, skipped = response.json["data"]
+		self.assertTrue(created["rolled_back"])
+		self.assertEqual(failed["status"], 404)
+		self.assertEqual(skipped["status"], 424)
+		self.assertFalse(frappe.db.exists("ToDo", {"description": description}))
+
+	def test_batch_rate_limits(self):
+		rules = [
+			{
+				"key": ["user", "method"],
+				"limit": 1,
+				"window": 1,
+				"methods": ["ping"],
+				"algorithm": "token_bucket",
+			}
+		]
+		update_site_config("rate_limits", rules)
+		self.addCleanup(update_site_config, "rate_limits", "None")
+
+		with suppress_stdout():
+			response = self.batch([{"path": "/method/ping"}, {"path": "/method/ping"}])
+
+		first, second = response.json["data"]
+		self.assertEqual(first["status"], 200)
+		self.assertEqual(second["status"], 429)
+
+	def test_batch_call_committing(self):
+		description = frappe.generate_hash()
+		with suppress_stdout():
+			response = self.batch(
+				[
+					{
+						"method": "POST",
+						"path": "/method/frappe.tests.test_api_v2.commit_and_fail",
+						"body": {"description": description},
+					},
+					{"path": "/method/ping"},
+				]
+			)
+
+		failed, ping = response.json["data"]
+		self.assertEqual(failed["status"], 417)
+		self.assertEqual(ping["data"], "pong")
+		# committed writes stay, writes made after the commit are undone
+		self.assertEqual(frappe.get_all("ToDo", {"description": description}, pluck="status"), ["Open"])
+
+	def test_batch_size_limit(self):
+		with suppress_stdout():
+			response = self.batch([{"path": "/method/ping"}] * 101)
+		self.assertEqual(response.status_code, 417)
+
+
 class TestReadOnlyMode(FrappeAPITestCase):
 	"""During migration if read only mode can be enabled.
 	Test if reads work well and writes are blocked"""
@@ -299,3 +393,11 @@ def test(*, fail=False, handled=True, message="Failed"):
 			1 / 0
 	else:
 		frappe.msgprint(message)
+
+
+@frappe.whitelist()
+def commit_and_fail(description):
+	frappe.get_doc(doctype="ToDo", description=description).insert()
+	frappe.db.commit()
+	frappe.get_doc(doctype="ToDo", description=description, status="Closed").insert()
+	frappe.throw("Failed")
@@ -0,0 +1,116 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Tests for the ASGI entry point. Its throughput is compared with WSGI by
+`frappe.tests.benchmarks.compare_asgi_throughput`.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from werkzeug.test import Client
+
+import frappe
+import frappe.app
+from frappe.asgi import ASGIApplication
+from frappe.tests import IntegrationTestCase
+from frappe.tests.test_api import make_request
+
+# these endpoints are open to guests, don't let them hold a worker for long
+MAX_WAIT = 1  # seconds
+
+
+@frappe.whitelist(allow_guest=True)
+def wait(seconds: float = 0.1):
+	"""I/O-bound endpoint, e.g. waiting for an external API."""
+	time.sleep(min(float(seconds), MAX_WAIT))
+	return frappe.session.user
+
+
+@frappe.whitelist(allow_guest=True)
+async def wait_async(seconds: float = 0.1):
+	await asyncio.sleep(min(float(seconds), MAX_WAIT))
+	return frappe.session.user
+
+
+async def asgi_request(app: ASGIApplication, path: str, site: str) -> list[dict]:
+	"""Make GET request to ASGI application, return messages sent in response."""
+	path, _, query_string = path.partition("?")
+	scope = {
+		"type": "http",
+		"method": "GET",
+		"path": path,
+		"query_string": query_string.encode(),
+		"http_version": "1.1",
+		"headers": [(b"host", b"localhost"), (b"x-frappe-site-name", site.encode())],
+	}
+	messages = []
+
+	async def receive():
+		return {"type": "http.request", "body": b""}
+
+	async def send(message):
+		messages.append(message)
+
+	await app(scope, receive, send)
+	return messages
+
+
+def get_path(method: str, seconds: float) -> str:
+	return f"/api/method/frappe.tests.test_asgi.{method}?seconds={seconds}"
+
+
+class TestASGI(IntegrationTestCase):
+	def test_request(self):
+		messages = self.request("/api/method/frappe.ping")
+		self.assertEqual(messages[0]["status"], 200)
+		self.assertEqual(
+			frappe.parse_json(b"".join(m.get("body", b"") for m in messages[1:])).message, "pong"
+		)
+
+	def test_async_method(self):
+		messages = self.request(get_path("wait_async", 0))
+		self.assertEqual(messages[0]["status"], 200)
+		self.assertEqual(
+			frappe.parse_json(b"".join(m.get("body", b"") for m in messages[1:])).message, "Guest"
+		)
+
+	def test_async_method_without_asgi(self):
+		client = Client(frappe.app.application)
+		response = make_request(target=client.get, args=(get_path("wait_async", 0),))
+		self.assertEqual(response.json["message"], "Guest")
+
+	def test_concurrent_requests(self):
+		app = ASGIApplication(frappe.app.application)
+
+		async def run():
+			return await asyncio.gather(
+				*(
+					asgi_request(app, get_path(method, 0.01), frappe.local.site)
+					for method in ("wait", "wait_async") * 8
+				)
+			)
+
+		for messages in asyncio.run(run()):
+			self.assertEqual(messages[0]["status"], 200)
+
+	def test_more_async_requests_than_threads(self):
+		app = ASGIApplication(frappe.app.application)
+		with patch(
+			"frappe.get_site_config", return_value=frappe._dict(asgi_threads=4, asgi_max_concurrency=2)
+		):
+			app.setup()
+		self.addCleanup(app.executor.shutdown)
+
+		async def run():
+			requests = (asgi_request(app, get_path("wait_async", 0.05), frappe.local.site) for _ in range(12))
+			# threads waiting for coroutines must not wait for the site's slots too
+			return await asyncio.wait_for(asyncio.gather(*requests), timeout=30)
+
+		for messages in asyncio.run(run()):
+			self.assertEqual(messages[0]["status"], 200)
+
+	def request(self, path):
+		app = ASGIApplication(frappe.app.application)
+		return asyncio.run(asgi_request(app, path, frappe.local.site))
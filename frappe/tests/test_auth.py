@@ -2,13 +2,20 @@
 # License: MIT. See LICENSE
 import datetime
 import time
+from unittest.mock import patch
 
 import requests
 
 import frappe
 from frappe.auth import LoginAttemptTracker
 from frappe.frappeclient import AuthError, FrappeClient
-from frappe.sessions import Session, get_expired_sessions, get_expiry_in_seconds
+from frappe.sessions import (
+	PENDING_SESSION_UPDATES,
+	Session,
+	flush_session_updates,
+	get_expired_sessions,
+	get_expiry_in_seconds,
+)
 from frappe.tests import IntegrationTestCase
 from frappe.tests.test_api import FrappeAPITestCase
 from frappe.utils import get_datetime, get_site_url, now
@@ -226,3 +233,47 @@ class TestSessionExpirty(FrappeAPITestCase):
 		with self.freeze_time(time_of_expiry):
 			self.assertIn(sid, get_expired_sessions())
 			self.assertFalse(s.get_session_data_from_db())
+
+
+class TestSessionWriteBehind(FrappeAPITestCase):
+	@patch.dict(frappe.conf, {"session_write_behind": 1})
+	def test_session_touch_is_flushed_in_bulk(self):
+		self.sid  # triggers login for test case login
+		s: Session = frappe.local.session_obj
+		frappe.cache.hdel("last_db_session_update", s.sid)
+		lastupdate = frappe.db.get_value("Sessions", {"sid": s.sid}, "lastupdate")
+
+		with self.freeze_time(add_to_date(now(), minutes=15, as_string=True)):
+			self.assertFalse(s.update())
+			touched_at = s.data.data.last_updated
+
+		# not written to the database till flushed, but still resumable
+		self.assertEqual(frappe.db.get_value("Sessions", {"sid": s.sid}, "lastupdate"), lastupdate)
+		self.assertEqual(s.get_session_data_from_db().user, "Administrator")
+
+		flush_session_updates()
+		self.assertFalse(frappe.cache.hget(PENDING_SESSION_UPDATES, s.sid))
+		self.assertEqual(
+			frappe.db.get_value("Sessions", {"sid": s.sid}, "lastupdate"), get_datetime(touched_at)
+		)
+		self.assertEqual(
+			frappe.db.get_value("User", "Administrator", "last_active"), get_datetime(touched_at)
+		)
+
+	@patch.dict(frappe.conf, {"session_write_behind": 1})
+	def test_forced_update_discards_pending_touch(self):
+		self.sid  # triggers login for test case login
+		s: Session = frappe.local.session_obj
+		frappe.cache.hdel("last_db_session_update", s.sid)
+
+		with self.freeze_time(add_to_date(now(), minutes=15, as_string=True)):
+			self.assertFalse(s.update())
+		self.assertTrue(frappe.cache.hget(PENDING_SESSION_UPDATES, s.sid))
+
+		s.data.data.csrf_token = "rotated"
+		self.assertTrue(s.update(force=True))
+		self.assertFalse(frappe.cache.hget(PENDING_SESSION_UPDATES, s.sid))
+
+		# flushing doesn't bring back the older session data
+		flush_session_updates()
+		self.assertEqual(s.get_session_data_from_db().csrf_token, "rotated")
@@ -1,7 +1,9 @@
 import time
 from contextlib import contextmanager
+from functools import partial
 from unittest.mock import patch
 
+from redis.exceptions import ConnectionError
 from rq import Queue
 
 import frappe
@@ -10,10 +12,16 @@ from frappe.tests import IntegrationTestCase
 from frappe.utils.background_jobs import (
 	RQ_JOB_FAILURE_TTL,
 	RQ_RESULTS_TTL,
+	FairShareWorker,
+	SiteContextPool,
 	create_job_id,
 	execute_job,
 	generate_qname,
+	get_fair_share_workers_key,
+	get_parallel_map,
+	get_pending_jobs_by_site,
 	get_redis_conn,
+	is_fair_share_enabled,
 )
 
 
@@ -53,6 +61,36 @@ class TestBackgroundJobs(IntegrationTestCase):
 		# lesser is earlier
 		self.assertTrue(high_priority_job.get_position() < low_priority_job.get_position())
 
+	def test_enqueue_many(self):
+		jobs = frappe.enqueue_many("frappe.handler.ping", [{}] * 10, queue="short")
+		self.assertEqual(len(jobs), 10)
+		self.assertEqual(len({job.id for job in jobs}), 10)
+
+		jobs = frappe.enqueue_many("frappe.handler.ping", [{}] * 10, queue="short", chunk_size=4)
+		self.assertEqual([len(job.kwargs["kwargs"]["kwargs_list"]) for job in jobs], [4, 4, 2])
+		self.assertEqual(jobs[0].kwargs["job_name"], "frappe.handler.ping (batch)")
+
+	def test_enqueue_many_directly(self):
+		self.assertEqual(frappe.enqueue_many("frappe.handler.ping", [{}] * 2, now=True), ["pong", "pong"])
+
+		# redis is unreachable during migrate
+		with (
+			patch("frappe.utils.background_jobs.get_queue", side_effect=ConnectionError),
+			patch.dict(frappe.local.flags, {"in_migrate": True}),
+		):
+			self.assertEqual(frappe.enqueue_many("frappe.handler.ping", [{}] * 2), ["pong", "pong"])
+
+	def test_parallel_map(self):
+		group_id = frappe.parallel_map(
+			"frappe.tests.test_background_jobs.reciprocal", [1, 2, 0, 4], chunk_size=3, is_async=False
+		)
+
+		group = get_parallel_map(group_id)
+		self.assertTrue(group.finished)
+		self.assertEqual(group.results, [1, 0.5, None, 0.25])
+		self.assertEqual(list(group.failures), [2])
+		self.assertIn("ZeroDivisionError", group.failures[2])
+
 	def test_job_hooks(self):
 		self.addCleanup(lambda: _test_JOB_HOOK.clear())
 		with freeze_local() as locals, frappe.init_site(locals.site), patch(
@@ -72,11 +110,97 @@ class TestBackgroundJobs(IntegrationTestCase):
 			self.assertEqual(r, "pong")
 			self.assertLess(_test_JOB_HOOK.get("before_job"), _test_JOB_HOOK.get("after_job"))
 
+	def test_site_context_reuse(self):
+		pool = SiteContextPool(size=1, max_jobs=2)
+		self.addCleanup(pool.close)
+
+		with (
+			freeze_local() as locals,
+			frappe.init_site(locals.site),
+			patch("frappe.utils.background_jobs._site_contexts", pool),
+		):
+			run_job = partial(
+				execute_job,
+				site=locals.site,
+				user="Administrator",
+				method="frappe.tests.test_background_jobs.get_connection_id",
+				event=None,
+				job_name="get_connection_id",
+				is_async=True,
+				kwargs={},
+			)
+			first, second, third = run_job(), run_job(), run_job()
+
+		self.assertEqual(first, second)
+		# recycled after max jobs
+		self.assertNotEqual(second, third)
+
+	def test_fair_share_queues(self):
+		conn = get_redis_conn()
+		common_site_config = frappe._dict(frappe.get_common_site_config(), fair_share_queues=1)
+		is_fair_share_enabled.cache_clear()
+		self.addCleanup(is_fair_share_enabled.cache_clear)
+		with patch("frappe.get_common_site_config", return_value=common_site_config):
+			# stays in the shared queue till fair share workers are running
+			job = frappe.enqueue("frappe.handler.ping", queue="short", priority="high")
+			self.assertEqual(job.origin, generate_qname("short"))
+			job.delete()
+
+			worker = FairShareWorker([Queue(generate_qname("short"), connection=conn)], connection=conn)
+			worker.register()
+			self.addCleanup(conn.delete, get_fair_share_workers_key("short"))
+			job = frappe.enqueue("frappe.handler.ping", queue="short", priority="high")
+
+		qname = generate_qname("short", site=frappe.local.site, priority="high")
+		queue = Queue(qname, connection=job.connection)
+		self.addCleanup(queue.delete)
+		self.assertEqual(job.origin, queue.name)
+		self.assertGreaterEqual(get_pending_jobs_by_site("short")[frappe.local.site], 1)
+		self.assertRaises(frappe.ValidationError, frappe.enqueue, "frappe.handler.ping", priority="urgent")
+
+	def test_fair_share_dequeue(self):
+		conn = get_redis_conn()
+		queues = {
+			site: Queue(generate_qname("short", site=site), connection=conn)
+			for site in ("heavy.test", "light.test", "busy.test")
+		}
+		for queue in queues.values():
+			self.addCleanup(queue.delete)
+			for _ in range(6):
+				queue.enqueue("frappe.handler.ping")
+
+		worker = FairShareWorker([Queue(generate_qname("short"), connection=conn)], connection=conn)
+		self.addCleanup(conn.delete, worker.key)
+		worker.site_limits = {"heavy.test": (2, 0), "light.test": (1, 0), "busy.test": (1, 1)}
+		worker.limits_loaded_at = time.monotonic()
+
+		# busy.test is already running as many jobs as allowed
+		running_job = queues["busy.test"].enqueue("frappe.handler.ping")
+		queues["busy.test"].started_job_registry.add(running_job, ttl=60)
+
+		sites = []
+		for _ in range(6):
+			_job, queue = worker.dequeue_job_and_maintain_ttl(None)
+			sites.append(queue.name.rsplit(":", 1)[1])
+
+		self.assertEqual(sites.count("heavy.test"), 4)
+		self.assertEqual(sites.count("light.test"), 2)
+
+
+def get_connection_id():
+	if frappe.db.db_type == "postgres":
+		return frappe.db.sql("select pg_backend_pid()")[0][0]
+	return frappe.db.sql("select connection_id()")[0][0]
+
 
 def fail_function():
 	return 1 / 0
 
 
+def reciprocal(x):
+	return 1 / x
+
+
 _test_JOB_HOOK = {}
 
 
@@ -1,5 +1,15 @@
+from unittest.mock import patch
+
 import frappe
-from frappe.boot import get_unseen_notes, get_user_pages_or_reports
+from frappe.boot import (
+	BOOT_SECTIONS_KEY,
+	add_shared_sections,
+	get_boot_section,
+	get_bootinfo,
+	get_unseen_notes,
+	get_user_bootinfo,
+	get_user_pages_or_reports,
+)
 from frappe.desk.doctype.note.note import mark_as_seen
 from frappe.tests import IntegrationTestCase
 
@@ -28,6 +38,51 @@ class TestBootData(IntegrationTestCase):
 		self.assertListEqual(unseen_notes, [])
 
 
+class TestBootSections(IntegrationTestCase):
+	def test_shared_sections(self):
+		bootinfo = get_bootinfo()
+		for key in ("__messages", "print_css", "timezone_info", "single_types"):
+			self.assertIn(key, bootinfo)
+		self.assertIn(":Currency", {d.get("doctype") for d in bootinfo.docs})
+		self.assertEqual(bootinfo.print_css, get_boot_section("print")["print_css"])
+
+		# shared sections are cached once for all users
+		frappe.set_user("test@example.com")
+		self.assertEqual(get_bootinfo().single_types, bootinfo.single_types)
+		frappe.clear_cache(user="test@example.com")
+		self.assertTrue(frappe.cache.hget(BOOT_SECTIONS_KEY, "print"))
+		frappe.set_user("Administrator")
+
+	def test_section_invalidation(self):
+		get_boot_section("currency")
+		frappe.get_doc("Currency", "INR").save()
+		self.assertFalse(frappe.cache.hget(BOOT_SECTIONS_KEY, "currency"))
+
+	def test_boot_session_hooks(self):
+		get_hooks = frappe.get_hooks
+
+		def patch_boot_session_hook(hook=None, *args, **kwargs):
+			if hook is None:
+				return frappe._dict(get_hooks(), boot_session=["frappe.tests.test_boot.boot_session"])
+			return get_hooks(hook, *args, **kwargs)
+
+		with patch("frappe.get_hooks", patch_boot_session_hook):
+			bootinfo = get_user_bootinfo()
+
+		# only values changed by hooks are kept in user's boot info
+		self.assertTrue(bootinfo.saw_translations)
+		self.assertIn("_Test Tree", bootinfo.treeviews)
+		self.assertNotIn("__messages", bootinfo)
+		self.assertIn("_Test Tree", add_shared_sections(bootinfo).treeviews)
+		self.assertNotIn("_Test Tree", get_boot_section("doctypes")["treeviews"])
+
+
+def boot_session(bootinfo):
+	# hooks see shared sections
+	bootinfo.saw_translations = "__messages" in bootinfo
+	bootinfo.treeviews.append("_Test Tree")
+
+
 class TestPermissionQueries(IntegrationTestCase):
 	@classmethod
 	def setUpClass(cls) -> None:
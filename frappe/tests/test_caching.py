@@ -260,6 +260,38 @@ class TestDocumentCache(FrappeAPITestCase):
 		with self.assertQueryCount(0):
 			frappe.get_cached_doc(self.TEST_DOCTYPE, self.TEST_DOCNAME)
 
+	def test_get_cached_docs(self):
+		names = ["Administrator", "Guest", "not-a-user"]
+		frappe.clear_document_cache("User")
+
+		tables = len(frappe.get_meta("User").get_table_fields())
+		with self.assertQueryCount(1 + tables):
+			docs = frappe.get_cached_docs("User", names)
+
+		self.assertEqual([d.name for d in docs], ["Administrator", "Guest"])
+		for doc in docs:
+			self.assertEqual(doc.as_dict(), frappe.get_doc("User", doc.name).as_dict())
+
+		frappe.local.cache = {}
+		with self.assertQueryCount(0), self.assertRedisCallCounts(1):
+			docs = frappe.get_cached_docs("User", names[:2])
+		self.assertEqual([d.name for d in docs], ["Administrator", "Guest"])
+
+	def test_get_cached_values(self):
+		names = ["Administrator", "Guest", "not-a-user"]
+
+		self.assertEqual(
+			frappe.get_cached_values("User", names, "first_name"),
+			{name: frappe.get_cached_value("User", name, "first_name") for name in names},
+		)
+		self.assertEqual(
+			frappe.get_cached_values("User", names, ["first_name", "enabled"], as_dict=True),
+			{
+				name: frappe.get_cached_value("User", name, ["first_name", "enabled"], as_dict=True)
+				for name in names
+			},
+		)
+
 
 class TestRedisWrapper(FrappeAPITestCase):
 	def test_delete_keys(self):
@@ -272,6 +304,48 @@ class TestRedisWrapper(FrappeAPITestCase):
 		frappe.cache.delete_keys(prefix)
 		self.assertEqual(len(frappe.cache.get_keys(prefix)), 0)
 
+	def test_delete_index(self):
+		index = "test_index"
+
+		for i in range(5):
+			frappe.cache.set_value(f"test_indexed_{i}", 1, index=index)
+		frappe.cache.set_value("test_indexed_other", 1)
+
+		self.assertEqual(len(frappe.cache.smembers(index)), 5)
+		frappe.cache.delete_index(index)
+		self.assertEqual(
+			frappe.cache.get_keys("test_indexed_"), [frappe.cache.make_key("test_indexed_other")]
+		)
+		self.assertFalse(frappe.cache.smembers(index))
+		frappe.cache.delete_value("test_indexed_other")
+
+	def test_document_cache_index(self):
+		index = frappe.get_document_cache_index_key("User")
+		frappe.get_cached_doc("User", "Administrator")
+		frappe.get_cached_doc("User", "Guest")
+
+		# deleted documents are removed from the index
+		frappe.clear_document_cache("User", "Guest")
+		self.assertNotIn(
+			frappe.cache.make_key(frappe.get_document_cache_key("User", "Guest")),
+			frappe.cache.smembers(index),
+		)
+
+		# documents are cleared if the index was evicted
+		frappe.cache.delete_value(index)
+		frappe.clear_document_cache("User")
+		self.assertFalse(frappe.cache.exists(frappe.get_document_cache_key("User", "Administrator")))
+
+	def test_clear_document_cache_for_doctype(self):
+		frappe.get_cached_doc("User", "Administrator")
+		frappe.get_cached_doc("User", "Guest")
+		frappe.get_cached_doc("Role", "System Manager")
+
+		frappe.clear_document_cache("User")
+		self.assertFalse(frappe.cache.exists(frappe.get_document_cache_key("User", "Administrator")))
+		self.assertFalse(frappe.cache.exists(frappe.get_document_cache_key("User", "Guest")))
+		self.assertTrue(frappe.cache.exists(frappe.get_document_cache_key("Role", "System Manager")))
+
 	def test_hash(self):
 		key = "test_hash"
 
@@ -4,7 +4,7 @@
 import datetime
 from math import ceil
 from random import choice
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import frappe
 from frappe.core.utils import find
@@ -1019,6 +1019,62 @@ class TestReplicaConnections(IntegrationTestCase):
 			outer()
 			self.assertEqual(write_connection, db_id())
 
+	def test_replica_routing(self):
+		from frappe.database import replica
+
+		replicas = [{"host": "127.0.0.1", "weight": 1}, {"host": "localhost", "weight": 0}]
+		conf = {"read_from_replica": 1, "replicas": replicas, "replica_max_lag": 5}
+		with patch.dict(frappe.local.conf, conf):
+			self.assertEqual([r.host for r in replica.get_replicas()], ["127.0.0.1", "localhost"])
+
+			for r in replica.get_replicas():
+				replica.set_cached_lag(r, 1)
+			# weight 0 replicas are only used when others are not usable
+			for _ in range(5):
+				self.assertTrue(frappe.connect_replica())
+				self.assertEqual(frappe.db.host, "127.0.0.1")
+				frappe.disconnect_replica()
+
+			# lagging replicas are skipped, primary is used if none are usable
+			replica.set_cached_lag(replica.get_replicas()[0], 10)
+			self.assertTrue(frappe.connect_replica())
+			self.assertEqual(frappe.db.host, "localhost")
+			frappe.disconnect_replica()
+
+			replica.set_cached_lag(replica.get_replicas()[1], float("inf"))
+			self.assertFalse(frappe.connect_replica())
+			self.assertFalse(hasattr(frappe.local, "primary_db"))
+
+			for r in replica.get_replicas():
+				replica.set_cached_lag(r, 0)
+
+			# sessions that wrote recently read from the primary
+			replica.mark_sticky()
+			self.assertFalse(frappe.connect_replica())
+
+			frappe.local.replica_sticky_until = None
+			if key := replica.get_sticky_key():
+				frappe.cache.delete_value(key)
+			self.assertTrue(frappe.connect_replica())
+			frappe.disconnect_replica()
+
+			for r in replica.get_replicas():
+				frappe.cache.delete_value(replica.get_lag_key(r), shared=True)
+
+	def test_replica_lag_measurement_failure(self):
+		from frappe.database.replica import measure_lag
+
+		db = MagicMock()
+		db.get_replication_lag.return_value = 2
+		self.assertEqual(measure_lag(db), 2)
+
+		db.get_replication_lag.return_value = None
+		self.assertEqual(measure_lag(db), float("inf"))
+
+		# replicas whose lag can't be measured aren't assumed to be in sync
+		db.get_replication_lag.side_effect = Exception("Access denied")
+		self.assertEqual(measure_lag(db), float("inf"))
+
 
 class TestConcurrency(IntegrationTestCase):
 	@timeout(5, "There shouldn't be any lock wait")
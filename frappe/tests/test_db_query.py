@@ -810,6 +810,24 @@ class TestDBQuery(IntegrationTestCase):
 		owners = DatabaseQuery("DocType").execute(filters={"name": "DocType"}, pluck="owner")
 		self.assertEqual(owners, ["Administrator"])
 
+	@run_only_if(db_type_is.MARIADB)  # unbuffered cursor is only implemented for mariadb
+	def test_as_iterator(self):
+		filters = {"module": "Core", "istable": 0}
+		expected = frappe.get_all("DocType", filters=filters, fields=["name", "module"], order_by="name")
+
+		with frappe.db.unbuffered_cursor():
+			result = frappe.get_all(
+				"DocType", filters=filters, fields=["name", "module"], order_by="name", as_iterator=True
+			)
+			self.assertNotIsInstance(result, list)
+			self.assertEqual(list(result), expected)
+
+		with frappe.db.unbuffered_cursor():
+			names = frappe.get_all(
+				"DocType", filters=filters, order_by="name", pluck="name", as_iterator=True
+			)
+			self.assertEqual(list(names), [d.name for d in expected])
+
 	def test_prepare_select_args(self):
 		# frappe.get_all inserts modified field into order_by clause
 		# test to make sure this is inserted into select field when postgres
@@ -1193,6 +1211,75 @@ class TestDBQuery(IntegrationTestCase):
 		self.assertEqual(count[1], frappe.db.count("Language"))
 
 
+class TestCompiledQuery(IntegrationTestCase):
+	def test_compiled_query_reuse(self):
+		def get_list(status):
+			return frappe.get_list(
+				"ToDo",
+				fields=["name", "status", "allocated_to.full_name as assignee"],
+				filters={"status": status},
+				order_by="creation desc",
+				run=False,
+			)
+
+		frappe.clear_cache(doctype="ToDo")
+		with patch.object(DatabaseQuery, "sanitize_fields", autospec=True) as sanitize_fields:
+			open_query = get_list("Open")
+			closed_query = get_list("Closed")
+		sanitize_fields.assert_called_once()
+
+		self.assertIn("'Closed'", closed_query)
+		self.assertEqual(open_query.replace("'Open'", "'Closed'"), closed_query)
+
+		# permissions are still checked for every query
+		with self.set_user("Guest"), self.assertRaises(frappe.PermissionError):
+			get_list("Open")
+
+		frappe.clear_cache(doctype="ToDo")
+		with patch.object(DatabaseQuery, "sanitize_fields", autospec=True) as sanitize_fields:
+			self.assertEqual(get_list("Open"), open_query)
+		sanitize_fields.assert_called_once()
+
+
+class TestQueryCache(IntegrationTestCase):
+	def test_get_tables(self):
+		from frappe.database.query_cache import get_tables
+
+		self.assertEqual(
+			get_tables(
+				'select * from `tabToDo` join "tabSales Invoice" on x where y in (select z from tabUser)'
+			),
+			{"ToDo", "Sales Invoice", "User"},
+		)
+		self.assertEqual(get_tables("SELECT tabbed, table_name FROM tabNote WHERE tab_size > 2"), {"Note"})
+		self.assertEqual(get_tables("update tabToDo set status = 'Closed'"), {"ToDo"})
+
+	def test_query_cache(self):
+		from frappe.database import query_cache
+
+		def count():
+			return frappe.get_all("ToDo", fields=["count(*) as count"], cache=True)[0].count
+
+		with patch.dict(frappe.local.conf, {"enable_query_cache": 1}):
+			before = count()
+			with self.assertQueryCount(0):
+				self.assertEqual(count(), before)
+
+			# tables written in current transaction always hit the database
+			frappe.get_doc(doctype="ToDo", description="query cache").insert()
+			self.assertIn("ToDo", frappe.db.written_tables)
+			self.assertEqual(count(), before + 1)
+
+			frappe.db.rollback()
+			with self.assertQueryCount(0):
+				self.assertEqual(count(), before)
+
+			# committed writes bump version of the table
+			query_cache.bump_table_versions({"ToDo"})
+			with self.assertQueryCount(1):
+				self.assertEqual(count(), before)
+
+
 class TestReportView(IntegrationTestCase):
 	@run_only_if(db_type_is.MARIADB)  # TODO: postgres name casting is messed up
 	def test_get_count(self):
@@ -39,6 +39,26 @@ class TestDocument(IntegrationTestCase):
 		self.assertTrue(isinstance(d.permissions, list))
 		self.assertTrue(filter(lambda d: d.fieldname == "email", d.fields))
 
+	def test_get_docs(self):
+		names = frappe.get_all("DocType", {"istable": 0, "issingle": 0}, pluck="name", limit=20)
+		tables = len(frappe.get_meta("DocType").get_table_fields())
+
+		with self.assertQueryCount(1 + tables):
+			docs = frappe.get_docs("DocType", [*reversed(names), "not-a-doctype"])
+
+		self.assertEqual([d.name for d in docs], list(reversed(names)))
+		for doc in docs:
+			expected = frappe.get_doc("DocType", doc.name)
+			self.assertIsInstance(doc, type(expected))
+			self.assertEqual(doc.as_dict(), expected.as_dict())
+			for row in doc.get_all_children():
+				self.assertIs(row.parent_doc, doc)
+
+	def test_get_docs_single(self):
+		self.assertEqual(
+			frappe.get_docs("System Settings", ["System Settings"])[0].doctype, "System Settings"
+		)
+
 	def test_load_single(self):
 		d = frappe.get_doc("Website Settings", "Website Settings")
 		self.assertEqual(d.name, "Website Settings")
@@ -62,6 +82,35 @@ class TestDocument(IntegrationTestCase):
 		self.assertEqual(d.send_reminder, 1)
 		return d
 
+	def test_insert_children_in_bulk(self):
+		from frappe.model import base_document
+
+		child_table = new_doctype(istable=1).insert().name
+		parent = (
+			new_doctype(fields=[{"fieldtype": "Table", "options": child_table, "fieldname": "child_table"}])
+			.insert()
+			.name
+		)
+		doc = frappe.get_doc(
+			{"doctype": parent, "child_table": [{"some_fieldname": str(i)} for i in range(20)]}
+		)
+
+		with patch.object(base_document, "_insert_rows", wraps=base_document._insert_rows) as insert_rows:
+			doc.insert()
+		insert_rows.assert_called_once()
+		self.assertFalse(any(row.is_new() for row in doc.child_table))
+
+		doc.child_table = doc.child_table[5:]
+		for i in range(20, 30):
+			doc.append("child_table", {"some_fieldname": str(i)})
+
+		with patch.object(base_document, "_insert_rows", wraps=base_document._insert_rows) as insert_rows:
+			doc.save()
+		insert_rows.assert_called_once()
+
+		rows = frappe.get_all(child_table, {"parent": doc.name}, pluck="some_fieldname", order_by="idx asc")
+		self.assertEqual(rows, [str(i) for i in range(5, 30)])
+
 	def test_website_route_default(self):
 		default = frappe.generate_hash()
 		child_table = new_doctype(default=default, istable=1).insert().name
@@ -1,10 +1,13 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+from werkzeug.http import quote_etag
+
 import frappe
 from frappe.core.page.permission_manager.permission_manager import add, reset, update
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
 from frappe.desk.form.load import get_docinfo, getdoc, getdoctype
 from frappe.tests import IntegrationTestCase
+from frappe.utils import set_request
 from frappe.utils.file_manager import save_file
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["Blog Category", "Blogger"]
@@ -193,6 +196,39 @@ class TestFormLoad(IntegrationTestCase):
 		self.assertIn("email", docinfo.communications[0].content)
 		note.delete()
 
+	def test_conditional_getdoc(self):
+		note = frappe.get_doc(doctype="Note", title=frappe.generate_hash(length=20)).insert()
+
+		def load(etag=None):
+			set_request(method="GET", path="/", headers={"If-None-Match": quote_etag(etag)} if etag else {})
+			frappe.local.response = frappe._dict(docs=[])
+			getdoc("Note", note.name)
+			return frappe.local.response_etag
+
+		etag = load()
+		self.assertEqual(frappe.response.docs[0].name, note.name)
+
+		self.assertEqual(load(etag), etag)
+		self.assertEqual(frappe.response.http_status_code, 304)
+		self.assertEqual(frappe.response.docs, [])
+
+		note.add_comment(text="test")
+		self.assertNotEqual(load(etag), etag)
+		self.assertFalse(frappe.response.http_status_code)
+		self.assertEqual(frappe.response.docs[0].name, note.name)
+		self.assertEqual(len(frappe.response.docinfo.comments), 1)
+
+		# permission rules may have changed, e.g. after Custom DocPerm is updated
+		etag = load()
+		frappe.clear_cache(doctype="Note")
+		self.assertNotEqual(load(etag), etag)
+		self.assertEqual(frappe.response.docs[0].name, note.name)
+
+		etag = load()
+		# views are a part of docinfo of doctypes tracking them
+		note.add_viewed(force=True)
+		self.assertNotEqual(load(etag), etag)
+
 
 def get_blog(blog_name):
 	frappe.response.docs = []
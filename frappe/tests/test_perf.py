@@ -203,6 +203,100 @@ class TestPerformance(IntegrationTestCase):
 		with self.assertRedisCallCounts(1):
 			frappe.get_doc("User", "Administrator")
 
+	def test_redis_codec_payloads(self):
+		"""Compare payload sizes and load times of cache codecs for core doctypes."""
+		from frappe.utils.redis_codec import CompressedCodec, DocumentCodec, PickleCodec
+
+		communication = frappe.new_doc("Communication", subject="Test", content="Test " * 1000)
+		for i in range(20):
+			communication.append("timeline_links", {"link_doctype": "ToDo", "link_name": str(i)})
+
+		values = {
+			"DocType meta": frappe.get_meta("DocType"),
+			"User meta": frappe.get_meta("User"),
+			"Communication meta": frappe.get_meta("Communication"),
+			"User": frappe.get_doc("User", "Administrator"),
+			"Communication": communication,
+		}
+		codecs = {
+			"pickle": PickleCodec(),
+			"document": DocumentCodec(),
+			"document+zlib": CompressedCodec(DocumentCodec(), "zlib", threshold=0),
+		}
+
+		for label, value in values.items():
+			sizes = {}
+			for codec_name, codec in codecs.items():
+				payload = codec.dumps(value)
+				start = time.perf_counter()
+				for _ in range(100):
+					codec.loads(payload)
+				load_time = (time.perf_counter() - start) * 1000 / 100  # ms per load
+				sizes[codec_name] = len(payload)
+				print(f"{label:<20} {codec_name:<15} {len(payload):>8} bytes {load_time:>8.3f} ms/load")
+
+			self.assertLessEqual(sizes["document"], sizes["pickle"])
+
+	def test_compiled_query_build_time(self):
+		"""Compare time spent building list queries with and without compiled queries."""
+		from frappe.model import db_query
+
+		def build_queries():
+			start = time.perf_counter()
+			queries = [
+				frappe.get_list(
+					"ToDo",
+					fields=["name", "status", "priority", "date", "allocated_to.full_name as assignee"],
+					filters={"status": "Open", "description": ["like", f"%{i}%"]},
+					order_by="modified desc",
+					limit=20,
+					run=False,
+				)
+				for i in range(200)
+			]
+			return queries, (time.perf_counter() - start) * 1000 / 200  # ms per query
+
+		with patch.object(db_query, "COMPILED_QUERY_CACHE_SIZE", 0):
+			uncached_queries, uncached_time = build_queries()
+		cached_queries, cached_time = build_queries()
+
+		print(f"get_list build time: {uncached_time:.3f} ms uncached, {cached_time:.3f} ms compiled")
+		self.assertEqual(cached_queries, uncached_queries)
+
+	def test_route_resolution_time(self):
+		"""Resolve 10k mixed website paths with the compiled route table."""
+		from frappe.website.route_table import RouteTable, clear_route_table
+
+		paths = [
+			"/",
+			"/app",
+			"/login",
+			"/me",
+			"/contact",
+			"/about",
+			"/update-password",
+			"/website_script.js",
+			"/app/todo/new",
+			"/missing-page",
+		] * 1000
+
+		expected = {}
+		for path in dict.fromkeys(paths):
+			frappe.local.route_table = RouteTable()
+			expected[path] = PathResolver(path).resolve()[0]
+
+		clear_route_table()
+		start = time.perf_counter()
+		PathResolver("/").resolve()
+		build_time = (time.perf_counter() - start) * 1000
+
+		start = time.perf_counter()
+		endpoints = [PathResolver(path).resolve()[0] for path in paths]
+		resolve_time = (time.perf_counter() - start) * 1000 / len(paths)
+
+		print(f"route table: {build_time:.3f} ms first request, {resolve_time:.3f} ms per path")
+		self.assertEqual(endpoints, [expected[path] for path in paths])
+
 
 @run_only_if(db_type_is.MARIADB)
 class TestOverheadCalls(FrappeAPITestCase):
@@ -121,7 +121,7 @@ class TestQueryReport(IntegrationTestCase):
 
 				self.assertTrue(frappe.response["filename"].endswith(".csv"))
 				self.assertEqual(frappe.response["type"], "binary")
-				with StringIO(frappe.response["filecontent"].decode("utf-8")) as result:
+				with StringIO(frappe.response["filecontent"].read().decode("utf-8")) as result:
 					reader = DictReader(result, delimiter=delimiter, quoting=quoting)
 					row = reader.__next__()
 					for column in REPORT_COLUMNS:
@@ -7,7 +7,7 @@ from werkzeug.wrappers import Response
 
 import frappe
 import frappe.rate_limiter
-from frappe.rate_limiter import RateLimiter
+from frappe.rate_limiter import KeyedRateLimiter, RateLimiter
 from frappe.tests import IntegrationTestCase
 from frappe.utils import cint
 
@@ -110,3 +110,59 @@ class TestRateLimiter(IntegrationTestCase):
 		self.assertEqual(limiter.duration, cint(frappe.cache.get(limiter.key)))
 
 		frappe.cache.delete(limiter.key)
+
+
+class TestKeyedRateLimiter(IntegrationTestCase):
+	def setUp(self):
+		frappe.local.request_ip = frappe.generate_hash(length=8)
+		self.addCleanup(delattr, frappe.local, "request_ip")
+
+	def test_sliding_window(self):
+		limiter = KeyedRateLimiter([{"key": "ip", "limit": 2, "window": 60}])
+		limiter.apply()
+		limiter.apply()
+		self.assertEqual(int(limiter.headers()["X-RateLimit-Remaining"]), 0)
+
+		self.assertRaises(frappe.TooManyRequestsError, limiter.apply)
+		self.assertEqual(limiter.respond().status_code, 429)
+		self.assertIn("Retry-After", limiter.headers())
+
+		# other clients have their own limit
+		frappe.local.request_ip = frappe.generate_hash(length=8)
+		KeyedRateLimiter([{"key": "ip", "limit": 2, "window": 60}]).apply()
+
+	def test_token_bucket(self):
+		rules = [{"key": ["ip", "user"], "limit": 2, "window": 0.2, "algorithm": "token_bucket"}]
+		KeyedRateLimiter(rules).apply()
+		KeyedRateLimiter(rules).apply()
+		self.assertRaises(frappe.TooManyRequestsError, KeyedRateLimiter(rules).apply)
+
+		time.sleep(0.1)  # refills one token
+		KeyedRateLimiter(rules).apply()
+
+	def test_rejected_requests_are_not_counted(self):
+		rules = [{"key": "ip", "limit": 3, "window": 60}, {"key": "ip", "limit": 1, "window": 60, "cost": 2}]
+		limiter = KeyedRateLimiter(rules)
+		self.assertRaises(frappe.TooManyRequestsError, limiter.apply)
+		self.assertEqual(limiter.stats[0][1], 2)
+
+		# first rule wasn't consumed by the rejected request
+		limiter = KeyedRateLimiter(rules[:1])
+		limiter.apply()
+		self.assertEqual(limiter.stats[0][1], 2)
+
+	def test_method_of_call(self):
+		rules = [{"key": ["ip", "method"], "limit": 1, "window": 60, "methods": ["frappe.ping"]}]
+		limiter = KeyedRateLimiter(rules)
+		limiter.apply()
+		self.assertEqual(limiter.stats, [])
+
+		# e.g. calls of a batch request
+		KeyedRateLimiter(rules, method="frappe.ping").apply()
+		self.assertRaises(frappe.TooManyRequestsError, KeyedRateLimiter(rules, method="frappe.ping").apply)
+
+	def test_skip_unknown_keys(self):
+		limiter = KeyedRateLimiter([{"key": "api_key", "limit": 1, "window": 60}])
+		limiter.apply()
+		limiter.apply()
+		self.assertEqual(limiter.headers(), {})
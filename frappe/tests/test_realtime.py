@@ -0,0 +1,56 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+from unittest.mock import patch
+
+import frappe
+from frappe.realtime import flush_realtime_log, get_doc_room, publish_progress, publish_realtime
+from frappe.tests import IntegrationTestCase
+
+
+class TestRealtime(IntegrationTestCase):
+	def setUp(self):
+		frappe.local._realtime_progress = {}
+
+	def tearDown(self):
+		frappe.realtime.clear_realtime_log()
+
+	def test_events_coalesced_per_transaction(self):
+		todo = frappe.get_doc(doctype="ToDo", description="realtime").insert()
+		for i in range(3):
+			todo.description = f"realtime {i}"
+			todo.save()
+
+		with patch("frappe.realtime.publish_to_redis") as publish:
+			flush_realtime_log()
+
+		self.assertEqual(publish.call_count, 1)
+		events = publish.call_args.args[0]["events"]
+		doc_updates = [e for e in events if e["event"] == "doc_update"]
+		list_updates = [e for e in events if e["event"] == "list_update"]
+		self.assertEqual(len(doc_updates), 1)
+		self.assertEqual(len(list_updates), 1)
+		self.assertEqual(doc_updates[0]["message"]["modified"], todo.modified)
+		self.assertEqual(doc_updates[0]["room"], get_doc_room("ToDo", todo.name))
+
+	def test_duplicate_events_sent_once(self):
+		for _ in range(3):
+			publish_realtime("msgprint", "hello", user="Administrator", after_commit=True)
+		publish_realtime("msgprint", "world", user="Administrator", after_commit=True)
+
+		with patch("frappe.realtime.publish_to_redis") as publish:
+			flush_realtime_log()
+
+		events = publish.call_args.args[0]["events"]
+		self.assertEqual([e["message"] for e in events], ["hello", "world"])
+
+	def test_progress_throttled(self):
+		with patch("frappe.realtime.emit_via_redis") as emit:
+			for i in range(100):
+				publish_progress(i, task_id="test-task")
+			publish_progress(100, task_id="test-task")
+
+		percents = [call.args[1]["percent"] for call in emit.call_args_list]
+		self.assertEqual(percents[0], 0)
+		self.assertEqual(percents[-1], 100)
+		self.assertLess(len(percents), 10)
@@ -1,4 +1,5 @@
 import functools
+import time
 from unittest.mock import patch
 
 import redis
@@ -7,7 +8,9 @@ import frappe
 from frappe.tests import IntegrationTestCase
 from frappe.utils import get_bench_id
 from frappe.utils.background_jobs import get_redis_conn
+from frappe.utils.redis_codec import CompressedCodec, DocumentCodec, PickleCodec
 from frappe.utils.redis_queue import RedisQueue
+from frappe.utils.redis_wrapper import ClientCache, RedisWrapper
 
 
 def version_tuple(version):
@@ -75,3 +78,132 @@ class TestRedisAuth(IntegrationTestCase):
 
 		frappe.conf.update({"bench_id": bench_id})
 		conn.acl_deluser(username)
+
+
+class TestClientCache(IntegrationTestCase):
+	def setUp(self):
+		self.writer = RedisWrapper.from_url(frappe.conf.redis_cache)
+		self.reader = RedisWrapper.from_url(frappe.conf.redis_cache)
+		self.writer.client_cache = ClientCache(maxsize=1024 * 1024)
+		self.reader.client_cache = ClientCache(maxsize=1024 * 1024)
+		self.key = f"document_cache::ToDo::{frappe.generate_hash()}"
+
+	def tearDown(self):
+		self.writer.delete_value(self.key)
+		self.writer.delete_value("bootinfo")
+
+	def read(self, key):
+		frappe.local.cache = {}
+		return self.reader.get_value(key)
+
+	def wait_for_invalidation(self, key):
+		for _ in range(50):
+			if key not in self.reader.client_cache._data:
+				return
+			time.sleep(0.1)
+
+	def test_value_survives_request(self):
+		self.writer.set_value(self.key, {"value": 1})
+		self.assertEqual(self.read(self.key), {"value": 1})
+		hits = self.reader.client_cache.hits
+		self.assertEqual(self.read(self.key), {"value": 1})
+		self.assertEqual(self.reader.client_cache.hits, hits + 1)
+
+	def test_values_not_shared_across_requests(self):
+		self.writer.set_value(self.key, {"value": [1]})
+		self.read(self.key)["value"].append(2)
+		self.assertEqual(self.read(self.key), {"value": [1]})
+
+	def test_invalidation(self):
+		self.writer.set_value(self.key, {"value": 1})
+		self.read(self.key)
+		_key = self.reader.make_key(self.key)
+		self.assertIn(_key, self.reader.client_cache._data)
+
+		self.writer.set_value(self.key, {"value": 2})
+		self.wait_for_invalidation(_key)
+		self.assertEqual(self.read(self.key), {"value": 2})
+
+		self.writer.delete_value(self.key)
+		self.wait_for_invalidation(_key)
+		self.assertIsNone(self.read(self.key))
+
+	def test_hash_invalidation(self):
+		self.writer.hset("bootinfo", "Guest", {"value": 1})
+		frappe.local.cache = {}
+		self.reader.hget("bootinfo", "Guest")
+		_key = (self.reader.make_key("bootinfo"), "Guest")
+		self.assertIn(_key, self.reader.client_cache._data)
+
+		self.writer.hdel("bootinfo", "Guest")
+		self.wait_for_invalidation(_key)
+		frappe.local.cache = {}
+		self.assertIsNone(self.reader.hget("bootinfo", "Guest"))
+
+	def test_uncached_keys(self):
+		self.writer.set_value("some_other_key", 1)
+		self.read("some_other_key")
+		self.assertNotIn(self.reader.make_key("some_other_key"), self.reader.client_cache._data)
+		self.writer.delete_value("some_other_key")
+
+	def test_eviction_by_size(self):
+		client_cache = ClientCache(maxsize=100)
+		# nothing is stored until invalidations are being received
+		client_cache.set(b"a", "a", 60, client_cache.generation)
+		self.assertFalse(client_cache.get(b"a")[0])
+
+		client_cache.is_listening = lambda: True
+		client_cache.set(b"a", "a", 60, client_cache.generation)
+		client_cache.set(b"b", "b", 30, client_cache.generation)
+		client_cache.get(b"a")
+		client_cache.set(b"c", "c", 30, client_cache.generation)
+
+		self.assertTrue(client_cache.get(b"a")[0])
+		self.assertFalse(client_cache.get(b"b")[0])
+		self.assertTrue(client_cache.get(b"c")[0])
+		self.assertLessEqual(client_cache.size, 100)
+
+		# stale values fetched before an invalidation are not stored
+		generation = client_cache.generation
+		client_cache.invalidate([b"d"])
+		client_cache.set(b"d", "d", 10, generation)
+		self.assertFalse(client_cache.get(b"d")[0])
+
+
+class TestRedisCodec(IntegrationTestCase):
+	def assertDocumentEqual(self, doc, decoded):
+		self.assertIs(type(decoded), type(doc))
+		self.assertEqual(decoded.as_dict(), doc.as_dict())
+		for d in decoded.get_all_children():
+			self.assertIs(d.parent_doc, decoded)
+
+	def test_document_codec(self):
+		codec = DocumentCodec()
+		doc = frappe.get_doc("User", "Administrator")
+		self.assertDocumentEqual(doc, codec.loads(codec.dumps(doc)))
+
+		# also readable as a plain pickle
+		self.assertDocumentEqual(doc, PickleCodec().loads(codec.dumps(doc)))
+
+	def test_meta(self):
+		codec = DocumentCodec()
+		meta = frappe.get_meta("User")
+		decoded = codec.loads(codec.dumps(meta))
+
+		self.assertDocumentEqual(meta, decoded)
+		self.assertEqual(decoded._fields.keys(), meta._fields.keys())
+		self.assertIs(decoded.get_field("roles"), decoded.get("fields", {"fieldname": "roles"})[0])
+		self.assertEqual(
+			[df.fieldname for df in decoded.get_table_fields()],
+			[df.fieldname for df in meta.get_table_fields()],
+		)
+
+	def test_compression(self):
+		codec = CompressedCodec(PickleCodec(), "zlib", threshold=1024)
+		small, large = "a" * 10, "a" * 10_000
+
+		self.assertEqual(codec.dumps(small), PickleCodec().dumps(small))
+		self.assertLess(len(codec.dumps(large)), 1024)
+		self.assertEqual(codec.loads(codec.dumps(large)), large)
+		# values written before compression was enabled are still readable
+		self.assertEqual(codec.loads(PickleCodec().dumps(large)), large)
@@ -27,7 +27,7 @@ class TestReportview(IntegrationTestCase):
 
 				self.assertTrue(frappe.response["filename"].endswith(".csv"))
 				self.assertEqual(frappe.response["type"], "binary")
-				with StringIO(frappe.response["filecontent"].decode("utf-8")) as result:
+				with StringIO(frappe.response["filecontent"].read().decode("utf-8")) as result:
 					reader = DictReader(result, delimiter=delimiter, quoting=quoting)
 					for row in reader:
 						self.assertEqual(int(row["Is Single"]), 1)
@@ -12,6 +12,7 @@ from frappe.utils.data import now_datetime
 from frappe.utils.doctor import purge_pending_jobs
 from frappe.utils.scheduler import (
 	DEFAULT_SCHEDULER_TICK,
+	ScheduleIndex,
 	_get_last_creation_timestamp,
 	enqueue_events,
 	is_dormant,
@@ -54,6 +55,28 @@ class TestScheduler(IntegrationTestCase):
 			enqueued_jobs,
 		)
 
+	def test_schedule_index(self):
+		frappe.db.sql("update `tabScheduled Job Type` set last_execution = '2010-01-01 00:00:00'")
+		job_count = frappe.db.count("Scheduled Job Type", {"stopped": 0})
+		site = frappe.local.site
+
+		index = ScheduleIndex()
+		index.index_jobs()
+		due_jobs = index.pop_due()[site]
+		self.assertEqual(len(due_jobs), job_count)
+
+		with patch("frappe.utils.scheduler.is_scheduler_inactive", return_value=False):
+			enqueued_jobs = index.enqueue_jobs(due_jobs)
+
+		self.assertIn("frappe.desk.notifications.clear_notifications", enqueued_jobs)
+		# next executions are indexed, none of them is due yet
+		self.assertFalse(index.pop_due())
+		self.assertGreater(index.next_run_at(), time.time())
+
+		# indexing again replaces entries of the site
+		index.index_jobs()
+		self.assertEqual(len(index.pop_due(now=time.time() + 2 * 366 * 86400)[site]), job_count)
+
 	def test_queue_peeking(self):
 		job = get_test_job()
 
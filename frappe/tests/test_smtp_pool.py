@@ -0,0 +1,219 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Tests for pooled SMTP sending, using a local SMTP stub server.
+
+The stub adds `latency` seconds to every reply, like a remote mail server would. It is also used
+for throughput benchmarks, see `frappe.tests.benchmarks`.
+"""
+
+import smtplib
+import socketserver
+import threading
+import time
+
+import frappe
+from frappe.email.queue import send_queues_in_bulk
+from frappe.email.smtp import SMTPConnectionPool, sendmail_pipelined
+from frappe.tests import IntegrationTestCase
+
+MESSAGE = b"Subject: Test\r\n\r\nHello\r\n.starts with a period\r\n"
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+	def handle(self):
+		self.reply("220 localhost SMTP stub")
+		in_data, lines, sender, recipients = False, [], False, 0
+		for line in self.rfile:
+			line = line.rstrip(b"\r\n")
+			if in_data:
+				if line == b".":
+					in_data, sender, recipients = False, False, 0
+					self.server.received.append(b"\r\n".join(lines))
+					lines = []
+					self.reply("250 OK")
+				else:
+					lines.append(line[1:] if line.startswith(b"..") else line)
+				continue
+
+			command = line[:4].upper().decode()
+			if command == "EHLO":
+				self.reply("250-localhost", "250-PIPELINING", "250 8BITMIME")
+			elif command in ("MAIL", "RCPT") and b"refused" in line:
+				self.reply(f"550 {'Sender' if command == 'MAIL' else 'Recipient'} refused")
+			elif command == "MAIL":
+				sender = True
+				self.reply("250 OK")
+			elif command == "RCPT" and not sender:
+				self.reply("503 Need MAIL command")
+			elif command == "RCPT":
+				recipients += 1
+				self.reply("250 OK")
+			elif command == "DATA" and not recipients:
+				self.reply("554 No valid recipients")
+			elif command == "DATA":
+				in_data = True
+				self.reply("354 End data with <CR><LF>.<CR><LF>")
+			elif command == "RSET":
+				sender, recipients = False, 0
+				self.reply("250 OK")
+			elif command == "QUIT":
+				self.reply("221 Bye")
+				return
+			else:
+				# HELO, NOOP
+				self.reply("250 OK")
+
+	def reply(self, *lines):
+		if self.server.latency:
+			time.sleep(self.server.latency)
+		self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+	"""SMTP server accepting every email, keeping received messages in `received`."""
+
+	daemon_threads = True
+	allow_reuse_address = True
+
+	def __init__(self, latency: float = 0):
+		super().__init__(("127.0.0.1", 0), SMTPStubHandler)
+		self.latency = latency
+		self.received = []
+
+	def __enter__(self):
+		threading.Thread(target=self.serve_forever, daemon=True).start()
+		return self
+
+	def __exit__(self, *args):
+		self.shutdown()
+		self.server_close()
+
+	@property
+	def config(self) -> dict:
+		return {"server": self.server_address[0], "port": self.server_address[1]}
+
+
+class TestSMTPPool(IntegrationTestCase):
+	def setUp(self):
+		self.server = SMTPStubServer().__enter__()
+		self.addCleanup(self.server.__exit__)
+
+	def test_pipelined_sendmail(self):
+		session = smtplib.SMTP(*self.server.server_address)
+		self.addCleanup(session.quit)
+
+		sendmail_pipelined(session, "sender@example.com", "user@example.com", MESSAGE)
+		self.assertEqual(self.server.received, [MESSAGE.rstrip(b"\r\n")])
+
+		with self.assertRaises(smtplib.SMTPRecipientsRefused):
+			sendmail_pipelined(session, "sender@example.com", "refused@example.com", MESSAGE)
+		with self.assertRaises(smtplib.SMTPSenderRefused):
+			sendmail_pipelined(session, "refused@example.com", "user@example.com", MESSAGE)
+
+		# session is usable after refused emails
+		sendmail_pipelined(session, "sender@example.com", "user@example.com", MESSAGE)
+		self.assertEqual(len(self.server.received), 2)
+
+	def test_send_many(self):
+		pool = SMTPConnectionPool(self.server.config, size=4)
+		self.addCleanup(pool.close)
+
+		errors = pool.send_many(
+			[("sender@example.com", f"user{i}@example.com", MESSAGE) for i in range(20)]
+			+ [("sender@example.com", "refused@example.com", MESSAGE)]
+		)
+		self.assertEqual(errors[:20], [None] * 20)
+		self.assertIsInstance(errors[20], smtplib.SMTPRecipientsRefused)
+		self.assertEqual(len(self.server.received), 20)
+		self.assertEqual(len(pool.servers), 4)
+
+		# closed sessions are reopened
+		pool.servers[0]._session.close()
+		self.assertEqual(
+			pool.send_many([("sender@example.com", "user@example.com", MESSAGE)] * 8), [None] * 8
+		)
+		self.assertEqual(len(self.server.received), 28)
+
+	def test_rate_limit(self):
+		pool = SMTPConnectionPool(self.server.config, size=4, rate=600)
+		self.addCleanup(pool.close)
+
+		start = time.monotonic()
+		pool.send_many([("sender@example.com", "user@example.com", MESSAGE)] * 5)
+		# one email every 0.1s
+		self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+	def test_send_queues_in_bulk(self):
+		email_account = frappe.get_doc(
+			doctype="Email Account",
+			email_account_name="_Test SMTP Pool",
+			email_id="smtp-pool@example.com",
+			enable_outgoing=1,
+			no_smtp_authentication=1,
+			smtp_server=self.server.config["server"],
+			smtp_port=self.server.config["port"],
+			smtp_connections=2,
+		).insert()
+
+		queues = [
+			frappe.get_doc(
+				doctype="Email Queue",
+				sender="smtp-pool@example.com",
+				email_account=email_account.name,
+				message=f"Subject: Test {i}\nTo: <!--recipient-->\n\nHello",
+				status="Not Sent",
+				recipients=[
+					{"recipient": "user@example.com"},
+					{"recipient": "refused@example.com" if i else "a@example.com"},
+				],
+			).insert()
+			for i in range(3)
+		]
+
+		failed = []
+		send_queues_in_bulk(email_account, queues, failed.append)
+
+		self.assertEqual(failed, [queues[1].name, queues[2].name])
+		self.assertEqual(len(self.server.received), 4)
+		self.assertEqual(frappe.db.get_value("Email Queue", queues[0].name, "status"), "Sent")
+		self.assertEqual(frappe.db.get_value("Email Queue", queues[1].name, "status"), "Partially Sent")
+		self.assertEqual(
+			frappe.get_all(
+				"Email Queue Recipient", {"parent": queues[1].name}, pluck="status", order_by="idx"
+			),
+			["Sent", "Not Sent"],
+		)
+
+	def test_send_queues_in_bulk_with_broken_message(self):
+		email_account = frappe.get_doc(
+			doctype="Email Account",
+			email_account_name="_Test SMTP Pool Broken",
+			email_id="smtp-pool-broken@example.com",
+			enable_outgoing=1,
+			no_smtp_authentication=1,
+			smtp_server=self.server.config["server"],
+			smtp_port=self.server.config["port"],
+		).insert()
+
+		queues = [
+			frappe.get_doc(
+				doctype="Email Queue",
+				sender="smtp-pool-broken@example.com",
+				email_account=email_account.name,
+				message="Subject: Test\nTo: <!--recipient-->\n\nHello",
+				# attached file doesn't exist
+				attachments=frappe.as_json([{"fid": "_Test Missing File"}]) if broken else None,
+				status="Not Sent",
+				recipients=[{"recipient": "user@example.com"}],
+			).insert()
+			for broken in (True, False)
+		]
+
+		failed = []
+		send_queues_in_bulk(email_account, queues, failed.append)
+
+		self.assertEqual(failed, [queues[0].name])
+		self.assertEqual(len(self.server.received), 1)
+		self.assertEqual(frappe.db.get_value("Email Queue", queues[0].name, "status"), "Not Sent")
+		self.assertEqual(frappe.db.get_value("Email Queue", queues[1].name, "status"), "Sent")
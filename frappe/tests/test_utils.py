@@ -1,6 +1,7 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import gzip
 import io
 import json
 import os
@@ -44,6 +45,7 @@ from frappe.utils import (
 	remove_blanks,
 	safe_json_loads,
 	scrub_urls,
+	set_request,
 	validate_email_address,
 	validate_name,
 	validate_phone_number_with_country_code,
@@ -82,7 +84,7 @@ from frappe.utils.diff import _get_value_from_version, get_version_diff, version
 from frappe.utils.identicon import Identicon
 from frappe.utils.image import optimize_image, strip_exif_data
 from frappe.utils.make_random import can_make, get_random, how_many
-from frappe.utils.response import json_handler
+from frappe.utils.response import build_response, json_handler
 from frappe.utils.synchronization import LockTimeoutError, filelock
 
 
@@ -766,6 +768,27 @@ class TestResponse(IntegrationTestCase):
 		with self.assertRaises(TypeError):
 			json.dumps(BAD_OBJECT, default=json_handler)
 
+	def test_streamed_json(self):
+		data = frappe._dict(
+			message={"keys": ["name", "date"], "values": [[str(i), date(2024, 1, 1)] for i in range(2500)]}
+		)
+		with patch.object(frappe.local, "response", data):
+			response = build_response("json")
+
+		self.assertTrue(response.direct_passthrough)
+		self.assertEqual(json.loads(b"".join(response.response)), json.loads(frappe.as_json(data)))
+
+	def test_compressed_json(self):
+		data = frappe._dict(message=["row"] * 1000)
+		set_request(method="GET", path="/", headers={"Accept-Encoding": "gzip"})
+
+		with patch.dict(frappe.conf, {"response_compression": {"gzip": 6}}):
+			with patch.object(frappe.local, "response", data):
+				response = build_response("json")
+
+		self.assertEqual(response.headers["Content-Encoding"], "gzip")
+		self.assertEqual(json.loads(gzip.decompress(response.data)), json.loads(frappe.as_json(data)))
+
 
 class TestTimeDeltaUtils(IntegrationTestCase):
 	def test_format_timedelta(self):
@@ -229,6 +229,22 @@ class TestWebsite(IntegrationTestCase):
 		delattr(frappe.hooks, "website_redirects")
 		frappe.cache.delete_key("app_hooks")
 
+	def test_redirects_not_combined(self):
+		from frappe.website.route_table import RouteTable
+
+		redirects = [
+			dict(source=r"/named/(?P<page>.*)", target=r"/a/\g<page>"),
+			dict(source=r"/other/(?P<page>.*)", target=r"/b/\g<page>"),
+			dict(source=r"(?i)/?uppercase", target="/c"),
+			dict(source=r"/plain", target="/d"),
+		]
+		with patch("frappe.get_hooks", return_value=redirects):
+			route_table = RouteTable()
+			self.assertEqual(route_table.match_redirect("other/page"), ("/b/page", 301))
+			self.assertEqual(route_table.match_redirect("UPPERCASE"), ("/c", 301))
+			self.assertEqual(route_table.match_redirect("plain"), ("/d", 301))
+			self.assertIsNone(route_table.match_redirect("missing"))
+
 	def test_custom_page_renderer(self):
 		from frappe import get_hooks
 
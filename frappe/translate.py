@@ -234,9 +234,12 @@ def get_user_translations(lang):
 
 def clear_cache():
 	"""Clear all translation assets from :meth:`frappe.cache`"""
+	from frappe.boot import clear_boot_sections
+
 	frappe.cache.delete_value(
-		keys=["bootinfo", USER_TRANSLATION_KEY, MERGED_TRANSLATION_KEY],
+		keys=["bootinfo", USER_TRANSLATION_KEY, MERGED_TRANSLATION_KEY, "form_meta_version"],
 	)
+	clear_boot_sections(("translations",))
 
 
 def get_messages_for_app(app, deduplicate=True):
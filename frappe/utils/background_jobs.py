@@ -1,9 +1,10 @@
 import gc
+import math
 import os
 import socket
 import time
-from collections import defaultdict
-from collections.abc import Callable
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 from functools import lru_cache
 from threading import Thread
@@ -13,7 +14,7 @@ from uuid import uuid4
 import redis
 import setproctitle
 from redis.exceptions import BusyLoadingError, ConnectionError
-from rq import Callback, Queue, Worker
+from rq import Callback, Queue, SimpleWorker, Worker
 from rq.exceptions import NoSuchJobError
 from rq.job import Job, JobStatus
 from rq.logutils import setup_loghandlers
@@ -24,7 +25,7 @@ from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fi
 import frappe
 import frappe.monitor
 from frappe import _
-from frappe.utils import CallbackManager, cint, get_bench_id
+from frappe.utils import CallbackManager, cint, create_batch, get_bench_id
 from frappe.utils.commands import log
 from frappe.utils.redis_queue import RedisQueue
 
@@ -32,9 +33,18 @@ from frappe.utils.redis_queue import RedisQueue
 RQ_JOB_FAILURE_TTL = 7 * 24 * 60 * 60  # 7 days instead of 1 year (default)
 RQ_FAILED_JOBS_LIMIT = 1000  # Only keep these many recent failed jobs around
 RQ_RESULTS_TTL = 10 * 60
+PARALLEL_MAP_TTL = 24 * 60 * 60  # keep results of `parallel_map` for a day
+DEFAULT_CONTEXT_MAX_JOBS = 100
+
+# priorities of queues of a site, in order of dequeuing, `None` is the normal priority
+PRIORITIES = ("high", None, "low")
+FAIR_SHARE_REFRESH_INTERVAL = 10  # seconds, to find new queues of sites and running jobs
+SITE_LIMITS_TTL = 5 * 60  # seconds, to read weights and concurrency of sites again
+FAIR_SHARE_WORKERS_TTL = 60  # seconds, after which sites stop using their queues if no worker is left
 
 
 _redis_queue_conn = None
+_site_contexts: "SiteContextPool | None" = None
 
 
 @lru_cache
@@ -75,6 +85,7 @@ def enqueue(
 	at_front: bool = False,
 	job_id: str | None = None,
 	deduplicate=False,
+	priority: str | None = None,
 	**kwargs,
 ) -> Job | Any:
 	"""
@@ -96,6 +107,7 @@ def enqueue(
 	:param kwargs: keyword arguments to be passed to the method
 	:param deduplicate: do not re-queue job if it's already queued, requires job_id.
 	:param job_id: Assigning unique job id, which can be checked using `is_job_enqueued`
+	:param priority: "high" or "low", priority among jobs of the site if fair share queues are enabled
 	"""
 	# To handle older implementations
 	is_async = kwargs.pop("async", is_async)
@@ -138,7 +150,7 @@ def enqueue(
 		return frappe.call(method, **kwargs)
 
 	try:
-		q = get_queue(queue, is_async=is_async)
+		q = get_queue(queue, is_async=is_async, priority=priority)
 	except ConnectionError:
 		if frappe.local.flags.in_migrate:
 			# If redis is not available during migration, execute the job directly
@@ -150,11 +162,7 @@ def enqueue(
 	if not timeout:
 		timeout = get_queues_timeout().get(queue) or 300
 
-	# Prepare a more readable name than <function $name at $address>
-	if isinstance(method, Callable):
-		method_name = f"{method.__module__}.{method.__qualname__}"
-	else:
-		method_name = method
+	method_name = get_method_name(method)
 
 	queue_args = {
 		"site": frappe.local.site,
@@ -188,6 +196,247 @@ def enqueue(
 	return enqueue_call()
 
 
+def enqueue_many(
+	method: str | Callable,
+	kwargs_list: Iterable[dict],
+	queue: str = "default",
+	timeout: int | None = None,
+	event: str | None = None,
+	is_async: bool = True,
+	enqueue_after_commit: bool = False,
+	chunk_size: int | None = None,
+	now: bool = False,
+	*,
+	on_success: Callable | None = None,
+	on_failure: Callable | None = None,
+	at_front: bool = False,
+	priority: str | None = None,
+) -> list[Job] | list[Any] | None:
+	"""
+	Enqueue method once for each of the keyword arguments, in a single round trip to redis
+
+	:param method: method string or method object
+	:param kwargs_list: keyword arguments of each call of the method
+	:param chunk_size: if set, each job calls the method for these many keyword arguments in turn, to
+	share the job's setup (init, connect etc.) among them
+	:param queue: should be either long, default or short
+	:param timeout: should be set according to the functions, per job
+	:param is_async: if is_async=False, the calls are executed immediately, else via workers
+	:param now: if now=True, the method is called via frappe.call() for each of the keyword arguments
+	and their results are returned
+	:param enqueue_after_commit: if True, the jobs will be enqueued after the current transaction is
+	committed
+	:param on_success: Success callback of each job
+	:param on_failure: Failure callback of each job
+	:param at_front: Enqueue the jobs at the front of the queue or not
+	:param priority: "high" or "low", priority among jobs of the site if fair share queues are enabled
+	"""
+	if not is_async and not frappe.flags.in_test:
+		from frappe.deprecation_dumpster import deprecation_warning
+
+		deprecation_warning(
+			"unknown",
+			"v17",
+			"Using enqueue_many with is_async=False outside of tests is not recommended, use now=True instead.",
+		)
+
+	def call_directly():
+		return [frappe.call(method, **kwargs) for kwargs in kwargs_list]
+
+	if now or (not is_async and not frappe.flags.in_test):
+		return call_directly()
+
+	try:
+		q = get_queue(queue, is_async=is_async, priority=priority)
+	except ConnectionError:
+		if frappe.local.flags.in_migrate:
+			# If redis is not available during migration, execute the jobs directly
+			print(f"Redis queue is unreachable: Executing {get_method_name(method)} synchronously")
+			return call_directly()
+
+		raise
+
+	if chunk_size:
+		kwargs_list = [
+			{"method": method, "kwargs_list": chunk} for chunk in create_batch(list(kwargs_list), chunk_size)
+		]
+		method = run_batch
+
+	if not timeout:
+		timeout = get_queues_timeout().get(queue) or 300
+
+	method_name = get_method_name(method)
+	if method is run_batch:
+		method_name = f"{get_method_name(kwargs_list[0]['method'])} (batch)" if kwargs_list else method_name
+
+	on_failure = on_failure or truncate_failed_registry
+	job_datas = [
+		Queue.prepare_data(
+			"frappe.utils.background_jobs.execute_job",
+			kwargs={
+				"site": frappe.local.site,
+				"user": frappe.session.user,
+				"method": method,
+				"event": event,
+				"job_name": method_name,
+				"is_async": is_async,
+				"kwargs": kwargs,
+			},
+			on_success=Callback(func=on_success) if on_success else None,
+			on_failure=Callback(func=on_failure),
+			timeout=timeout,
+			at_front=at_front,
+			failure_ttl=frappe.conf.get("rq_job_failure_ttl") or RQ_JOB_FAILURE_TTL,
+			result_ttl=frappe.conf.get("rq_results_ttl") or RQ_RESULTS_TTL,
+			job_id=create_job_id(),
+		)
+		for kwargs in kwargs_list
+	]
+
+	def enqueue_calls():
+		if not job_datas:
+			return []
+
+		with q.connection.pipeline() as pipeline:
+			jobs = q.enqueue_many(job_datas, pipeline=pipeline)
+			pipeline.execute()
+
+		return jobs
+
+	if enqueue_after_commit:
+		frappe.db.after_commit.add(enqueue_calls)
+		return
+
+	return enqueue_calls()
+
+
+def run_batch(method: str | Callable, kwargs_list: list[dict]):
+	"""Call method for each of the keyword arguments, committing after each call."""
+	if isinstance(method, str):
+		method = frappe.get_attr(method)
+
+	for kwargs in kwargs_list:
+		method(**kwargs)
+		frappe.db.commit()
+
+
+def parallel_map(
+	method: str | Callable,
+	items: Iterable,
+	chunk_size: int = 100,
+	queue: str = "default",
+	timeout: int | None = None,
+	title: str | None = None,
+	is_async: bool = True,
+) -> str:
+	"""
+	Call method with each of the items in background workers, spreading chunks of items among jobs
+
+	Results and failures of calls are gathered in a group, which can be read using
+	`get_parallel_map`. Progress of the group is published for its id as task id.
+
+	:param method: method string or method object, called with an item as the only argument
+	:param items: arguments of each call of the method
+	:param chunk_size: number of items per job
+	:param title: title of progress
+	:return: id of the group
+	"""
+	items = list(items)
+	group_id = str(uuid4())
+	key = get_parallel_map_key(group_id)
+	meta = {"method": get_method_name(method), "total": len(items), "title": title}
+
+	frappe.cache.hset(key, "meta", meta)
+	frappe.cache.expire(frappe.cache.make_key(key), PARALLEL_MAP_TTL)
+
+	enqueue_many(
+		run_parallel_map_chunk,
+		(
+			{"method": method, "group_id": group_id, "start": i * chunk_size, "items": chunk}
+			for i, chunk in enumerate(create_batch(items, chunk_size))
+		),
+		queue=queue,
+		timeout=timeout,
+		is_async=is_async,
+	)
+	return group_id
+
+
+def run_parallel_map_chunk(method: str | Callable, group_id: str, start: int, items: list):
+	"""Call method with each item, adding its result or failure to the group."""
+	method_name = get_method_name(method)
+	if isinstance(method, str):
+		method = frappe.get_attr(method)
+
+	outcomes = {}
+	for index, item in enumerate(items, start):
+		try:
+			outcomes[index] = {"result": method(item)}
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(title=method_name)
+			outcomes[index] = {"error": frappe.get_traceback()}
+
+	key = frappe.cache.make_key(get_parallel_map_key(group_id))
+	pipeline = frappe.cache.pipeline()
+	pipeline.hset(key, mapping={str(i): frappe.cache.codec.dumps(v) for i, v in outcomes.items()})
+	pipeline.hlen(key)
+	pipeline.hget(key, "meta")
+	_, count, meta = pipeline.execute()
+
+	if meta:
+		meta = frappe.cache.codec.loads(meta)
+		done = count - 1  # excluding meta
+		frappe.publish_progress(
+			done * 100 / (meta["total"] or 1),
+			title=meta["title"],
+			description=f"{done}/{meta['total']}",
+			task_id=group_id,
+		)
+
+
+def get_parallel_map(group_id: str) -> frappe._dict | None:
+	"""Return status of a group created by `parallel_map`, with results and failures of calls done so far.
+
+	Results are ordered as the items, failures are tracebacks by index of the item."""
+	outcomes = frappe.cache.hgetall(get_parallel_map_key(group_id))
+	outcomes = {frappe.safe_decode(index): outcome for index, outcome in outcomes.items()}
+	meta = outcomes.pop("meta", None)
+	if not meta:
+		return
+
+	results = [None] * meta["total"]
+	failures = {}
+	for index, outcome in outcomes.items():
+		if "error" in outcome:
+			failures[int(index)] = outcome["error"]
+		else:
+			results[int(index)] = outcome["result"]
+
+	return frappe._dict(
+		method=meta["method"],
+		title=meta["title"],
+		total=meta["total"],
+		done=len(outcomes),
+		finished=len(outcomes) == meta["total"],
+		results=results,
+		failures=failures,
+	)
+
+
+def get_parallel_map_key(group_id: str) -> str:
+	return f"parallel_map:{group_id}"
+
+
+def get_method_name(method: str | Callable) -> str:
+	# a more readable name than <function $name at $address>
+	if isinstance(method, Callable):
+		return f"{method.__module__}.{method.__qualname__}"
+
+	return method
+
+
 def enqueue_doc(doctype, name=None, method=None, queue="default", timeout=300, now=False, **kwargs):
 	"""Enqueue a method to be run on a document"""
 	return enqueue(
@@ -209,10 +458,16 @@ def run_doc_method(doctype, name, doc_method, **kwargs):
 def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True, retry=0):
 	"""Executes job in a worker, performs commit/rollback and logs if there is any error"""
 	retval = None
+	failed = False
+	reused_context = False
+	setup_start = time.monotonic()
 
 	if is_async:
 		frappe.init(site)
-		frappe.connect()
+		if _site_contexts:
+			reused_context = _site_contexts.connect()
+		else:
+			frappe.connect()
 		if os.environ.get("CI"):
 			frappe.flags.in_test = True
 
@@ -235,6 +490,9 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 		kwargs=kwargs,
 		user=user,
 		after_job=CallbackManager(),
+		# microseconds taken to set up site, database connection and user
+		setup=int((time.monotonic() - setup_start) * 1000000),
+		reused_context=reused_context,
 	)
 
 	for before_job_task in frappe.get_hooks("before_job"):
@@ -244,6 +502,7 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 		retval = method(**kwargs)
 
 	except (frappe.db.InternalError, frappe.RetryBackgroundJobError) as e:
+		failed = True
 		frappe.db.rollback()
 
 		if retry < 5 and (
@@ -264,6 +523,7 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 			raise
 
 	except Exception as e:
+		failed = True
 		frappe.db.rollback()
 		frappe.log_error(title=method_name)
 		frappe.monitor.add_data_to_monitor(exception=e.__class__.__name__)
@@ -281,9 +541,91 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 		frappe.local.job.after_job.run()
 
 		if is_async:
+			if _site_contexts:
+				_site_contexts.release(failed=failed)
 			frappe.destroy()
 
 
+class SiteContextPool:
+	"""Database connections of sites kept open by a worker across jobs.
+
+	Connections of at most `size` sites are kept, least recently used ones are closed first. A
+	connection is closed after serving `max_jobs` jobs, or when a job using it fails."""
+
+	def __init__(self, size: int, max_jobs: int = DEFAULT_CONTEXT_MAX_JOBS):
+		self.size = size
+		self.max_jobs = max_jobs
+		self.contexts: OrderedDict[str, frappe._dict] = OrderedDict()
+
+	def connect(self) -> bool:
+		"""Connect to database of current site, reusing its kept connection if it is still usable.
+
+		Return True if a connection was reused."""
+		frappe.connect(set_admin_as_user=False)
+
+		context = self.contexts.pop(frappe.local.site, None)
+		reused = bool(context and reset_connection(context.conn))
+		if reused:
+			frappe.db.attach_connection(context.conn)
+
+		frappe.local.site_context = context if reused else frappe._dict(jobs=0)
+		frappe.set_user("Administrator")
+		return reused
+
+	def release(self, failed: bool = False) -> None:
+		"""Keep connection of current site for next jobs, unless it has to be recycled."""
+		context = getattr(frappe.local, "site_context", None)
+		db = getattr(frappe.local, "db", None)
+		if not (context and db and (conn := db.detach_connection())):
+			return
+
+		context.jobs += 1
+		if failed or context.jobs >= self.max_jobs:
+			close_connection(conn)
+			return
+
+		context.conn = conn
+		self.contexts[frappe.local.site] = context
+		while len(self.contexts) > self.size:
+			_site, evicted = self.contexts.popitem(last=False)
+			close_connection(evicted.conn)
+
+	def close(self) -> None:
+		while self.contexts:
+			_site, context = self.contexts.popitem()
+			close_connection(context.conn)
+
+
+def reset_connection(conn) -> bool:
+	"""Roll back anything left in the connection, return False if it is no longer usable."""
+	try:
+		# also checks that the connection is alive, in a single round trip
+		conn.rollback()
+		return True
+	except Exception:
+		close_connection(conn)
+		return False
+
+
+def close_connection(conn) -> None:
+	with suppress(Exception):
+		conn.close()
+
+
+def setup_site_contexts() -> None:
+	"""Keep database connections of sites across jobs if `worker_site_contexts` is set in common site
+	config, to the number of sites whose connections are kept by each worker.
+
+	Jobs then run in the worker's process instead of a forked one, `worker_context_max_jobs` jobs
+	(100 by default) can use a connection before it is opened again."""
+	global _site_contexts
+
+	if size := cint(frappe.conf.worker_site_contexts):
+		_site_contexts = SiteContextPool(
+			size, cint(frappe.conf.worker_context_max_jobs) or DEFAULT_CONTEXT_MAX_JOBS
+		)
+
+
 def start_worker(
 	queue: str | None = None,
 	quiet: bool = False,
@@ -307,6 +649,8 @@ def start_worker(
 		if queue:
 			queue = [q.strip() for q in queue.split(",")]
 		queues = get_queue_list(queue, build_queue_name=True)
+		setup_site_contexts()
+		worker_class = get_worker_class()
 
 	if os.environ.get("CI"):
 		setup_loghandlers("ERROR")
@@ -317,7 +661,7 @@ def start_worker(
 	if quiet:
 		logging_level = "WARNING"
 
-	worker = Worker(queues, connection=redis_connection)
+	worker = worker_class(queues, connection=redis_connection)
 	worker.work(
 		logging_level=logging_level,
 		burst=burst,
@@ -344,6 +688,183 @@ class FrappeWorker(Worker):
 		Thread(target=start_scheduler, daemon=True).start()
 
 
+class FrappeSimpleWorker(FrappeWorker, SimpleWorker):
+	"""Worker running jobs in its own process, used when database connections are kept across jobs."""
+
+
+class FairShareMixin:
+	"""Dequeue jobs from queues of sites in turns, when `fair_share_queues` is set in common site config.
+
+	Sites take turns by deficit round robin: in its turn, a site can run as many jobs as its
+	`background_jobs_weight` (1 by default). Sites already running `background_jobs_concurrency`
+	jobs (unlimited by default) from the worker's queues are skipped. Both can be set in site config,
+	or in common site config for all sites. Queues of a site are dequeued by priority, then in the
+	worker's order of queue types. Shared queues of the bench are dequeued last."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		conf = frappe.get_conf()
+		self.bench_id = get_bench_id()
+		self.default_limits = (
+			cint(conf.background_jobs_weight) or 1,
+			cint(conf.background_jobs_concurrency),
+		)
+		self.shared_queues = list(self.queues)
+		self.queue_types = [get_queue_type(q.name, self.bench_id) for q in self.shared_queues]
+		self.site_queues: dict[str, list[Queue]] = {}
+		self.site_limits: dict[str, tuple[int, int]] = {}  # site: (weight, concurrency)
+		self.turns: list[str] = []
+		self.deficits: dict[str, int] = {}
+		self.refreshed_at = 0.0
+		self.limits_loaded_at = 0.0
+
+	def dequeue_job_and_maintain_ttl(self, timeout, max_idle_time=None):
+		"""Dequeue next job, updating order of queues at least every `FAIR_SHARE_REFRESH_INTERVAL` seconds."""
+		if timeout is None:
+			# burst mode, doesn't wait for jobs
+			self.update_queues()
+			return super().dequeue_job_and_maintain_ttl(timeout, max_idle_time)
+
+		idle_until = time.monotonic() + max_idle_time if max_idle_time else None
+		while True:
+			self.update_queues()
+			wait = min(timeout, FAIR_SHARE_REFRESH_INTERVAL)
+			if idle_until:
+				wait = max(min(wait, math.ceil(idle_until - time.monotonic())), 1)
+
+			result = super().dequeue_job_and_maintain_ttl(wait, max_idle_time=wait)
+			if result or (idle_until and time.monotonic() >= idle_until):
+				return result
+
+	def reorder_queues(self, reference_queue):
+		"""Update turns of sites after a job is dequeued from a queue of a site."""
+		_qtype, site, _priority = parse_qname(reference_queue.name, self.bench_id)
+		if site not in self.deficits:
+			return
+
+		self.deficits[site] -= 1
+		if self.deficits[site] <= 0:
+			self.turns.remove(site)
+			self.turns.append(site)
+			self.deficits[site] += self.get_limits(site)[0]
+
+	def update_queues(self) -> None:
+		"""Order queues of sites in turns, skipping sites running as many jobs as allowed."""
+		now = time.monotonic()
+		if now - self.limits_loaded_at >= SITE_LIMITS_TTL:
+			self.site_limits.clear()
+			self.limits_loaded_at = now
+
+		if now - self.refreshed_at >= FAIR_SHARE_REFRESH_INTERVAL:
+			self.register()
+			self.find_site_queues()
+			self.refreshed_at = now
+
+		busy_sites = self.get_busy_sites()
+		self._ordered_queues = [
+			queue for site in self.turns if site not in busy_sites for queue in self.site_queues[site]
+		] + self.shared_queues
+		self.queues = [queue for queues in self.site_queues.values() for queue in queues] + self.shared_queues
+
+	def register(self) -> None:
+		"""Let sites enqueue jobs of the worker's queue types in their own queues, see `get_queue`."""
+		with self.connection.pipeline() as pipe:
+			for qtype in self.queue_types:
+				pipe.set(get_fair_share_workers_key(qtype), 1, ex=FAIR_SHARE_WORKERS_TTL)
+			pipe.execute()
+
+	def find_site_queues(self) -> None:
+		site_queues = defaultdict(list)
+		for queue in Queue.all(connection=self.connection):
+			if not queue.name.startswith(f"{self.bench_id}:"):
+				continue
+
+			qtype, site, priority = parse_qname(queue.name, self.bench_id)
+			if site and qtype in self.queue_types and priority in PRIORITIES:
+				site_queues[site].append(queue)
+
+		for site, queues in site_queues.items():
+			queues.sort(key=lambda q: self.get_queue_order(q))
+			if site not in self.deficits:
+				self.turns.append(site)
+				self.deficits[site] = self.get_limits(site)[0]
+
+		for site in set(self.deficits) - set(site_queues):
+			self.turns.remove(site)
+			del self.deficits[site]
+
+		self.site_queues = dict(site_queues)
+
+	def get_queue_order(self, queue: Queue) -> tuple[int, int]:
+		qtype, _site, priority = parse_qname(queue.name, self.bench_id)
+		return PRIORITIES.index(priority), self.queue_types.index(qtype)
+
+	def get_limits(self, site: str) -> tuple[int, int]:
+		"""Return weight and maximum concurrent jobs (0 for unlimited) of site."""
+		if site not in self.site_limits:
+			weight, concurrency = self.default_limits
+			with suppress(Exception):
+				conf = frappe.get_file_json(os.path.join(site, "site_config.json"))
+				weight = cint(conf.get("background_jobs_weight")) or weight
+				concurrency = cint(conf.get("background_jobs_concurrency")) or concurrency
+
+			self.site_limits[site] = (weight, concurrency)
+
+		return self.site_limits[site]
+
+	def get_busy_sites(self) -> set[str]:
+		"""Return sites running as many jobs as allowed, from queues of the worker."""
+		limited_sites = [site for site in self.turns if self.get_limits(site)[1]]
+		if not limited_sites:
+			return set()
+
+		now = time.time()
+		pipeline = self.connection.pipeline()
+		for site in limited_sites:
+			for queue in self.site_queues[site]:
+				# started jobs are scored by the time they expire
+				pipeline.zcount(queue.started_job_registry.key, now, "+inf")
+
+		counts = iter(pipeline.execute())
+		return {
+			site
+			for site in limited_sites
+			if sum(next(counts) for _ in self.site_queues[site]) >= self.get_limits(site)[1]
+		}
+
+
+class FairShareWorker(FairShareMixin, Worker):
+	pass
+
+
+class FairShareSimpleWorker(FairShareMixin, SimpleWorker):
+	pass
+
+
+class FrappeFairShareWorker(FairShareMixin, FrappeWorker):
+	pass
+
+
+class FrappeFairShareSimpleWorker(FairShareMixin, FrappeSimpleWorker):
+	pass
+
+
+def get_worker_class(with_scheduler: bool = False) -> type[Worker]:
+	"""Return class of workers as per config, `with_scheduler` for workers of a pool."""
+	# connections can only be kept if jobs run in the worker's process
+	in_process = bool(_site_contexts)
+	return {
+		(False, False, False): Worker,
+		(False, True, False): SimpleWorker,
+		(False, False, True): FairShareWorker,
+		(False, True, True): FairShareSimpleWorker,
+		(True, False, False): FrappeWorker,
+		(True, True, False): FrappeSimpleWorker,
+		(True, False, True): FrappeFairShareWorker,
+		(True, True, True): FrappeFairShareSimpleWorker,
+	}[(with_scheduler, in_process, is_fair_share_enabled())]
+
+
 def start_worker_pool(
 	queue: str | None = None,
 	num_workers: int = 1,
@@ -376,6 +897,8 @@ def start_worker_pool(
 		if queue:
 			queue = [q.strip() for q in queue.split(",")]
 		queues = get_queue_list(queue, build_queue_name=True)
+		setup_site_contexts()
+		worker_class = get_worker_class(with_scheduler=True)
 
 	if os.environ.get("CI"):
 		setup_loghandlers("ERROR")
@@ -389,7 +912,7 @@ def start_worker_pool(
 		queues=queues,
 		connection=redis_connection,
 		num_workers=num_workers,
-		worker_class=FrappeWorker,  # Auto starts scheduler with workerpool
+		worker_class=worker_class,  # Auto starts scheduler with workerpool
 	)
 	pool.start(logging_level=logging_level, burst=burst)
 
@@ -423,8 +946,11 @@ def get_jobs(site=None, queue=None, key="method"):
 			# optional keyword arguments are stored in 'kwargs' of 'kwargs'
 			jobs_per_site[job.kwargs["site"]].append(job.kwargs["kwargs"][key])
 
-	for _queue in get_queue_list(queue):
-		q = get_queue(_queue)
+	queue_types = get_queue_list(queue)
+	for q in get_queues():
+		if get_queue_type(q.name) not in queue_types:
+			continue
+
 		jobs = q.jobs + get_running_jobs_in_queue(q)
 		for job in jobs:
 			if job.kwargs.get("site"):
@@ -470,16 +996,51 @@ def get_running_jobs_in_queue(queue):
 	return jobs
 
 
-def get_queue(qtype: str, is_async: bool = True) -> Queue:
+def get_queue(qtype: str, is_async: bool = True, priority: str | None = None) -> Queue:
 	"""
 	Return a Queue object tied to a redis connection.
 
+	If fair share queues are enabled and fair share workers are running for the queue type, this is
+	the queue of current site.
+
 	:param qtype: Queue type, should be either long, default or short
 	:param is_async: Whether the job should be executed asynchronously or in the same process
+	:param priority: "high" or "low", for queues of a site
 	:return: Queue object
 	"""
 	validate_queue(qtype)
-	return Queue(generate_qname(qtype), connection=get_redis_conn(), is_async=is_async)
+	if priority not in PRIORITIES:
+		frappe.throw(_("Priority should be one of {0}").format(", ".join(p for p in PRIORITIES if p)))
+
+	site = None
+	if is_fair_share_enabled() and has_fair_share_workers(qtype):
+		site = getattr(frappe.local, "site", None)
+
+	return Queue(
+		generate_qname(qtype, site=site, priority=priority if site else None),
+		connection=get_redis_conn(),
+		is_async=is_async,
+	)
+
+
+@lru_cache
+def is_fair_share_enabled() -> bool:
+	"""Return True if workers dequeue jobs of sites in turns, see `FairShareMixin`.
+
+	Only read from common site config, since workers pick their class from it when they start.
+	Read once per process, as workers are restarted to enable it."""
+	return bool(frappe.get_common_site_config().fair_share_queues)
+
+
+def has_fair_share_workers(qtype: str) -> bool:
+	"""Return True if fair share workers are listening to queues of sites of the queue type.
+
+	Jobs stay in the shared queue otherwise, e.g. till workers are restarted after enabling it."""
+	return bool(get_redis_conn().exists(get_fair_share_workers_key(qtype)))
+
+
+def get_fair_share_workers_key(qtype: str) -> str:
+	return f"{get_bench_id()}:fair_share_workers:{qtype}"
 
 
 def validate_queue(queue: str, default_queue_list: list | None = None) -> None:
@@ -560,20 +1121,61 @@ def get_queues(connection=None) -> list[Queue]:
 	return [q for q in queues if is_queue_accessible(q)]
 
 
-def generate_qname(qtype: str) -> str:
-	"""Generate qname by combining bench ID and queue type.
+def generate_qname(qtype: str, site: str | None = None, priority: str | None = None) -> str:
+	"""Generate qname by combining bench ID and queue type, and site and priority for queues of a site.
 
 	qnames are useful to define namespaces of customers.
 	"""
 	if isinstance(qtype, list):
 		qtype = ",".join(qtype)
-	return f"{get_bench_id()}:{qtype}"
+
+	qname = f"{get_bench_id()}:{qtype}"
+	if site:
+		qname += f":{site}"
+		if priority:
+			qname += f":{priority}"
+
+	return qname
+
+
+def parse_qname(qname: str, bench_id: str | None = None) -> tuple[str, str | None, str | None]:
+	"""Return queue type, site and priority of a queue of the bench."""
+	qtype, _, site = qname.removeprefix(f"{bench_id or get_bench_id()}:").partition(":")
+	site, _, priority = site.partition(":")
+	return qtype, site or None, priority or None
+
+
+def get_queue_type(qname: str, bench_id: str | None = None) -> str:
+	return parse_qname(qname, bench_id)[0]
 
 
 def is_queue_accessible(qobj: Queue) -> bool:
 	"""Checks whether queue is relate to current bench or not."""
-	accessible_queues = [generate_qname(q) for q in list(get_queues_timeout())]
-	return qobj.name in accessible_queues
+	bench_id = get_bench_id()
+	if not qobj.name.startswith(f"{bench_id}:"):
+		return False
+
+	return get_queue_type(qobj.name, bench_id) in get_queues_timeout()
+
+
+def get_pending_jobs_by_site(qtype: str) -> dict[str, int]:
+	"""Return number of jobs waiting in queues of a type by site."""
+	bench_id = get_bench_id()
+	pending_jobs = defaultdict(int)
+
+	for queue in get_queues():
+		queue_type, site, _priority = parse_qname(queue.name, bench_id)
+		if queue_type != qtype:
+			continue
+
+		if site:
+			pending_jobs[site] += queue.count
+		else:
+			# job ids are namespaced by site, see `create_job_id`
+			for job_id in queue.get_job_ids():
+				pending_jobs[job_id.split("::", 1)[0]] += 1
+
+	return dict(pending_jobs)
 
 
 def enqueue_test_job():
@@ -0,0 +1,181 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Codecs used by `RedisWrapper` to serialize cached values.
+
+`PickleCodec` is the default and stores plain pickles. `DocumentCodec` produces pickles too, but
+documents are reduced to their state and child tables are stored column-wise: each table is
+stored as one tuple of column names followed by a tuple of values per row, instead of a full
+object (class reference, attribute names and values) per row. Since the output is still a
+pickle, values written by either codec can be read by the other.
+
+Any codec can be wrapped in `CompressedCodec` to compress payloads above a size threshold.
+
+Configuration (common_site_config.json):
+
+- `redis_cache_codec`: "pickle" (default), "document" or dotted path to a `Codec` class.
+- `redis_cache_compression`: "zlib", "zstd" (needs `zstandard`) or "lz4" (needs `lz4`).
+- `redis_cache_compression_threshold`: minimum payload size in bytes to compress, default 16 KiB.
+"""
+
+import io
+import pickle
+import weakref
+import zlib
+
+import frappe
+
+# Compressed payloads are prefixed with a null byte followed by the algorithm's marker. Pickles
+# always start with the PROTO opcode (0x80), so uncompressed values remain readable as is.
+COMPRESSION_MARKER = b"\x00"
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+# Derived attributes on Meta that hold references to child rows, rebuilt on load
+META_FIELD_CACHES = ("_fields", "_table_fields", "_dynamic_link_fields", "_set_only_once_fields")
+
+
+class Codec:
+	def dumps(self, value) -> bytes:
+		raise NotImplementedError
+
+	def loads(self, data: bytes):
+		raise NotImplementedError
+
+
+class PickleCodec(Codec):
+	def dumps(self, value) -> bytes:
+		return pickle.dumps(value)
+
+	def loads(self, data: bytes):
+		return pickle.loads(data)
+
+
+class DocumentPickler(pickle.Pickler):
+	def reducer_override(self, obj):
+		from frappe.model.base_document import BaseDocument
+
+		if isinstance(obj, BaseDocument):
+			return _reduce_document(obj)
+
+		return NotImplemented
+
+
+class DocumentCodec(PickleCodec):
+	"""Compact, schema-aware encoding for `Document` and `Meta` objects."""
+
+	def dumps(self, value) -> bytes:
+		buffer = io.BytesIO()
+		DocumentPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+		return buffer.getvalue()
+
+
+class CompressedCodec(Codec):
+	"""Compress payloads of the wrapped codec that are larger than `threshold` bytes."""
+
+	def __init__(self, codec: Codec, algorithm: str = "zlib", threshold: int = DEFAULT_COMPRESSION_THRESHOLD):
+		self.codec = codec
+		self.threshold = threshold
+		self.marker, self.compress, _ = get_compressor(algorithm)
+
+	def dumps(self, value) -> bytes:
+		data = self.codec.dumps(value)
+		if len(data) < self.threshold:
+			return data
+
+		return COMPRESSION_MARKER + self.marker + self.compress(data)
+
+	def loads(self, data: bytes):
+		if data[:1] == COMPRESSION_MARKER:
+			_, _, decompress = get_compressor(data[1:2])
+			data = decompress(data[2:])
+
+		return self.codec.loads(data)
+
+
+def get_compressor(algorithm: str | bytes):
+	"""Return (marker, compress, decompress) for given algorithm name or marker."""
+	if algorithm in ("zlib", b"z"):
+		return b"z", zlib.compress, zlib.decompress
+
+	if algorithm in ("zstd", b"Z"):
+		import zstandard
+
+		return b"Z", zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+
+	if algorithm in ("lz4", b"L"):
+		import lz4.frame
+
+		return b"L", lz4.frame.compress, lz4.frame.decompress
+
+	raise ValueError(f"Unknown compression algorithm: {algorithm}")
+
+
+def get_codec() -> Codec:
+	"""Return codec configured for this bench."""
+	codec = frappe.conf.get("redis_cache_codec") or "pickle"
+	if codec == "pickle":
+		codec = PickleCodec()
+	elif codec == "document":
+		codec = DocumentCodec()
+	else:
+		codec = frappe.get_attr(codec)()
+
+	if algorithm := frappe.conf.get("redis_cache_compression"):
+		threshold = frappe.conf.get("redis_cache_compression_threshold") or DEFAULT_COMPRESSION_THRESHOLD
+		codec = CompressedCodec(codec, algorithm, int(threshold))
+
+	return codec
+
+
+def _reduce_document(doc):
+	from frappe.model.base_document import BaseDocument
+
+	state = doc.__getstate__()
+
+	tables = {}
+	for fieldname in doc._table_fieldnames:
+		rows = state.get(fieldname)
+		if isinstance(rows, list) and all(isinstance(row, BaseDocument) for row in rows):
+			tables[fieldname] = _encode_rows(state.pop(fieldname))
+
+	if getattr(doc, "_metaclass", False):
+		for attr in META_FIELD_CACHES:
+			state.pop(attr, None)
+
+	return _rebuild_document, (type(doc), state, tables)
+
+
+def _encode_rows(rows):
+	"""Group consecutive rows having the same class and fields, store only values for each row."""
+	groups = []
+	row_cls = fields = None
+	for row in rows:
+		state = row.__getstate__()
+		if type(row) is not row_cls or state.keys() != fields:
+			row_cls, fields = type(row), set(state)
+			groups.append((row_cls, tuple(state), []))
+
+		columns, values = groups[-1][1:]
+		values.append(tuple(state[column] for column in columns))
+
+	return groups
+
+
+def _rebuild_document(cls, state, tables):
+	doc = cls.__new__(cls)
+	doc.__dict__.update(state)
+
+	for fieldname, groups in tables.items():
+		rows = doc.__dict__[fieldname] = []
+		parent_ref = weakref.ref(doc)
+		for row_cls, columns, values in groups:
+			for row_values in values:
+				row = row_cls.__new__(row_cls)
+				row.__dict__.update(zip(columns, row_values, strict=True))
+				row._parent_doc = parent_ref
+				rows.append(row)
+
+	if getattr(doc, "_metaclass", False):
+		doc.init_field_caches()
+
+	return doc
@@ -1,7 +1,10 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import os
 import pickle
 import re
+import threading
+from collections import OrderedDict
 from contextlib import suppress
 
 import redis
@@ -9,6 +12,7 @@ from redis.commands.search import Search
 
 import frappe
 from frappe.utils import cstr
+from frappe.utils.redis_codec import Codec, PickleCodec, get_codec
 
 
 class RedisearchWrapper(Search):
@@ -25,9 +29,166 @@ class RedisearchWrapper(Search):
 		return super().sugget(self.client.make_key(key), *args, **kwargs)
 
 
+# Number of keys fetched per SCAN call and deleted per UNLINK call
+SCAN_BATCH_SIZE = 1000
+
+# Member keeping an index set in place once its keys are deleted, see `RedisWrapper.delete_index`
+INDEX_SENTINEL = b""
+
+CLIENT_CACHE_INVALIDATION_CHANNEL = "frappe:client_cache_invalidation"
+
+# Keys (without the site prefix) that are kept in the per-process client cache by default
+DEFAULT_CLIENT_CACHE_KEYS = ("doctype_meta", "document_cache::", "bootinfo")
+
+
+class ClientCache:
+	"""Bounded in-process LRU that sits in front of Redis and outlives a single request.
+
+	Entries are sized by the length of their pickled payload and evicted least recently
+	used first once `maxsize` bytes are exceeded. Consistency across workers is kept by
+	publishing the affected keys on `CLIENT_CACHE_INVALIDATION_CHANNEL` whenever they are
+	written or deleted; every process listens on that channel and drops its own copy.
+
+	Keys are either the full redis key (bytes) or a `(hash_name, field)` tuple for hashes.
+	Values are kept serialized as they are in redis, every read decodes its own copy, so that
+	objects mutated while handling a request (e.g. Meta or cached documents) aren't shared.
+	"""
+
+	def __init__(self, maxsize: int, cached_keys: tuple[str, ...] = DEFAULT_CLIENT_CACHE_KEYS):
+		self.maxsize = maxsize
+		self.cached_keys = tuple(k.encode() for k in cached_keys)
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+		# incremented on every invalidation, used to detect values that went stale mid-fetch
+		self.generation = 0
+
+		self._data: OrderedDict = OrderedDict()
+		self._hash_fields: dict[bytes, set] = {}
+		self._lock = threading.RLock()
+		self._listener = None
+		self._listener_pid = None
+
+	def is_cacheable(self, key: bytes) -> bool:
+		_, _, unprefixed = key.partition(b"|")
+		return unprefixed.startswith(self.cached_keys)
+
+	def get(self, key) -> tuple[bool, object]:
+		with self._lock:
+			try:
+				value, _ = self._data[key]
+			except KeyError:
+				self.misses += 1
+				return False, None
+
+			self._data.move_to_end(key)
+			self.hits += 1
+			return True, value
+
+	def set(self, key, value, size: int, generation: int) -> None:
+		"""Store value unless an invalidation happened since `generation` was read."""
+		if size > self.maxsize:
+			return
+
+		with self._lock:
+			if generation != self.generation or not self.is_listening():
+				return
+
+			self._pop(key)
+			self._data[key] = (value, size)
+			self.size += size
+			if isinstance(key, tuple):
+				self._hash_fields.setdefault(key[0], set()).add(key[1])
+
+			while self.size > self.maxsize:
+				self._pop(next(iter(self._data)))
+
+	def invalidate(self, keys) -> None:
+		with self._lock:
+			self.generation += 1
+			for key in keys:
+				self._pop(key)
+				# deleting a hash drops all of its fields
+				if not isinstance(key, tuple):
+					for field in self._hash_fields.pop(key, ()):
+						self._pop((key, field))
+
+	def clear(self) -> None:
+		with self._lock:
+			self.generation += 1
+			self._data.clear()
+			self._hash_fields.clear()
+			self.size = 0
+
+	def _pop(self, key) -> None:
+		if (entry := self._data.pop(key, None)) is None:
+			return
+
+		self.size -= entry[1]
+		if isinstance(key, tuple) and (fields := self._hash_fields.get(key[0])):
+			fields.discard(key[1])
+			if not fields:
+				del self._hash_fields[key[0]]
+
+	def is_listening(self) -> bool:
+		return self._listener is not None and self._listener_pid == os.getpid() and self._listener.is_alive()
+
+	def listen(self, client: "RedisWrapper") -> None:
+		"""Subscribe to invalidation messages in a daemon thread.
+
+		Anything cached before the subscription (or inherited through a fork) can't be
+		trusted, so the cache is flushed whenever the listener is (re)started."""
+		if self.is_listening():
+			return
+
+		with self._lock:
+			if self.is_listening():
+				return
+
+			self.clear()
+			pubsub = client.pubsub(ignore_subscribe_messages=True)
+			pubsub.subscribe(**{CLIENT_CACHE_INVALIDATION_CHANNEL: self._on_message})
+			self._listener = pubsub.run_in_thread(
+				sleep_time=1, daemon=True, exception_handler=self._on_listener_error
+			)
+			self._listener_pid = os.getpid()
+
+	def _on_message(self, message) -> None:
+		with suppress(Exception):
+			self.invalidate(pickle.loads(message["data"]))
+
+	def _on_listener_error(self, exc, pubsub, thread) -> None:
+		# invalidations may have been missed, stop serving from memory until reconnected
+		thread.stop()
+		with suppress(Exception):
+			pubsub.close()
+		self._listener = None
+		self.clear()
+
+	def publish(self, client: "RedisWrapper", keys, pipeline: redis.client.Pipeline | None = None) -> None:
+		"""Drop `keys` locally and tell every other process to do the same.
+
+		:param pipeline: Queue the notification in this pipeline instead of publishing right away
+		"""
+		if not keys:
+			return
+
+		self.invalidate(keys)
+		message = pickle.dumps(list(keys))
+		if pipeline is not None:
+			pipeline.publish(CLIENT_CACHE_INVALIDATION_CHANNEL, message)
+			return
+
+		with suppress(redis.exceptions.ConnectionError):
+			client.publish(CLIENT_CACHE_INVALIDATION_CHANNEL, message)
+
+
 class RedisWrapper(redis.Redis):
 	"""Redis client that will automatically prefix conf.db_name"""
 
+	client_cache: ClientCache | None = None
+	codec: Codec = PickleCodec()
+
 	def connected(self):
 		try:
 			self.ping()
@@ -50,13 +211,14 @@ class RedisWrapper(redis.Redis):
 
 		return f"{frappe.conf.db_name}|{key}".encode()
 
-	def set_value(self, key, val, user=None, expires_in_sec=None, shared=False):
+	def set_value(self, key, val, user=None, expires_in_sec=None, shared=False, index=None):
 		"""Sets cache value.
 
 		:param key: Cache key
 		:param val: Value to be cached
 		:param user: Prepends key with User
 		:param expires_in_sec: Expire value of this key in X seconds
+		:param index: Register the key in this set so that it can be removed with `delete_index`
 		"""
 		key = self.make_key(key, user, shared)
 
@@ -64,7 +226,16 @@ class RedisWrapper(redis.Redis):
 			frappe.local.cache[key] = val
 
 		with suppress(redis.exceptions.ConnectionError):
-			self.set(name=key, value=pickle.dumps(val), ex=expires_in_sec)
+			if index:
+				pipeline = self.pipeline()
+				pipeline.set(name=key, value=self.codec.dumps(val), ex=expires_in_sec)
+				pipeline.sadd(self.make_key(index, shared=shared), key)
+				pipeline.execute()
+			else:
+				self.set(name=key, value=self.codec.dumps(val), ex=expires_in_sec)
+
+		if self._use_client_cache(key):
+			self.client_cache.publish(self, (key,))
 
 	def get_value(self, key, generator=None, user=None, expires=False, shared=False):
 		"""Return cache value. If not found and generator function is
@@ -81,14 +252,7 @@ class RedisWrapper(redis.Redis):
 			val = frappe.local.cache[key]
 
 		else:
-			val = None
-			try:
-				val = self.get(key)
-			except redis.exceptions.ConnectionError:
-				pass
-
-			if val is not None:
-				val = pickle.loads(val)
+			val = self._get_through_client_cache(key, lambda: self.get(key), skip=expires)
 
 			if not expires:
 				if val is None and generator:
@@ -100,6 +264,103 @@ class RedisWrapper(redis.Redis):
 
 		return val
 
+	def get_values(self, keys, user=None, shared=False) -> list:
+		"""Return values of multiple cache keys, `None` for missing ones.
+
+		Values not available in memory are fetched with a single MGET."""
+		keys = [self.make_key(key, user, shared) for key in keys]
+		values = {}
+		to_fetch = []
+
+		for key in keys:
+			if key in frappe.local.cache:
+				values[key] = frappe.local.cache[key]
+				continue
+
+			if self._use_client_cache(key):
+				with suppress(redis.exceptions.ConnectionError):
+					self.client_cache.listen(self)
+				found, raw = self.client_cache.get(key)
+				if found:
+					values[key] = frappe.local.cache[key] = self.codec.loads(raw)
+					continue
+
+			to_fetch.append(key)
+
+		if to_fetch:
+			generation = self.client_cache.generation if self.client_cache else None
+			fetched = []
+			with suppress(redis.exceptions.ConnectionError):
+				fetched = self.mget(to_fetch)
+
+			for key, raw in zip(to_fetch, fetched, strict=False):
+				if raw is None:
+					continue
+
+				values[key] = frappe.local.cache[key] = self.codec.loads(raw)
+				if self._use_client_cache(key):
+					self.client_cache.set(key, raw, len(raw), generation)
+
+		return [values.get(key) for key in keys]
+
+	def set_values(self, mapping: dict, user=None, shared=False, index=None):
+		"""Set multiple cache values in a single pipeline.
+
+		:param mapping: Dict of cache key and value to be cached
+		:param index: Register the keys in this set so that they can be removed with `delete_index`
+		"""
+		if not mapping:
+			return
+
+		pipeline = self.pipeline()
+		keys = []
+		for key, val in mapping.items():
+			key = self.make_key(key, user, shared)
+			keys.append(key)
+			frappe.local.cache[key] = val
+			pipeline.set(name=key, value=self.codec.dumps(val))
+
+		if index:
+			pipeline.sadd(self.make_key(index, shared=shared), *keys)
+
+		with suppress(redis.exceptions.ConnectionError):
+			pipeline.execute()
+
+		if self.client_cache:
+			self.client_cache.publish(self, [k for k in keys if self.client_cache.is_cacheable(k)])
+
+	def _use_client_cache(self, key: bytes) -> bool:
+		return self.client_cache is not None and self.client_cache.is_cacheable(key)
+
+	def _get_through_client_cache(self, key, fetch, skip=False):
+		"""Return decoded value of `fetch()`, serving it from the client cache when possible.
+
+		:param key: Client cache key, full redis key or `(hash_name, field)` tuple
+		:param fetch: Function that returns the raw value from redis
+		:param skip: Bypass the client cache, e.g. for values with an expiry
+		"""
+		client_cache = None
+		if not skip and self._use_client_cache(key[0] if isinstance(key, tuple) else key):
+			client_cache = self.client_cache
+			with suppress(redis.exceptions.ConnectionError):
+				client_cache.listen(self)
+			found, raw = client_cache.get(key)
+			if found:
+				return self.codec.loads(raw)
+			generation = client_cache.generation
+
+		raw = None
+		with suppress(redis.exceptions.ConnectionError):
+			raw = fetch()
+
+		if raw is None:
+			return None
+
+		if client_cache:
+			client_cache.set(key, raw, len(raw), generation)
+
+		return self.codec.loads(raw)
+
 	def get_all(self, key):
 		ret = {}
 		for k in self.get_keys(key):
@@ -108,10 +369,12 @@ class RedisWrapper(redis.Redis):
 		return ret
 
 	def get_keys(self, key):
-		"""Return keys starting with `key`."""
+		"""Return keys starting with `key`.
+
+		Uses incremental SCAN instead of KEYS so that redis isn't blocked for other clients."""
 		try:
 			key = self.make_key(key + "*")
-			return self.keys(key)
+			return list(dict.fromkeys(self.scan_iter(match=key, count=SCAN_BATCH_SIZE)))
 
 		except redis.exceptions.ConnectionError:
 			regex = re.compile(cstr(key).replace("|", r"\|").replace("*", r"[\w]*"))
@@ -119,13 +382,46 @@ class RedisWrapper(redis.Redis):
 
 	def delete_keys(self, key):
 		"""Delete keys with wildcard `*`."""
-		self.delete_value(self.get_keys(key), make_keys=False)
+		keys = self.get_keys(key)
+		for i in range(0, len(keys), SCAN_BATCH_SIZE):
+			self.delete_value(keys[i : i + SCAN_BATCH_SIZE], make_keys=False)
+
+	def delete_index(self, index, shared=False, prefix=None):
+		"""Delete all keys registered in the `index` set via `set_value`.
+
+		Costs O(registered keys) instead of scanning the whole keyspace. Deleted keys are
+		removed from the set rather than dropping the set, so keys registered concurrently
+		aren't lost.
+
+		:param prefix: Prefix of all keys registered in the index. If the set is missing (e.g.
+		evicted while its keys weren't), keys with this prefix are deleted by scanning instead. The
+		set is then kept in place, so that scanning is only needed again if it is evicted again."""
+		_index = self.make_key(index, shared=shared)
+		try:
+			if prefix is not None and not super().exists(_index):
+				self.delete_keys(prefix)
+				super().sadd(_index, INDEX_SENTINEL)
+				return
+
+			keys = list(dict.fromkeys(self.sscan_iter(_index, count=SCAN_BATCH_SIZE)))
+		except redis.exceptions.ConnectionError:
+			return
+
+		keys = [key for key in keys if key != INDEX_SENTINEL]
+		for i in range(0, len(keys), SCAN_BATCH_SIZE):
+			batch = keys[i : i + SCAN_BATCH_SIZE]
+			self.delete_value(batch, make_keys=False)
+			with suppress(redis.exceptions.ConnectionError):
+				super().srem(_index, *batch)
 
 	def delete_key(self, *args, **kwargs):
 		self.delete_value(*args, **kwargs)
 
-	def delete_value(self, keys, user=None, make_keys=True, shared=False):
-		"""Delete value, list of values."""
+	def delete_value(self, keys, user=None, make_keys=True, shared=False, index=None):
+		"""Delete value, list of values.
+
+		:param index: Also remove the keys from this index set, see `set_value`
+		"""
 		if not keys:
 			return
 
@@ -139,10 +435,19 @@ class RedisWrapper(redis.Redis):
 			frappe.local.cache.pop(key, None)
 
 		try:
-			self.unlink(*keys)
+			if index:
+				pipeline = self.pipeline()
+				pipeline.unlink(*keys)
+				pipeline.srem(self.make_key(index, shared=shared), *keys)
+				pipeline.execute()
+			else:
+				self.unlink(*keys)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if self.client_cache:
+			self.client_cache.publish(self, [k for k in keys if self.client_cache.is_cacheable(k)])
+
 	def lpush(self, key, value):
 		return super().lpush(self.make_key(key), value)
 
@@ -183,10 +488,13 @@ class RedisWrapper(redis.Redis):
 
 		# set in redis
 		try:
-			super().hset(_name, key, pickle.dumps(value), *args, **kwargs)
+			super().hset(_name, key, self.codec.dumps(value), *args, **kwargs)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if self._use_client_cache(_name):
+			self.client_cache.publish(self, ((_name, key),))
+
 	def hexists(self, name: str, key: str, shared: bool = False) -> bool:
 		if key is None:
 			return False
@@ -206,7 +514,7 @@ class RedisWrapper(redis.Redis):
 
 	def hgetall(self, name):
 		value = super().hgetall(self.make_key(name))
-		return {key: pickle.loads(value) for key, value in value.items()}
+		return {key: self.codec.loads(value) for key, value in value.items()}
 
 	def hget(self, name, key, generator=None, shared=False):
 		_name = self.make_key(name, shared=shared)
@@ -219,14 +527,11 @@ class RedisWrapper(redis.Redis):
 		if key in frappe.local.cache[_name]:
 			return frappe.local.cache[_name][key]
 
-		value = None
-		try:
-			value = super().hget(_name, key)
-		except redis.exceptions.ConnectionError:
-			pass
+		value = self._get_through_client_cache(
+			(_name, key), lambda: super(RedisWrapper, self).hget(_name, key)
+		)
 
 		if value is not None:
-			value = pickle.loads(value)
 			frappe.local.cache[_name][key] = value
 		elif generator:
 			value = generator()
@@ -251,18 +556,7 @@ class RedisWrapper(redis.Redis):
 		_name = self.make_key(name, shared=shared)
 
 		name_in_local_cache = _name in frappe.local.cache
-
-		if not isinstance(keys, list | tuple):
-			if name_in_local_cache and keys in frappe.local.cache[_name]:
-				del frappe.local.cache[_name][keys]
-			if pipeline:
-				pipeline.hdel(_name, keys)
-			else:
-				try:
-					super().hdel(_name, keys)
-				except redis.exceptions.ConnectionError:
-					pass
-			return
+		fields = keys if isinstance(keys, list | tuple) else (keys,)
 
 		local_pipeline = False
 
@@ -270,12 +564,16 @@ class RedisWrapper(redis.Redis):
 			pipeline = self.pipeline()
 			local_pipeline = True
 
-		for key in keys:
+		for key in fields:
 			if name_in_local_cache:
 				if key in frappe.local.cache[_name]:
 					del frappe.local.cache[_name][key]
 			pipeline.hdel(_name, key)
 
+		if self._use_client_cache(_name):
+			# queued after HDEL so that other processes can't re-read the old value
+			self.client_cache.publish(self, [(_name, field) for field in fields], pipeline=pipeline)
+
 		if local_pipeline:
 			try:
 				pipeline.execute()
@@ -352,12 +650,25 @@ def setup_cache():
 			master_username=frappe.conf.get("redis_cache_master_username"),
 			master_password=frappe.conf.get("redis_cache_master_password"),
 		)
-		return sentinel.master_for(
+		client = sentinel.master_for(
 			frappe.conf.get("redis_cache_master_service"),
 			redis_class=RedisWrapper,
 		)
+	else:
+		client = RedisWrapper.from_url(frappe.conf.get("redis_cache"))
+
+	client.codec = get_codec()
+	setup_client_cache(client)
+	return client
+
+
+def setup_client_cache(client: RedisWrapper):
+	"""Enable the per-process client cache if `client_cache_size` (in bytes) is configured.
 
-	return RedisWrapper.from_url(frappe.conf.get("redis_cache"))
+	Keys to be cached can be overridden with `client_cache_keys`."""
+	if maxsize := frappe.conf.get("client_cache_size"):
+		cached_keys = tuple(frappe.conf.get("client_cache_keys") or DEFAULT_CLIENT_CACHE_KEYS)
+		client.client_cache = ClientCache(maxsize=int(maxsize), cached_keys=cached_keys)
 
 
 def get_sentinel_connection(
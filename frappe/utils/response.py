@@ -14,6 +14,7 @@ from urllib.parse import quote
 
 import werkzeug.utils
 from werkzeug.exceptions import Forbidden, NotFound
+from werkzeug.http import is_resource_modified
 from werkzeug.local import LocalProxy
 from werkzeug.wrappers import Response
 from werkzeug.wsgi import wrap_file
@@ -25,6 +26,7 @@ import frappe.utils
 from frappe import _
 from frappe.core.doctype.access_log.access_log import make_access_log
 from frappe.utils import format_timedelta
+from frappe.utils.response_encoding import set_json_body
 
 if TYPE_CHECKING:
 	from frappe.core.doctype.file.file import File
@@ -34,27 +36,15 @@ def report_error(status_code):
 	"""Build error. Show traceback in developer mode"""
 	from frappe.api import ApiVersion, get_api_version
 
-	allow_traceback = (
-		(frappe.get_system_settings("allow_error_traceback") if frappe.db else False)
-		and not frappe.local.flags.disable_traceback
-		and (status_code != 404 or frappe.conf.logging)
-	)
-
-	traceback = frappe.utils.get_traceback()
-	exc_type, exc_value, _ = sys.exc_info()
-
 	match get_api_version():
 		case ApiVersion.V1:
-			if allow_traceback:
+			if _allow_traceback(status_code):
+				traceback = frappe.utils.get_traceback()
 				frappe.errprint(traceback)
 				frappe.response.exception = traceback.splitlines()[-1]
-			frappe.response["exc_type"] = exc_type.__name__
+			frappe.response["exc_type"] = sys.exc_info()[0].__name__
 		case ApiVersion.V2:
-			error_log = {"type": exc_type.__name__}
-			if allow_traceback:
-				error_log["exception"] = traceback
-			_link_error_with_message_log(error_log, exc_value, frappe.message_log)
-			frappe.local.response.errors = [error_log]
+			frappe.local.response.errors = [get_error_log(status_code)]
 
 	response = build_response("json")
 	response.status_code = status_code
@@ -62,6 +52,26 @@ def report_error(status_code):
 	return response
 
 
+def get_error_log(status_code) -> dict:
+	"""Return the exception being handled as an error object of REST API v2."""
+	exc_type, exc_value, _ = sys.exc_info()
+
+	error_log = {"type": exc_type.__name__}
+	if _allow_traceback(status_code):
+		error_log["exception"] = frappe.utils.get_traceback()
+	_link_error_with_message_log(error_log, exc_value, frappe.message_log)
+
+	return error_log
+
+
+def _allow_traceback(status_code) -> bool:
+	return (
+		(frappe.get_system_settings("allow_error_traceback") if frappe.db else False)
+		and not frappe.local.flags.disable_traceback
+		and (status_code != 404 or frappe.conf.logging)
+	)
+
+
 def _link_error_with_message_log(error_log, exception, message_logs):
 	for message in list(message_logs):
 		if message.get("__frappe_exc_id") == getattr(exception, "__frappe_exc_id", None):
@@ -72,6 +82,17 @@ def _link_error_with_message_log(error_log, exception, message_logs):
 			return
 
 
+def is_not_modified(etag: str) -> bool:
+	"""Set ETag of the response, return True if the client already has this version (`If-None-Match`
+	header), in which case the response status is set to 304 Not Modified and data can be skipped."""
+	frappe.local.response_etag = etag
+	if not frappe.request or is_resource_modified(frappe.request.environ, etag):
+		return False
+
+	frappe.response["http_status_code"] = 304
+	return True
+
+
 def build_response(response_type=None):
 	if "docs" in frappe.local.response and not frappe.local.response.docs:
 		del frappe.local.response["docs"]
@@ -136,7 +157,7 @@ def as_json():
 		del frappe.local.response["http_status_code"]
 
 	response.mimetype = "application/json"
-	response.data = json.dumps(frappe.local.response, default=json_handler, separators=(",", ":"))
+	set_json_body(response, frappe.local.response)
 	return response
 
 
@@ -150,12 +171,18 @@ def as_pdf():
 
 
 def as_binary():
-	response = Response()
+	filecontent = frappe.response["filecontent"]
+	if hasattr(filecontent, "read"):
+		# file objects are streamed instead of being read in memory
+		response = Response(wrap_file(frappe.local.request.environ, filecontent), direct_passthrough=True)
+	else:
+		response = Response()
+		response.data = filecontent
+
 	response.mimetype = "application/octet-stream"
 	filename = frappe.response["filename"]
 	filename = filename.encode("utf-8").decode("unicode-escape", "ignore")
 	response.headers.add("Content-Disposition", None, filename=filename)
-	response.data = frappe.response["filecontent"]
 	return response
 
 
@@ -0,0 +1,200 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Encoding of JSON responses.
+
+JSON is encoded using `orjson` when it is installed, falling back to the standard library for
+values it can't encode (e.g. integers larger than 64 bits). Both produce the same output for
+values handled by `frappe.utils.response.json_handler`, as UTF-8 without escaping non-ASCII
+characters.
+
+Responses containing lists longer than `STREAMING_THRESHOLD` rows (e.g. results of
+`frappe.desk.reportview.get` or `frappe.desk.query_report.run`) are streamed: rows are encoded
+in batches while the response is sent, instead of building the whole body in memory first.
+
+Compression can be done in-process, e.g. when there is no reverse proxy compressing responses.
+It is configured in site config with the encodings allowed, in order of preference, and their
+levels:
+
+	"response_compression": {"zstd": 3, "br": 4, "gzip": 6}
+
+or `true` for these defaults. `br` needs `brotli` and `zstd` needs `zstandard`, encodings whose
+package isn't installed are skipped.
+"""
+
+import json
+import zlib
+
+from werkzeug.wrappers import Response
+
+import frappe
+from frappe.utils import create_batch
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+DEFAULT_COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+MIN_COMPRESSION_SIZE = 1024  # bytes, smaller bodies aren't worth compressing
+STREAMING_THRESHOLD = 1000  # rows
+STREAMING_DEPTH = 3  # levels of nesting searched for long lists, e.g. response.message.values
+ROWS_PER_BATCH = 500
+CHUNK_SIZE = 64 * 1024  # bytes
+
+if orjson:
+	# datetimes are passed to `json_handler` to keep their format same as the standard library
+	ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(obj) -> bytes:
+	"""Return compact JSON of `obj`."""
+	from frappe.utils.response import json_handler
+
+	if orjson:
+		try:
+			return orjson.dumps(obj, default=json_handler, option=ORJSON_OPTIONS)
+		except TypeError:
+			pass
+
+	return json.dumps(obj, default=json_handler, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def set_json_body(response: Response, data) -> None:
+	"""Set `data` encoded as JSON as body of the response, compressing and streaming it if possible."""
+	encoding = get_content_encoding()
+
+	if is_large(data):
+		chunks = buffer(iter_json(data))
+		if encoding:
+			chunks = compress_stream(chunks, encoding)
+
+		response.response = chunks
+		# body can't be read for ETag or page cache without consuming it
+		response.direct_passthrough = True
+	else:
+		body = dumps(data)
+		if not encoding or len(body) < MIN_COMPRESSION_SIZE:
+			response.data = body
+			return
+
+		response.data = b"".join(compress_stream([body], encoding))
+
+	response.headers["Content-Encoding"] = encoding
+	response.vary.add("Accept-Encoding")
+
+
+def is_large(obj, depth=0) -> bool:
+	"""Return True if `obj` contains a list long enough to be streamed."""
+	if isinstance(obj, list | tuple):
+		return len(obj) > STREAMING_THRESHOLD
+
+	if isinstance(obj, dict) and depth < STREAMING_DEPTH:
+		return any(is_large(value, depth + 1) for value in obj.values())
+
+	return False
+
+
+def iter_json(obj, depth=0):
+	"""Yield JSON of `obj` in parts, encoding long lists in batches of rows."""
+	if isinstance(obj, list | tuple) and len(obj) > STREAMING_THRESHOLD:
+		yield b"["
+		for i, batch in enumerate(create_batch(obj, ROWS_PER_BATCH)):
+			if i:
+				yield b","
+			yield dumps(batch)[1:-1]
+		yield b"]"
+
+	elif isinstance(obj, dict) and depth < STREAMING_DEPTH:
+		yield b"{"
+		for i, (key, value) in enumerate(obj.items()):
+			if not isinstance(key, str):
+				# same as keys converted by json.dumps
+				key = json.dumps(key)
+			yield (b"," if i else b"") + dumps(key) + b":"
+			yield from iter_json(value, depth + 1)
+		yield b"}"
+
+	else:
+		yield dumps(obj)
+
+
+def buffer(parts, size=CHUNK_SIZE):
+	"""Join small parts into chunks of at least `size` bytes."""
+	chunk = bytearray()
+	for part in parts:
+		chunk += part
+		if len(chunk) >= size:
+			yield bytes(chunk)
+			chunk.clear()
+
+	if chunk:
+		yield bytes(chunk)
+
+
+def get_content_encoding() -> str | None:
+	"""Return best encoding accepted by the client among the ones configured, if any."""
+	if not (frappe.request and (encodings := get_compression_levels())):
+		return None
+
+	return frappe.request.accept_encodings.best_match(list(encodings))
+
+
+def get_compression_levels() -> dict[str, int]:
+	levels = frappe.conf.response_compression
+	if not levels:
+		return {}
+
+	if levels is True:
+		levels = DEFAULT_COMPRESSION_LEVELS
+
+	return {encoding: level for encoding, level in levels.items() if is_available(encoding)}
+
+
+def is_available(encoding: str) -> bool:
+	try:
+		get_compressor(encoding, None)
+	except ImportError:
+		return False
+
+	return True
+
+
+def compress_stream(chunks, encoding: str):
+	compressor = get_compressor(encoding, get_compression_levels().get(encoding))
+	for chunk in chunks:
+		if data := compressor.compress(chunk):
+			yield data
+
+	yield compressor.flush()
+
+
+def get_compressor(encoding: str, level: int | None):
+	"""Return compressor for content encoding, having `compress` and `flush` methods like zlib."""
+	level = level or DEFAULT_COMPRESSION_LEVELS.get(encoding)
+
+	if encoding == "gzip":
+		return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+	if encoding == "zstd":
+		import zstandard
+
+		return zstandard.ZstdCompressor(level=level).compressobj()
+
+	if encoding == "br":
+		import brotli
+
+		return BrotliCompressor(brotli.Compressor(quality=level))
+
+	raise ValueError(f"Unknown content encoding: {encoding}")
+
+
+class BrotliCompressor:
+	def __init__(self, compressor):
+		self.compressor = compressor
+
+	def compress(self, data: bytes) -> bytes:
+		return self.compressor.process(data)
+
+	def flush(self) -> bytes:
+		return self.compressor.finish()
@@ -6,15 +6,21 @@ Events:
 	daily
 	monthly
 	weekly
+
+The scheduler process keeps an index of next executions of scheduled jobs of all sites, ordered
+by time, and only wakes up when a job is due. Jobs of a site are indexed again when they change,
+which is checked for all sites once every tick.
 """
 
 import datetime
+import heapq
 import os
 import random
 import time
 from typing import NoReturn
 
 import pytz
+import redis
 import setproctitle
 from croniter import CroniterBadCronError
 from filelock import FileLock, Timeout
@@ -26,6 +32,7 @@ from frappe.utils.caching import redis_cache
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_SCHEDULER_TICK = 4 * 60
+SCHEDULE_VERSION_KEY = "scheduled_job_types_version"
 
 
 def cprint(*args, **kwargs):
@@ -57,10 +64,190 @@ def start_scheduler() -> NoReturn:
 		frappe.logger("scheduler").debug("Scheduler already running")
 		return
 
+	index = ScheduleIndex(tick)
+	refresh_at = 0
+
 	while True:
+		if time.time() >= refresh_at:
+			index.refresh(get_all_sites())
+			refresh_at = time.time() + tick
+
+		index.enqueue_due_jobs()
+
 		_proctitle("idle")
-		time.sleep(sleep_duration(tick))
-		enqueue_events_for_all_sites()
+		time.sleep(max(min(index.next_run_at() or refresh_at, refresh_at) - time.time(), 0))
+
+
+class ScheduleIndex:
+	"""Next executions of scheduled jobs of all sites, as a heap of
+	(timestamp, site, generation, scheduled job type).
+
+	Entries of a site are replaced by indexing its jobs again, entries of older generations are
+	skipped when they are popped."""
+
+	def __init__(self, tick: int = DEFAULT_SCHEDULER_TICK):
+		self.tick = tick
+		self.heap = []
+		self.generations: dict[str, int] = {}
+		self.versions: dict[str, tuple[bytes, bytes | None]] = {}  # site: (cache key, version)
+
+	def refresh(self, sites: list[str]) -> None:
+		"""Index jobs of sites which are new or whose jobs changed since they were indexed."""
+		for site in set(self.generations) - set(sites):
+			# dropped sites, their entries are skipped
+			del self.generations[site]
+			self.versions.pop(site, None)
+
+		indexed = [site for site in sites if site in self.versions]
+		try:
+			versions = frappe.cache.mget([self.versions[site][0] for site in indexed]) if indexed else []
+		except redis.exceptions.ConnectionError:
+			frappe.logger("scheduler").error("Failed to check versions of scheduled jobs", exc_info=True)
+			return
+
+		changed = {
+			site for site, version in zip(indexed, versions, strict=True) if version != self.versions[site][1]
+		}
+		for site in sites:
+			if site in changed or site not in self.versions:
+				self.index_site(site)
+
+	def index_site(self, site: str) -> None:
+		try:
+			_proctitle(f"indexing jobs of {site}")
+			frappe.init(site)
+			frappe.connect()
+			self.index_jobs()
+		except Exception:
+			frappe.logger("scheduler").error(f"Failed to index jobs of site {site}", exc_info=True)
+		finally:
+			frappe.destroy()
+
+	def index_jobs(self) -> None:
+		"""Replace entries of current site by next executions of its jobs."""
+		site = frappe.local.site
+		key = frappe.cache.make_key(SCHEDULE_VERSION_KEY)
+		# read before loading jobs, so that jobs changed meanwhile are indexed again
+		version = frappe.cache.get(key)
+
+		self.generations[site] = self.generations.get(site, 0) + 1
+		for job in get_scheduled_job_types():
+			try:
+				self.push(site, job.name, job.get_next_execution())
+			except CroniterBadCronError:
+				frappe.logger("scheduler").error(f"Invalid Job on {site} - {job.name}", exc_info=True)
+
+		self.versions[site] = (key, version)
+
+	def push(self, site: str, job: str, next_execution: datetime.datetime) -> None:
+		# next executions are in time zone of the site
+		timestamp = time.time() + (next_execution - now_datetime()).total_seconds()
+		heapq.heappush(self.heap, (timestamp, site, self.generations[site], job))
+
+	def next_run_at(self) -> float | None:
+		"""Return timestamp of the earliest entry, dropping stale ones."""
+		while self.heap:
+			_timestamp, site, generation, _job = self.heap[0]
+			if self.generations.get(site) == generation:
+				return self.heap[0][0]
+
+			heapq.heappop(self.heap)
+
+	def pop_due(self, now: float | None = None) -> dict[str, list[str]]:
+		"""Remove due entries, return due jobs by site."""
+		now = now or time.time()
+		due = {}
+		while (next_run_at := self.next_run_at()) is not None and next_run_at <= now:
+			_timestamp, site, _generation, job = heapq.heappop(self.heap)
+			due.setdefault(site, []).append(job)
+
+		return due
+
+	def enqueue_due_jobs(self) -> None:
+		due = list(self.pop_due().items())
+		# spread priorities among sites with jobs due at the same time
+		random.shuffle(due)
+
+		for site, jobs in due:
+			try:
+				_proctitle(f"scheduling events for {site}")
+				frappe.init(site)
+				frappe.connect()
+				self.enqueue_jobs(jobs)
+			except Exception as e:
+				if frappe.db and frappe.db.is_access_denied(e):
+					frappe.logger("scheduler").debug(f"Access denied for site {site}")
+				frappe.logger("scheduler").error(
+					f"Exception in Enqueue Events for Site {site}", exc_info=True
+				)
+				self.retry(site, jobs)
+			finally:
+				frappe.destroy()
+
+	def enqueue_jobs(self, jobs: list[str]) -> list[str]:
+		"""Enqueue jobs of current site which are due, index their next executions.
+
+		Return methods of enqueued jobs."""
+		site = frappe.local.site
+		if is_scheduler_inactive() or not schedule_jobs_based_on_activity():
+			self.retry(site, jobs)
+			return []
+
+		enqueued_jobs = []
+		now = now_datetime()
+		for job in get_scheduled_job_types(jobs):
+			try:
+				if job.enqueue():
+					enqueued_jobs.append(job.method)
+					# as set when the job starts
+					job.last_execution = now
+
+				next_execution = job.get_next_execution()
+			except CroniterBadCronError:
+				frappe.logger("scheduler").error(f"Invalid Job on {site} - {job.name}", exc_info=True)
+				continue
+
+			if next_execution <= now:
+				# still in queue or running, check again on next tick
+				next_execution = now + datetime.timedelta(seconds=self.tick)
+
+			self.push(site, job.name, next_execution)
+
+		frappe.logger("scheduler").debug(f"Queued events for site {site}")
+		return enqueued_jobs
+
+	def retry(self, site: str, jobs: list[str]) -> None:
+		"""Check jobs again on next tick."""
+		if site not in self.generations:
+			return
+
+		timestamp = time.time() + self.tick
+		for job in jobs:
+			heapq.heappush(self.heap, (timestamp, site, self.generations[site], job))
+
+
+def get_scheduled_job_types(names: list[str] | None = None) -> list:
+	filters = {"stopped": 0}
+	if names is not None:
+		filters["name"] = ("in", names)
+
+	return [
+		frappe.get_doc(doctype="Scheduled Job Type", **job_type)
+		for job_type in frappe.get_all("Scheduled Job Type", filters=filters, fields="*")
+	]
+
+
+def reindex_scheduled_jobs() -> None:
+	"""Make the scheduler index jobs of current site again, after they are changed."""
+	try:
+		frappe.cache.incr(frappe.cache.make_key(SCHEDULE_VERSION_KEY))
+	except redis.exceptions.ConnectionError:
+		pass
+
+
+def get_all_sites() -> list[str]:
+	with frappe.init_site():
+		return get_sites()
 
 
 def sleep_duration(tick):
@@ -82,8 +269,7 @@ def sleep_duration(tick):
 def enqueue_events_for_all_sites() -> None:
 	"""Loop through sites and enqueue events that are not already queued"""
 
-	with frappe.init_site():
-		sites = get_sites()
+	sites = get_all_sites()
 
 	# Sites are sorted in alphabetical order, shuffle to randomize priorities
 	random.shuffle(sites)
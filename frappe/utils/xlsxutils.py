@@ -17,7 +17,10 @@ ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
 
 
 # return xlsx file object
-def make_xlsx(data, sheet_name, wb=None, column_widths=None):
+def make_xlsx(data, sheet_name, wb=None, column_widths=None, file=None):
+	"""Write rows of `data` (any iterable) to a new sheet and save the workbook in `file`, a new
+	BytesIO by default. Rows are written as they are read, so a generator can be passed to export
+	large data sets."""
 	column_widths = column_widths or []
 	if wb is None:
 		wb = openpyxl.Workbook(write_only=True)
@@ -48,7 +51,7 @@ def make_xlsx(data, sheet_name, wb=None, column_widths=None):
 
 		ws.append(clean_row)
 
-	xlsx_file = BytesIO()
+	xlsx_file = file or BytesIO()
 	wb.save(xlsx_file)
 	return xlsx_file
 
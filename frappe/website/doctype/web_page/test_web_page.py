@@ -1,7 +1,11 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import set_request
+from frappe.website import page_cache
 from frappe.website.path_resolver import PathResolver
-from frappe.website.serve import get_response_content
+from frappe.website.serve import get_response, get_response_content
 
 
 class UnitTestWebPage(UnitTestCase):
@@ -66,3 +70,56 @@ class TestWebPage(IntegrationTestCase):
 			self.assertIn("<div>DocField</div>", content)
 		finally:
 			web_page.delete()
+
+	@patch.dict(frappe.conf, {"enable_page_cache": 1})
+	def test_page_cache_purged_on_save(self):
+		frappe.flags.force_website_cache = True
+		self.addCleanup(frappe.flags.pop, "force_website_cache")
+		self.addCleanup(frappe.set_user, "Administrator")
+
+		web_page = frappe.get_doc("Web Page", {"route": "test-web-page-1"})
+		other_page = frappe.get_doc("Web Page", {"route": "test-web-page-1/test-web-page-2"})
+
+		def get_cached_page(route):
+			set_request(method="GET", path=f"/{route}")
+			if response := page_cache.get_cached_response(frappe.local.request):
+				return response
+
+			page_cache.store(get_response())
+
+		for route in (web_page.route, other_page.route):
+			self.assertIsNone(get_cached_page(route))
+			self.assertEqual(get_cached_page(route).headers["X-Page-Cache"], "HIT")
+
+		# only pages rendered from the saved document are purged
+		frappe.set_user("Administrator")
+		web_page.save()
+		self.assertIsNone(get_cached_page(web_page.route))
+		self.assertIsNotNone(get_cached_page(other_page.route))
+
+	def test_page_cache_index_pruned(self):
+		index = page_cache.get_index("_test_prune")
+		cached, expired = (
+			frappe.cache.make_key("_test_cached_page"),
+			frappe.cache.make_key("_test_expired_page"),
+		)
+		frappe.cache.set(cached, 1)
+		frappe.cache.sadd(index, cached, expired)
+		self.addCleanup(frappe.cache.delete, cached, frappe.cache.make_key(index))
+
+		self.assertEqual(page_cache.prune([frappe.cache.make_key(index)]), 1)
+		self.assertEqual(frappe.cache.smembers(index), {cached})
+
+	def test_cache_html_adds_surrogate_keys(self):
+		web_page = frappe.get_doc("Web Page", {"route": "test-web-page-1"})
+		frappe.local.page_cache_tags = set()
+		self.addCleanup(delattr, frappe.local, "page_cache_tags")
+
+		self.assertIn("Test Content 1", get_response_content(f"/{web_page.route}"))
+		self.assertEqual(
+			frappe.local.page_cache_tags,
+			{
+				page_cache.get_route_key(web_page.route),
+				page_cache.get_document_key("Web Page", web_page.name),
+			},
+		)
@@ -0,0 +1,214 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Full-page cache for website pages served to guests.
+
+Enabled by setting `enable_page_cache` in site config. Pages that can be cached (see
+`frappe.website.utils.cache_html`) are stored after being rendered for a guest, later requests
+for them are answered by `frappe.app.application` without resuming the session, resolving the
+path or rendering the page.
+
+Entries are keyed by host, path and language and tagged with surrogate keys: the route and the
+document the page was rendered from. `purge` removes all pages tagged with a key, e.g. saving a
+Web Page only purges pages rendered from it.
+
+Pages older than `page_cache_ttl` seconds (5 minutes by default) are served stale while a
+background job renders them again, till they are evicted after `page_cache_stale_ttl` seconds
+(a day by default). Expired pages are pruned from the index sets when pages are stored.
+"""
+
+from contextlib import suppress
+from time import time
+
+import redis
+from werkzeug.wrappers import Request, Response
+
+import frappe
+
+DEFAULT_TTL = 5 * 60  # seconds
+DEFAULT_STALE_TTL = 24 * 60 * 60  # seconds
+INDEX = "page_cache_index"
+# number of members of each index set checked for expired pages when a page is stored
+PRUNE_SAMPLE_SIZE = 20
+
+# paths that are never rendered as website pages
+EXCLUDED_PATHS = ("/api/", "/private/", "/backups", "/assets/", "/files/")
+EXCLUDED_HEADERS = {"set-cookie", "content-length"}
+
+
+def is_enabled() -> bool:
+	return bool(frappe.conf.enable_page_cache)
+
+
+def get_ttl() -> int:
+	return frappe.conf.page_cache_ttl or DEFAULT_TTL
+
+
+def get_stale_ttl() -> int:
+	return frappe.conf.page_cache_stale_ttl or DEFAULT_STALE_TTL
+
+
+def is_cacheable_request(request: Request) -> bool:
+	"""Return True if request is a guest's plain GET request for a website page."""
+	return (
+		request.method in ("GET", "HEAD")
+		and not request.query_string
+		and not request.path.startswith(EXCLUDED_PATHS)
+		and request.cookies.get("sid", "Guest") == "Guest"
+		and not request.headers.get("Authorization")
+	)
+
+
+def get_cache_key(host: str, path: str, lang: str) -> str:
+	return f"page_cache::{lang}::{host}{path}"
+
+
+def get_document_key(doctype: str, name: str) -> str:
+	return f"{doctype}::{name}"
+
+
+def get_route_key(route: str) -> str:
+	return f"route::{route.strip('/')}"
+
+
+def get_index(surrogate_key: str) -> str:
+	return f"{INDEX}::{surrogate_key}"
+
+
+def get_cached_response(request: Request) -> Response | None:
+	"""Return cached page for the request, None if it has to be rendered."""
+	from frappe.translate import get_language
+	from frappe.website.utils import can_cache
+
+	if not (is_enabled() and can_cache() and is_cacheable_request(request)):
+		return None
+
+	frappe.local.page_cache_key = None
+	# replaced by the resumed session if the page has to be rendered
+	frappe.local.session = frappe._dict(user="Guest", sid="Guest", data=frappe._dict())
+	lang = frappe.local.lang = get_language()
+	key = get_cache_key(request.host, request.path, lang)
+
+	entry = frappe.cache.get_value(key, expires=True)
+	if not entry:
+		# store the page once it is rendered, see `store`
+		frappe.local.page_cache_key = key
+		frappe.local.page_cache_tags = set()
+		return None
+
+	state = "HIT"
+	if time() - entry["created"] > get_ttl():
+		state = "STALE"
+		frappe.enqueue(
+			"frappe.website.page_cache.regenerate",
+			queue="short",
+			job_id=key,
+			deduplicate=True,
+			key=key,
+			url_root=request.url_root,
+			path=request.path,
+			lang=lang,
+		)
+
+	frappe.local.response.can_cache = True
+	response = Response(entry["data"], status=entry["status"], headers=entry["headers"])
+	response.headers["X-Page-Cache"] = state
+	return response
+
+
+def add_surrogate_keys(*keys: str) -> None:
+	"""Tag page being rendered with these keys, so that it can be purged using any of them."""
+	if (tags := getattr(frappe.local, "page_cache_tags", None)) is not None:
+		tags.update(keys)
+
+
+def store(response: Response | None) -> None:
+	"""Cache page rendered for current request, if it can be cached."""
+	key = getattr(frappe.local, "page_cache_key", None)
+	if not (
+		key
+		and response
+		and response.status_code == 200
+		and not response.direct_passthrough
+		and frappe.local.response.can_cache
+		and frappe.session.user == "Guest"
+	):
+		return
+
+	entry = {
+		"data": response.get_data(),
+		"status": response.status_code,
+		"headers": [(k, v) for k, v in response.headers.items() if k.lower() not in EXCLUDED_HEADERS],
+		"created": time(),
+	}
+	tags = frappe.local.page_cache_tags | {get_route_key(frappe.request.path)}
+
+	stale_ttl = get_stale_ttl()
+	frappe.cache.set_value(key, entry, expires_in_sec=stale_ttl, index=INDEX)
+
+	with suppress(redis.exceptions.ConnectionError):
+		indexes = [frappe.cache.make_key(INDEX)]
+		pipeline = frappe.cache.pipeline()
+		for tag in tags:
+			index = frappe.cache.make_key(get_index(tag))
+			indexes.append(index)
+			pipeline.sadd(index, frappe.cache.make_key(key))
+		for index in indexes:
+			# all pages in it have expired by then
+			pipeline.expire(index, stale_ttl)
+		pipeline.execute()
+
+		prune(indexes)
+
+
+# Removes members of index sets (KEYS) whose pages have expired, from a random sample of ARGV[1]
+# members of each set. Checked and removed atomically, so pages stored concurrently stay indexed.
+PRUNE_SCRIPT = """
+local removed = 0
+for _, index in ipairs(KEYS) do
+	for _, member in ipairs(redis.call("SRANDMEMBER", index, ARGV[1])) do
+		if redis.call("EXISTS", member) == 0 then
+			removed = removed + redis.call("SREM", index, member)
+		end
+	end
+end
+return removed
+"""
+
+_prune_script = None
+
+
+def prune(indexes: list[str]) -> int:
+	"""Remove expired pages from a sample of members of index sets (already prefixed keys), so that
+	the sets don't grow without bound. Return number of members removed."""
+	global _prune_script
+
+	if _prune_script is None or _prune_script.registered_client is not frappe.cache:
+		_prune_script = frappe.cache.register_script(PRUNE_SCRIPT)
+
+	return _prune_script(keys=indexes, args=[PRUNE_SAMPLE_SIZE])
+
+
+def regenerate(key: str, url_root: str, path: str, lang: str) -> None:
+	"""Render a stale page again as guest and replace its cached entry."""
+	from frappe.utils import set_request
+	from frappe.website.serve import get_response
+
+	set_request(method="GET", base_url=url_root, path=path)
+	frappe.set_user("Guest")
+	frappe.local.lang = lang
+	frappe.local.page_cache_key = key
+	frappe.local.page_cache_tags = set()
+
+	store(get_response(path))
+
+
+def purge(*surrogate_keys: str) -> None:
+	"""Remove cached pages tagged with any of these keys."""
+	for surrogate_key in surrogate_keys:
+		frappe.cache.delete_index(get_index(surrogate_key))
+
+
+def purge_all() -> None:
+	frappe.cache.delete_index(INDEX)
+	frappe.cache.delete_keys(f"{INDEX}::")
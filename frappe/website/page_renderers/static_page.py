@@ -6,7 +6,7 @@ from werkzeug.wsgi import wrap_file
 
 import frappe
 from frappe.website.page_renderers.base_renderer import BaseRenderer
-from frappe.website.utils import is_binary_file
+from frappe.website.route_table import get_route_table
 
 UNSUPPORTED_STATIC_PAGE_TYPES = (
 	"css",
@@ -33,10 +33,7 @@ class StaticPage(BaseRenderer):
 		self.file_path = ""
 		if not self.is_valid_file_path():
 			return
-		for app in frappe.get_installed_apps():
-			file_path = frappe.get_app_path(app, "www") + "/" + self.path
-			if os.path.isfile(file_path) and is_binary_file(file_path):
-				self.file_path = file_path
+		self.file_path = get_route_table().static_files.get(self.path, "")
 
 	def can_render(self):
 		return self.is_valid_file_path() and self.file_path
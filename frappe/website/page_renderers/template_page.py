@@ -5,6 +5,7 @@ import click
 
 import frappe
 from frappe.website.page_renderers.base_template_page import BaseTemplatePage
+from frappe.website.route_table import get_route_table
 from frappe.website.router import get_base_template, get_page_info
 from frappe.website.utils import (
 	cache_html,
@@ -14,7 +15,6 @@ from frappe.website.utils import (
 	get_next_link,
 	get_sidebar_items,
 	get_toc,
-	is_binary_file,
 )
 
 PY_LOADER_SUFFIXES = tuple(all_suffixes())
@@ -49,23 +49,13 @@ class TemplatePage(BaseTemplatePage):
 		Searches for file matching the path in the /www
 		and /templates/pages folders and sets path if match is found
 		"""
-		folders = get_start_folders()
-		for app in reversed(frappe.get_installed_apps()):
-			app_path = frappe.get_app_path(app)
-
-			for dirname in folders:
-				search_path = os.path.join(app_path, dirname, self.path)
-				for file_path in self.get_index_path_options(search_path):
-					if os.path.isfile(file_path) and not is_binary_file(file_path):
-						self.app = app
-						self.app_path = app_path
-						self.file_dir = dirname
-						self.basename = os.path.splitext(file_path)[0]
-						self.template_path = os.path.relpath(file_path, self.app_path)
-						self.basepath = os.path.dirname(file_path)
-						self.filename = os.path.basename(file_path)
-						self.name = os.path.splitext(self.filename)[0]
-						return
+		if template := get_route_table().templates.get(self.path):
+			self.app, self.app_path, self.file_dir, file_path = template
+			self.basename = os.path.splitext(file_path)[0]
+			self.template_path = os.path.relpath(file_path, self.app_path)
+			self.basepath = os.path.dirname(file_path)
+			self.filename = os.path.basename(file_path)
+			self.name = os.path.splitext(self.filename)[0]
 
 	def can_render(self):
 		return (
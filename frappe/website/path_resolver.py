@@ -1,8 +1,5 @@
-import re
-
 import click
 import werkzeug.routing.exceptions
-from werkzeug.routing import Rule
 
 import frappe
 from frappe.website.page_renderers.document_page import DocumentPage
@@ -13,6 +10,7 @@ from frappe.website.page_renderers.redirect_page import RedirectPage
 from frappe.website.page_renderers.static_page import StaticPage
 from frappe.website.page_renderers.template_page import TemplatePage
 from frappe.website.page_renderers.web_form import WebFormPage
+from frappe.website.route_table import get_route_table
 from frappe.website.router import evaluate_dynamic_routes
 from frappe.website.utils import can_cache, get_home_page
 
@@ -114,42 +112,9 @@ def resolve_redirect(path, query_string=None):
 	                                # use r as a string prefix if you use regex groups or want to escape any string literal
 	                ]
 	"""
-	redirects = frappe.get_hooks("website_redirects")
-	redirects += frappe.get_all(
-		"Website Route Redirect", ["source", "target", "redirect_http_status"], order_by=None
-	)
-
-	if not redirects:
-		return
-
-	redirect_to = frappe.cache.hget("website_redirects", path)
-
-	if redirect_to:
-		if isinstance(redirect_to, dict):
-			frappe.flags.redirect_location = redirect_to["path"]
-			raise frappe.Redirect(redirect_to["status_code"])
-		frappe.flags.redirect_location = redirect_to
-		raise frappe.Redirect
-
-	for rule in redirects:
-		pattern = rule["source"].strip("/ ") + "$"
-		path_to_match = path
-		if query_string and rule.get("match_with_query_string"):
-			path_to_match = path + "?" + frappe.safe_decode(query_string)
-
-		try:
-			match = re.match(pattern, path_to_match)
-		except re.error:
-			frappe.log_error("Broken Redirect: " + pattern)
-
-		if match:
-			redirect_to = re.sub(pattern, rule["target"], path_to_match)
-			frappe.flags.redirect_location = redirect_to
-			status_code = rule.get("redirect_http_status") or 301
-			frappe.cache.hset(
-				"website_redirects", path_to_match, {"path": redirect_to, "status_code": status_code}
-			)
-			raise frappe.Redirect(status_code)
+	if match := get_route_table().match_redirect(path, query_string):
+		frappe.flags.redirect_location, status_code = match
+		raise frappe.Redirect(status_code)
 
 
 def resolve_path(path):
@@ -172,11 +137,7 @@ def resolve_path(path):
 
 def resolve_from_map(path):
 	"""transform dynamic route to a static one from hooks and route defined in doctype"""
-	rules = [
-		Rule(r["from_route"], endpoint=r["to_route"], defaults=r.get("defaults")) for r in get_website_rules()
-	]
-
-	return evaluate_dynamic_routes(rules, path) or path
+	return evaluate_dynamic_routes(get_route_table().rules, path) or path
 
 
 def get_website_rules():
@@ -0,0 +1,204 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Compiled routing table for website requests.
+
+Routes only change on deploy or when route-affecting documents change, so they are compiled once
+per process instead of being worked out again for every request:
+
+- template pages and static files in `www` and `templates/pages` are indexed by route, instead
+  of probing the filesystem,
+- website route rules and dynamic routes of Web Pages are loaded in werkzeug maps, whose
+  matcher walks path segments like a trie, instead of building a map for every request,
+- redirects from hooks and Website Settings are pre-compiled and checked with one combined
+  regex first, as most paths aren't redirected.
+
+`clear_routing_cache` bumps the version of the table in cache, which makes every process rebuild
+it. On the development server it is rebuilt for every request.
+"""
+
+import os
+import re
+from contextlib import suppress
+from functools import cached_property
+
+import redis
+from werkzeug.routing import Map, Rule
+
+import frappe
+
+VERSION_KEY = "website_route_table_version"
+
+# suffixes tried by `TemplatePage` in this order, for a route to match a file
+TEMPLATE_SUFFIXES = ("", ".html", ".md", "/index.html", "/index.md")
+# redirects using backreferences, named groups or inline flags can't be combined in one regex
+UNCOMBINABLE_PATTERN = re.compile(r"\\\d|\(\?P[=<]|\(\?[aiLmsux]")
+
+_route_tables: dict[str, tuple[int, "RouteTable"]] = {}
+
+
+class RouteTable:
+	"""Routes of a site, each kind of route is compiled on first use."""
+
+	@cached_property
+	def templates(self) -> dict[str, tuple[str, str, str, str]]:
+		"""Map routes to (app, app path, start folder, file path) of template pages."""
+		from frappe.website.router import get_start_folders
+		from frappe.website.utils import is_binary_file
+
+		templates = {}
+		# later apps override pages of earlier ones
+		for app in reversed(frappe.get_installed_apps()):
+			app_path = frappe.get_app_path(app)
+			for dirname in get_start_folders():
+				start_path = os.path.join(app_path, dirname)
+				matches = {}
+				for file_path in walk_files(start_path):
+					if is_binary_file(file_path):
+						continue
+
+					relative_path = os.path.relpath(file_path, start_path)
+					for priority, suffix in enumerate(TEMPLATE_SUFFIXES):
+						if not relative_path.endswith(suffix):
+							continue
+
+						route = relative_path[: len(relative_path) - len(suffix)]
+						if route and (route not in matches or priority < matches[route][0]):
+							matches[route] = (priority, file_path)
+
+				for route, (_priority, file_path) in matches.items():
+					templates.setdefault(route, (app, app_path, dirname, file_path))
+
+		return templates
+
+	@cached_property
+	def static_files(self) -> dict[str, str]:
+		"""Map routes to binary files in `www` folders."""
+		from frappe.website.utils import is_binary_file
+
+		static_files = {}
+		for app in frappe.get_installed_apps():
+			start_path = frappe.get_app_path(app, "www")
+			for file_path in walk_files(start_path):
+				if is_binary_file(file_path):
+					static_files[os.path.relpath(file_path, start_path)] = file_path
+
+		return static_files
+
+	@cached_property
+	def rules(self) -> Map:
+		"""Website route rules from hooks and routes of doctypes."""
+		from frappe.website.path_resolver import get_website_rules
+
+		return Map(
+			[
+				Rule(r["from_route"], endpoint=r["to_route"], defaults=r.get("defaults"))
+				for r in get_website_rules()
+			]
+		)
+
+	@cached_property
+	def dynamic_web_pages(self) -> tuple[Map, dict]:
+		"""Map of dynamic routes of web pages and page info by page name."""
+		from frappe.website.doctype.web_page.web_page import get_dynamic_web_pages
+
+		rules, page_info = [], {}
+		for d in get_dynamic_web_pages():
+			rules.append(Rule(f"/{d.route}", endpoint=d.name))
+			d.doctype = d.doctype or "Web Page"
+			page_info[d.name] = d
+
+		return Map(rules), page_info
+
+	@cached_property
+	def redirects(
+		self,
+	) -> tuple[list[tuple[re.Pattern, dict]], list[tuple[re.Pattern, dict]], re.Pattern | None]:
+		"""Return compiled redirects, the ones that can't be filtered and the combined filter.
+
+		Redirects matching with query string or using backreferences, named groups or inline flags
+		can't be combined in one regex and have to be checked one by one."""
+		redirects = [
+			*frappe.get_hooks("website_redirects"),
+			*frappe.get_all(
+				"Website Route Redirect", ["source", "target", "redirect_http_status"], order_by=None
+			),
+		]
+
+		compiled, unfiltered, combined = [], [], []
+		for rule in redirects:
+			source = rule["source"].strip("/ ") + "$"
+			try:
+				pattern = re.compile(source)
+			except re.error:
+				frappe.log_error("Broken Redirect: " + source)
+				continue
+
+			compiled.append((pattern, rule))
+			if rule.get("match_with_query_string") or UNCOMBINABLE_PATTERN.search(source):
+				unfiltered.append((pattern, rule))
+			else:
+				combined.append(f"(?:{source})")
+
+		try:
+			combined = re.compile("|".join(combined)) if combined else None
+		except re.error:
+			# check every redirect instead
+			return compiled, compiled, None
+
+		return compiled, unfiltered, combined
+
+	def match_redirect(self, path: str, query_string=None) -> tuple[str, int] | None:
+		"""Return target and status code of the first redirect matching the path."""
+		compiled, unfiltered, combined = self.redirects
+		if combined is None or not combined.match(path):
+			compiled = unfiltered
+
+		for pattern, rule in compiled:
+			path_to_match = path
+			if query_string and rule.get("match_with_query_string"):
+				path_to_match = path + "?" + frappe.safe_decode(query_string)
+
+			if pattern.match(path_to_match):
+				redirect_to = pattern.sub(rule["target"], path_to_match)
+				return redirect_to, rule.get("redirect_http_status") or 301
+
+
+def walk_files(path: str):
+	for basepath, _folders, files in os.walk(path, followlinks=True):
+		for fname in files:
+			yield os.path.join(basepath, fname)
+
+
+def get_route_table() -> RouteTable:
+	"""Return routing table of current site, compiled once per process till routes change."""
+	if table := getattr(frappe.local, "route_table", None):
+		return table
+
+	if frappe.local.dev_server or frappe.local.flags.web_pages_folders:
+		# dont cache in development
+		table = RouteTable()
+	else:
+		try:
+			version = int(frappe.cache.get(frappe.cache.make_key(VERSION_KEY)) or 0)
+		except redis.exceptions.ConnectionError:
+			version = None
+
+		cached = _route_tables.get(frappe.local.site)
+		if version is None:
+			table = RouteTable()
+		elif cached and cached[0] == version:
+			table = cached[1]
+		else:
+			table = RouteTable()
+			_route_tables[frappe.local.site] = (version, table)
+
+	frappe.local.route_table = table
+	return table
+
+
+def clear_route_table() -> None:
+	"""Make all processes rebuild the routing table of current site."""
+	frappe.local.route_table = None
+	with suppress(redis.exceptions.ConnectionError):
+		frappe.cache.incr(frappe.cache.make_key(VERSION_KEY))
@@ -15,18 +15,12 @@ def get_page_info_from_web_page_with_dynamic_routes(path):
 	"""
 	Query Web Page with dynamic_route = 1 and evaluate if any of the routes match
 	"""
-	from frappe.website.doctype.web_page.web_page import get_dynamic_web_pages
-
-	rules, page_info = [], {}
-
-	for d in get_dynamic_web_pages():
-		rules.append(Rule(f"/{d.route}", endpoint=d.name))
-		d.doctype = d.doctype or "Web Page"
-		page_info[d.name] = d
+	from frappe.website.route_table import get_route_table
 
-	end_point = evaluate_dynamic_routes(rules, path)
+	route_map, page_info = get_route_table().dynamic_web_pages
+	end_point = evaluate_dynamic_routes(route_map, path)
 	if end_point:
-		return page_info[end_point]
+		return frappe._dict(page_info[end_point])
 
 
 def get_page_info_from_web_form(path):
@@ -58,12 +52,12 @@ def get_page_info_from_web_form(path):
 			return d
 
 
-def evaluate_dynamic_routes(rules, path):
+def evaluate_dynamic_routes(rules: list[Rule] | Map, path):
 	"""
 	Use Werkzeug routing to evaluate dynamic routes like /project/<name>
 	https://werkzeug.palletsprojects.com/en/1.0.x/routing/
 	"""
-	route_map = Map(rules)
+	route_map = rules if isinstance(rules, Map) else Map(rules)
 	endpoint = None
 
 	if hasattr(frappe.local, "request") and frappe.local.request.environ:
@@ -314,8 +308,10 @@ def clear_routing_cache():
 	from frappe.website.doctype.web_form.web_form import get_published_web_forms
 	from frappe.website.doctype.web_page.web_page import get_dynamic_web_pages
 	from frappe.website.page_renderers.document_page import _find_matching_document_webview
+	from frappe.website.route_table import clear_route_table
 	from frappe.www.sitemap import get_public_pages_from_doctypes
 
+	clear_route_table()
 	_find_matching_document_webview.clear_cache()
 	get_dynamic_web_pages.clear_cache()
 	get_published_web_forms.clear_cache()
@@ -20,6 +20,7 @@ from frappe.utils import (
 	get_system_timezone,
 	md_to_html,
 )
+from frappe.website import page_cache
 
 FRONTMATTER_PATTERN = re.compile(r"^\s*(?:---|\+\+\+)(.*?)(?:---|\+\+\+)\s*(.+)$", re.S | re.M)
 H1_TAG_PATTERN = re.compile("<h1>([^<]*)")
@@ -34,6 +35,7 @@ def delete_page_cache(path):
 	if path:
 		frappe.cache.hdel_names(groups, path)
 		frappe.cache.delete_value("full_index")
+		page_cache.purge(page_cache.get_route_key(path))
 	else:
 		groups.append("full_index")
 		frappe.cache.delete_value(groups)
@@ -381,17 +383,16 @@ def clear_cache(path=None):
 	]
 
 	if path:
-		frappe.cache.hdel("website_redirects", path)
 		delete_page_cache(path)
 	else:
 		clear_sitemap()
+		page_cache.purge_all()
 		frappe.clear_cache("Guest")
 		keys += [
 			"portal_menu_items",
 			"home_page",
 			"website_route_rules",
 			"doctypes_with_web_view",
-			"website_redirects",
 			"page_context",
 			"website_page",
 		]
@@ -518,11 +519,18 @@ def get_sidebar_json_path(path, look_for=False):
 def cache_html(func):
 	@wraps(func)
 	def cache_html_decorator(*args, **kwargs):
+		renderer = args[0]
+		page_cache.add_surrogate_keys(page_cache.get_route_key(renderer.path))
+		if (doctype := getattr(renderer, "doctype", None)) and (
+			docname := getattr(renderer, "docname", None)
+		):
+			page_cache.add_surrogate_keys(page_cache.get_document_key(doctype, docname))
+
 		if can_cache():
 			html = None
-			page_cache = frappe.cache.hget("website_page", args[0].path)
-			if page_cache and frappe.local.lang in page_cache:
-				html = page_cache[frappe.local.lang]
+			cached_html = frappe.cache.hget("website_page", args[0].path)
+			if cached_html and frappe.local.lang in cached_html:
+				html = cached_html[frappe.local.lang]
 			if html:
 				frappe.local.response.from_cache = True
 				frappe.local.response.can_cache = True
@@ -530,9 +538,9 @@ def cache_html(func):
 		html = func(*args, **kwargs)
 		context = args[0].context
 		if can_cache(context.no_cache):
-			page_cache = frappe.cache.hget("website_page", args[0].path) or {}
-			page_cache[frappe.local.lang] = html
-			frappe.cache.hset("website_page", args[0].path, page_cache)
+			cached_html = frappe.cache.hget("website_page", args[0].path) or {}
+			cached_html[frappe.local.lang] = html
+			frappe.cache.hset("website_page", args[0].path, cached_html)
 			frappe.local.response.can_cache = True
 
 		return html
@@ -5,6 +5,7 @@ import frappe
 from frappe.model.document import Document
 from frappe.modules import get_module_name
 from frappe.search.website_search import remove_document_from_index, update_index_for_path
+from frappe.website import page_cache
 from frappe.website.utils import cleanup_page_name, clear_cache
 
 
@@ -69,6 +70,8 @@ class WebsiteGenerator(Document):
 	def clear_cache(self):
 		super().clear_cache()
 		clear_cache(self.route)
+		# pages rendered from this document, including ones at its previous route
+		page_cache.purge(page_cache.get_document_key(self.doctype, self.name))
 
 	def scrub(self, text):
 		return cleanup_page_name(text).replace("_", "-")
@@ -77,11 +77,14 @@ const subscriber = get_redis_subscriber();
 	subscriber.subscribe("events", (message) => {
 		message = JSON.parse(message);
 		let namespace = "/" + message.namespace;
-		if (message.room) {
-			io.of(namespace).to(message.room).emit(message.event, message.message);
-		} else {
-			// publish to ALL sites only used for things like build event.
-			realtime.emit(message.event, message.message);
+		// events of a transaction are published together as a batch
+		for (const event of message.events || [message]) {
+			if (event.room) {
+				io.of(namespace).to(event.room).emit(event.event, event.message);
+			} else {
+				// publish to ALL sites only used for things like build event.
+				realtime.emit(event.event, event.message);
+			}
 		}
 	});
 })();